@@ -25,12 +25,14 @@ print("==================================")
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
-def create_app():
+def create_app(config_name=None):
     app = Flask(__name__)
+    # 'testing': SQLite (TEST_DATABASE_URL ou em memória), sem debug e sem arquivos locais
+    testing = config_name == 'testing'
 
     # Configurações do banco de dados - MySQL como padrão
     database_url = os.environ.get('DATABASE_URL')
-    use_mysql = os.environ.get('USE_MYSQL', 'true').lower() == 'true'
+    use_mysql = os.environ.get('USE_MYSQL', 'true').lower() == 'true' and not testing
     
     if use_mysql and database_url:
         # Usar MySQL
@@ -52,7 +54,9 @@ def create_app():
             print("🔄 Falling back to SQLite for development")
             use_mysql = False
     
-    if not use_mysql:
+    if testing:
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    elif not use_mysql:
         # Fallback para SQLite
         base_dir = Path(__file__).parent.parent
         instance_path = base_dir / 'instance'
@@ -114,10 +118,150 @@ def create_app():
     app.config['JWT_ACCESS_COOKIE_NAME'] = 'access_token'
     app.config['JWT_REFRESH_COOKIE_NAME'] = 'refresh_token'
 
+    # Tarefas periódicas (scheduler em thread com lease no banco)
+    app.config['SCHEDULER_ENABLED'] = os.environ.get('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    # Validade do lease (renovado a cada 1/3 enquanto a tarefa roda); maior que a execução mais longa
+    app.config['SCHEDULER_LEASE_SECONDS'] = int(os.environ.get('SCHEDULER_LEASE_SECONDS', '300'))
+    app.config['RESET_CODE_CLEANUP_INTERVAL'] = int(os.environ.get('RESET_CODE_CLEANUP_INTERVAL', '600'))
+    app.config['RESET_CODE_CLEANUP_BATCH_SIZE'] = int(os.environ.get('RESET_CODE_CLEANUP_BATCH_SIZE', '1000'))
+
+    # Newsletter semanal de vagas (envio em massa por pool SMTP com limite de taxa)
+    app.config['NEWSLETTER_ENABLED'] = os.environ.get('NEWSLETTER_ENABLED', 'false').lower() == 'true'
+    app.config['NEWSLETTER_CHECK_INTERVAL'] = int(os.environ.get('NEWSLETTER_CHECK_INTERVAL', '3600'))
+    app.config['NEWSLETTER_MAX_RUNTIME'] = int(os.environ.get('NEWSLETTER_MAX_RUNTIME', '3000'))
+    app.config['NEWSLETTER_BATCH_SIZE'] = int(os.environ.get('NEWSLETTER_BATCH_SIZE', '500'))
+    app.config['NEWSLETTER_JOBS_PER_EMAIL'] = int(os.environ.get('NEWSLETTER_JOBS_PER_EMAIL', '5'))
+    app.config['NEWSLETTER_MAX_JOBS'] = int(os.environ.get('NEWSLETTER_MAX_JOBS', '500'))
+    app.config['JOB_URL_TEMPLATE'] = os.environ.get('JOB_URL_TEMPLATE', 'https://vagas.youthspacecursos.com/jobs/{id}')
+    app.config['SMTP_POOL_SIZE'] = int(os.environ.get('SMTP_POOL_SIZE', '2'))
+    app.config['SMTP_RATE_LIMIT'] = float(os.environ.get('SMTP_RATE_LIMIT', '5'))
+
+    # Resumo de mudanças de status (um email por estudante por janela) e outbox de emails
+    app.config['STATUS_DIGEST_WINDOW'] = int(os.environ.get('STATUS_DIGEST_WINDOW', '900'))
+    app.config['STATUS_DIGEST_INTERVAL'] = int(os.environ.get('STATUS_DIGEST_INTERVAL', '60'))
+    app.config['STATUS_DIGEST_SETTLE_SECONDS'] = int(os.environ.get('STATUS_DIGEST_SETTLE_SECONDS', '30'))
+    app.config['EMAIL_OUTBOX_INTERVAL'] = int(os.environ.get('EMAIL_OUTBOX_INTERVAL', '60'))
+    app.config['EMAIL_OUTBOX_MAX_ATTEMPTS'] = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+    # Cada rodada para de reservar lotes depois de EMAIL_OUTBOX_MAX_RUNTIME (abaixo do intervalo e do lease)
+    app.config['EMAIL_OUTBOX_MAX_RUNTIME'] = int(os.environ.get('EMAIL_OUTBOX_MAX_RUNTIME', '45'))
+    app.config['EMAIL_OUTBOX_CLAIM_TIMEOUT'] = int(os.environ.get('EMAIL_OUTBOX_CLAIM_TIMEOUT', '600'))
+    app.config['EMAIL_OUTBOX_RETENTION_DAYS'] = int(os.environ.get('EMAIL_OUTBOX_RETENTION_DAYS', '7'))
+
+    # Hash de senhas em pool de processos (PASSWORD_HASH_WORKERS=0 executa inline)
+    app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+    app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', '32'))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '10'))
+
+    # Limite de tentativas em login/cadastro/reset (contadores em SQLite local compartilhado entre workers)
+    from app.middleware.rate_limit import DEFAULT_POLICIES
+    app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    app.config['RATE_LIMIT_STORAGE'] = os.environ.get(
+        'RATE_LIMIT_STORAGE', str(Path(__file__).parent.parent / 'instance' / 'rate_limit.db')
+    )
+    app.config['RATE_LIMIT_TRUST_PROXY'] = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+    app.config['RATE_LIMIT_POLICIES'] = DEFAULT_POLICIES
+
+    # SMS enviado em segundo plano (SMS_TRANSPORT=fake guarda as mensagens em memória)
+    app.config['SMS_TRANSPORT'] = os.environ.get('SMS_TRANSPORT', 'twilio')
+    app.config['TWILIO_ACCOUNT_SID'] = os.environ.get('TWILIO_ACCOUNT_SID')
+    app.config['TWILIO_AUTH_TOKEN'] = os.environ.get('TWILIO_AUTH_TOKEN')
+    app.config['TWILIO_PHONE_NUMBER'] = os.environ.get('TWILIO_PHONE_NUMBER')
+    app.config['SMS_MAX_RETRIES'] = int(os.environ.get('SMS_MAX_RETRIES', '3'))
+    app.config['SMS_RETRY_BACKOFF'] = float(os.environ.get('SMS_RETRY_BACKOFF', '2'))
+    app.config['SMS_QUEUE_SIZE'] = int(os.environ.get('SMS_QUEUE_SIZE', '1000'))
+
+    # Exportação incremental para Parquet (analistas leem os arquivos, não o MySQL)
+    app.config['ANALYTICS_EXPORT_ENABLED'] = os.environ.get('ANALYTICS_EXPORT_ENABLED', 'false').lower() == 'true'
+    app.config['ANALYTICS_EXPORT_DIR'] = os.environ.get(
+        'ANALYTICS_EXPORT_DIR', str(Path(__file__).parent.parent / 'instance' / 'analytics')
+    )
+    app.config['ANALYTICS_EXPORT_INTERVAL'] = int(os.environ.get('ANALYTICS_EXPORT_INTERVAL', '3600'))
+    app.config['ANALYTICS_EXPORT_CHUNK_SIZE'] = int(os.environ.get('ANALYTICS_EXPORT_CHUNK_SIZE', '50000'))
+
+    # Rollups do dashboard de analytics das empresas (GET /api/companies/analytics)
+    app.config['ANALYTICS_ROLLUP_INTERVAL'] = int(os.environ.get('ANALYTICS_ROLLUP_INTERVAL', '300'))
+    app.config['ANALYTICS_ROLLUP_BATCH_SIZE'] = int(os.environ.get('ANALYTICS_ROLLUP_BATCH_SIZE', '5000'))
+
+    # Vagas semelhantes: vizinhos guardados por vaga e fila de recálculo processada fora das requisições
+    app.config['SIMILAR_JOBS_PER_JOB'] = int(os.environ.get('SIMILAR_JOBS_PER_JOB', '10'))
+    app.config['SIMILAR_JOBS_REFRESH_INTERVAL'] = int(os.environ.get('SIMILAR_JOBS_REFRESH_INTERVAL', '30'))
+    app.config['SIMILAR_JOBS_REFRESH_BATCH_SIZE'] = int(os.environ.get('SIMILAR_JOBS_REFRESH_BATCH_SIZE', '500'))
+
+    # Métricas de operação (latência por rota, consultas por requisição, gauges) em SQLite local
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    app.config['METRICS_STORAGE'] = os.environ.get(
+        'METRICS_STORAGE', str(Path(__file__).parent.parent / 'instance' / 'metrics.db')
+    )
+    app.config['METRICS_FLUSH_INTERVAL'] = float(os.environ.get('METRICS_FLUSH_INTERVAL', '10'))
+    app.config['METRICS_RETENTION_DAYS'] = int(os.environ.get('METRICS_RETENTION_DAYS', '7'))
+    app.config['METRICS_GAUGE_INTERVAL'] = int(os.environ.get('METRICS_GAUGE_INTERVAL', '60'))
+
+    # Rotas internas de operação (/api/admin/...): desligadas sem ADMIN_TOKEN
+    app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
+    # Profiling: ?__profile=1 por requisição (nunca em produção) e amostragem de pilhas sob demanda
+    app.config['PROFILE_REQUESTS_ENABLED'] = not is_production and \
+        os.environ.get('PROFILE_REQUESTS_ENABLED', 'true').lower() == 'true'
+    app.config['PROFILER_OUTPUT_DIR'] = os.environ.get(
+        'PROFILER_OUTPUT_DIR', str(Path(__file__).parent.parent / 'instance' / 'profiles')
+    )
+    app.config['PROFILER_SAMPLE_INTERVAL'] = float(os.environ.get('PROFILER_SAMPLE_INTERVAL', '0.01'))
+    app.config['PROFILER_MAX_SECONDS'] = int(os.environ.get('PROFILER_MAX_SECONDS', '300'))
+    app.config['MEMORY_MAX_SNAPSHOTS'] = int(os.environ.get('MEMORY_MAX_SNAPSHOTS', '10'))
+
+    # Respostas guardadas por Idempotency-Key (POST /api/jobs e /api/jobs/<id>/apply)
+    app.config['IDEMPOTENCY_TTL_SECONDS'] = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', str(24 * 3600)))
+    # Chave em 'processing' há mais tempo que isto foi abandonada e pode ser assumida
+    app.config['IDEMPOTENCY_PROCESSING_SECONDS'] = int(os.environ.get('IDEMPOTENCY_PROCESSING_SECONDS', '120'))
+    app.config['IDEMPOTENCY_CLEANUP_INTERVAL'] = int(os.environ.get('IDEMPOTENCY_CLEANUP_INTERVAL', '3600'))
+
+    # Streams SSE (EVENTS_BACKEND=db consulta o banco e funciona com vários workers)
+    app.config['EVENTS_BACKEND'] = os.environ.get('EVENTS_BACKEND', 'memory')
+    app.config['EVENTS_POLL_INTERVAL'] = float(os.environ.get('EVENTS_POLL_INTERVAL', '2'))
+    app.config['EVENTS_HEARTBEAT_INTERVAL'] = float(os.environ.get('EVENTS_HEARTBEAT_INTERVAL', '15'))
+    app.config['EVENTS_STREAM_MAX_SECONDS'] = float(os.environ.get('EVENTS_STREAM_MAX_SECONDS', '600'))
+    app.config['EVENTS_QUEUE_SIZE'] = int(os.environ.get('EVENTS_QUEUE_SIZE', '100'))
+    app.config['EVENTS_REPLAY_LIMIT'] = int(os.environ.get('EVENTS_REPLAY_LIMIT', '100'))
+
+    if testing:
+        app.config.update(
+            TESTING=True,
+            DEBUG=False,
+            SQLALCHEMY_ECHO=False,
+            PASSWORD_HASH_WORKERS=0,
+            RATE_LIMIT_ENABLED=False,
+            RATE_LIMIT_STORAGE='memory',
+            METRICS_ENABLED=False,
+            SMS_TRANSPORT='fake',
+            SCHEDULER_ENABLED=False,
+        )
+
     # Inicializar extensões
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+
+    from app.services.password_service import password_service
+    password_service.init_app(app)
+
+    from app.middleware.rate_limit import rate_limiter
+    rate_limiter.init_app(app)
+
+    from app.services.sms_dispatcher import sms_dispatcher
+    sms_dispatcher.init_app(app)
+
+    from app.services.event_bus import event_bus
+    from app.services.application_services import ApplicationService
+    event_bus.init_app(app)
+    event_bus.register_poller('applications', ApplicationService.poll_new_applications)
+    event_bus.register_poller('status_events', ApplicationService.poll_status_events)
+
+    from app.middleware.metrics import metrics, collect_default_gauges
+    metrics.init_app(app)
+    collect_default_gauges(app)
+
+    from app.middleware.profiling import profiler
+    profiler.init_app(app)
     # Configuração CORS baseada no ambiente
     if is_production:
         # CORS para produção - domínios específicos
@@ -127,9 +271,9 @@ def create_app():
         CORS(app, 
              supports_credentials=True, 
              origins=["https://vagas.youthspacecursos.com", "http://31.97.17.104:8080", "http://127.0.0.1:8080", "http://vagas.youthspacecursos.com", "http://vagas.youthspacecursos.com:8080"],
-             allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Cookie", "X-CSRF-TOKEN"],
+             allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Cookie", "X-CSRF-TOKEN", "Idempotency-Key"],
              methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-             expose_headers=["Set-Cookie"],
+             expose_headers=["Set-Cookie", "Idempotent-Replayed"],
              allow_credentials=True)
         print(f"🌐 CORS configurado para produção com origens: {allowed_origins}")
     else:
@@ -137,9 +281,9 @@ def create_app():
         CORS(app, 
              supports_credentials=True, 
              origins=["http://localhost:5173", "http://127.0.0.1:5173", "http://31.97.17.104:8080", "http://127.0.0.1:8080"],
-             allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Cookie", "X-CSRF-TOKEN"],
+             allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Cookie", "X-CSRF-TOKEN", "Idempotency-Key"],
              methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-             expose_headers=["Set-Cookie"],
+             expose_headers=["Set-Cookie", "Idempotent-Replayed"],
              allow_credentials=True)
         print("🌐 CORS configurado para desenvolvimento (localhost)")
 
@@ -202,6 +346,28 @@ def create_app():
     except ImportError as e:
         print(f"Warning: student_bp não encontrado - {e}")
 
+    try:
+        from app.routes.r_saved_job import saved_job_bp
+        app.register_blueprint(saved_job_bp, url_prefix='/api')
+        print("saved_job_bp registrado com sucesso")
+    except ImportError as e:
+        print(f"Warning: saved_job_bp não encontrado - {e}")
+
+    try:
+        from app.routes.r_admin import admin_bp
+        app.register_blueprint(admin_bp, url_prefix='/api')
+        print("admin_bp registrado com sucesso")
+    except ImportError as e:
+        print(f"Warning: admin_bp não encontrado - {e}")
+
+    # Comandos CLI (flask rebuild-similar-jobs, ...)
+    from app.commands import register_commands
+    register_commands(app)
+
+    # Tarefas periódicas (flask run-task <nome> executa manualmente)
+    from app.tasks import register_tasks
+    register_tasks(app)
+
     # Rota raiz
     @app.route('/')
     def index():
@@ -225,7 +391,11 @@ def create_app():
             "other_endpoints": [
                 "POST /api/jobs - Criar vaga",
                 "GET /api/jobs - Obter todas as vagas",
-                "GET /api/jobs/<id> - Obter vaga"
+                "GET /api/jobs/<id> - Obter vaga",
+                "GET /api/jobs/<id>/similar - Vagas semelhantes",
+                "POST /api/jobs/<id>/save - Salvar vaga",
+                "DELETE /api/jobs/<id>/save - Remover vaga dos salvos",
+                "GET /api/students/saved-jobs - Listar vagas salvas"
             ]
         }
 
@@ -0,0 +1,226 @@
+import click
+from flask.cli import with_appcontext
+
+
+@click.command('rebuild-similar-jobs')
+@click.option('--limit', default=None, type=int, help='Vizinhos mantidos por vaga (padrão: SIMILAR_JOBS_PER_JOB)')
+@with_appcontext
+def rebuild_similar_jobs_command(limit):
+    """Recalcular a tabela de vagas semelhantes (TF-IDF)"""
+    from flask import current_app
+    from app.services.similarity_services import SimilarityService
+
+    total = SimilarityService.rebuild_all(limit=limit or current_app.config['SIMILAR_JOBS_PER_JOB'])
+    click.echo(f'✅ {total} pares de vagas semelhantes gravados')
+
+
+@click.command('cleanup-reset-codes')
+@click.option('--batch-size', default=1000, show_default=True, help='Linhas apagadas por DELETE')
+@with_appcontext
+def cleanup_reset_codes_command(batch_size):
+    """Apagar códigos de reset de senha expirados"""
+    from app.models.reset_code import ResetCode
+
+    total = ResetCode.cleanup_expired(batch_size=batch_size)
+    click.echo(f'🧹 {total} códigos expirados apagados')
+
+
+@click.command('send-weekly-jobs')
+@click.option('--batch-size', default=None, type=int, help='Estudantes por lote (padrão: NEWSLETTER_BATCH_SIZE)')
+@click.option('--max-seconds', default=None, type=int, help='Parar depois deste tempo e retomar na próxima execução')
+@click.option('--dry-run', is_flag=True, help='Só contar os emails que seriam enviados')
+@with_appcontext
+def send_weekly_jobs_command(batch_size, max_seconds, dry_run):
+    """Enviar (ou retomar) a newsletter semanal de vagas"""
+    from flask import current_app
+    from app.services.newsletter_services import NewsletterService
+    from app.services.scheduler import scheduler
+
+    if dry_run:
+        stats = NewsletterService.send_weekly_jobs(
+            batch_size=batch_size or current_app.config['NEWSLETTER_BATCH_SIZE'], dry_run=True
+        )
+    else:
+        # Mesmo lease da tarefa periódica: nunca envia junto com o scheduler de outro processo
+        stats = scheduler.run_task('weekly_jobs_newsletter', batch_size=batch_size, max_seconds=max_seconds, manual=True)
+        if not isinstance(stats, dict):
+            click.echo('⏭️ Newsletter não executada (outro worker está enviando ou erro - ver logs)')
+            return
+
+    status = 'concluída' if stats['completed'] else 'pausada (retoma do checkpoint)'
+    click.echo(f"📬 Semana {stats['run_key']}: {stats['students']} estudantes, "
+               f"{stats['sent']} emails, {stats['failed']} falhas - {status}")
+
+
+@click.command('export-analytics')
+@click.option('--table', 'tables', multiple=True, help='Exportar só esta tabela (pode repetir)')
+@click.option('--chunk-size', default=None, type=int, help='Linhas lidas por consulta (padrão: ANALYTICS_EXPORT_CHUNK_SIZE)')
+@click.option('--output', default=None, help='Diretório de saída (padrão: ANALYTICS_EXPORT_DIR)')
+@with_appcontext
+def export_analytics_command(tables, chunk_size, output):
+    """Exportar linhas novas para Parquet (retoma do último watermark)"""
+    from flask import current_app
+    from app.services.analytics_export_services import AnalyticsExportService, EXPORT_TABLES
+
+    for table in tables:
+        if table not in EXPORT_TABLES:
+            raise click.BadParameter(f"tabelas disponíveis: {', '.join(EXPORT_TABLES)}", param_hint='--table')
+
+    config = current_app.config
+    results = AnalyticsExportService.export_all(
+        output or config['ANALYTICS_EXPORT_DIR'],
+        chunk_size=chunk_size or config['ANALYTICS_EXPORT_CHUNK_SIZE'],
+        tables=tables or None
+    )
+    for stats in results:
+        click.echo(f"📦 {stats['table']}: {stats['rows']} linhas em {stats['files']} arquivos (watermark {stats['watermark']})")
+
+
+@click.command('seed')
+@click.option('--companies', default=100, show_default=True, help='Empresas geradas')
+@click.option('--students', default=10000, show_default=True, help='Estudantes gerados')
+@click.option('--jobs', default=1000, show_default=True, help='Vagas geradas')
+@click.option('--applications', default=100000, show_default=True, help='Candidaturas geradas')
+@click.option('--batch-size', default=10000, show_default=True, help='Linhas por INSERT (executemany)')
+@click.option('--seed', 'random_seed', default=None, type=int, help='Semente para gerar os mesmos dados de novo')
+@click.option('--password', default='Senha@123', show_default=True, help='Senha de todas as contas geradas')
+@click.option('--force', is_flag=True, help='Permitir rodar com FLASK_ENV=production')
+@with_appcontext
+def seed_command(companies, students, jobs, applications, batch_size, random_seed, password, force):
+    """Gerar dados sintéticos em volume (empresas, estudantes, vagas e candidaturas)"""
+    import os
+    from app.services.seed_services import SeedService
+
+    if os.environ.get('FLASK_ENV') == 'production' and not force:
+        raise click.UsageError('Recusando gerar dados sintéticos em produção (use --force)')
+
+    def progress(step, stats):
+        click.echo(f'🌱 {step}: ' + ', '.join(f'{table}={total}' for table, total in stats.items()))
+
+    try:
+        stats = SeedService(seed=random_seed, batch_size=batch_size, password=password).run(
+            companies, students, jobs, applications, progress=progress
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    click.echo(f"✅ Dados gerados em {stats['seconds']}s")
+
+
+@click.command('run-task')
+@click.argument('name')
+@click.option('--force', is_flag=True, help='Executar mesmo se outro worker estiver com o lease')
+def run_task_command(name, force):
+    """Executar agora uma tarefa periódica registrada no scheduler"""
+    from app.services.scheduler import scheduler
+
+    if name not in scheduler.tasks:
+        raise click.BadParameter(f"tarefas disponíveis: {', '.join(sorted(scheduler.tasks))}", param_hint='NAME')
+
+    result = scheduler.run_task(name, force=force)
+    click.echo(f'✅ {name}: {result}' if result is not None else f'⏭️ {name} não executada (lease ocupado ou erro)')
+
+
+@click.group('memory')
+@click.option('--url', default='http://127.0.0.1:5000', show_default=True, envvar='ADMIN_BASE_URL',
+              help='Servidor em execução (rotas /api/admin/memory)')
+@click.pass_context
+def memory_group(ctx, url):
+    """Snapshots do tracemalloc de um worker em execução e diff entre eles"""
+    ctx.obj = url.rstrip('/')
+
+
+def _admin_request(url, method, path, **kwargs):
+    import requests
+    from flask import current_app
+
+    token = current_app.config.get('ADMIN_TOKEN')
+    if not token:
+        raise click.UsageError('ADMIN_TOKEN não configurado')
+    try:
+        response = requests.request(method, f'{url}/api/admin{path}', headers={'X-Admin-Token': token},
+                                    timeout=60, **kwargs)
+    except requests.RequestException as e:
+        raise click.ClickException(f'Servidor indisponível: {e}')
+    data = response.json() if response.headers.get('Content-Type', '').startswith('application/json') else {}
+    if response.status_code >= 400:
+        raise click.ClickException(data.get('error') or f'HTTP {response.status_code}')
+    return data
+
+
+def _print_allocations(rows):
+    for row in rows:
+        diff = f"{row['size_diff_kb']:>+12.1f} KiB {row['count_diff']:>+9}" if 'size_diff_kb' in row else ''
+        click.echo(f"{row['size_kb']:>12.1f} KiB {row['count']:>9} {diff}  {row['location']}")
+
+
+@memory_group.command('start')
+@click.option('--frames', default=10, show_default=True, help='Frames guardados por alocação')
+@click.pass_obj
+@with_appcontext
+def memory_start_command(url, frames):
+    """Ligar o tracemalloc no worker que atender"""
+    status = _admin_request(url, 'POST', '/memory/start', json={'frames': frames})
+    click.echo(f"✅ tracemalloc ligado no pid {status['pid']} ({status['frames']} frames)")
+
+
+@memory_group.command('snapshot')
+@click.option('--group-by', type=click.Choice(['lineno', 'filename']), default='lineno', show_default=True)
+@click.option('--limit', default=20, show_default=True)
+@click.pass_obj
+@with_appcontext
+def memory_snapshot_command(url, group_by, limit):
+    """Tirar um snapshot e listar as maiores alocações vivas"""
+    data = _admin_request(url, 'POST', '/memory/snapshots', params={'group_by': group_by, 'limit': limit})
+    _print_allocations(data['top'])
+    click.echo(f"📸 {data['name']}")
+
+
+@memory_group.command('diff')
+@click.argument('before')
+@click.argument('after', required=False)
+@click.option('--group-by', type=click.Choice(['lineno', 'filename']), default='lineno', show_default=True)
+@click.option('--limit', default=20, show_default=True)
+@click.pass_obj
+@with_appcontext
+def memory_diff_command(url, before, after, group_by, limit):
+    """Maiores crescimentos entre dois snapshots (sem AFTER: contra um snapshot novo)"""
+    params = {'before': before, 'group_by': group_by, 'limit': limit}
+    if after:
+        params['after'] = after
+    data = _admin_request(url, 'GET', '/memory/diff', params=params)
+    _print_allocations(data['diff'])
+    click.echo(f"🔍 {data['before']} → {data['after']}")
+
+
+@memory_group.command('stop')
+@click.pass_obj
+@with_appcontext
+def memory_stop_command(url):
+    """Desligar o tracemalloc no worker que atender"""
+    status = _admin_request(url, 'POST', '/memory/stop')
+    click.echo(f"⏹️ tracemalloc desligado no pid {status['pid']}")
+
+
+@memory_group.command('compare')
+@click.argument('before', type=click.Path(exists=True, dir_okay=False))
+@click.argument('after', type=click.Path(exists=True, dir_okay=False))
+@click.option('--group-by', type=click.Choice(['lineno', 'filename', 'traceback']), default='lineno', show_default=True)
+@click.option('--limit', default=20, show_default=True)
+def memory_compare_command(before, after, group_by, limit):
+    """Diff offline entre dois arquivos .snapshot (baixados de /api/admin/profiler/files)"""
+    import tracemalloc
+    from app.middleware.profiling import compare_snapshots
+
+    rows = compare_snapshots(tracemalloc.Snapshot.load(before), tracemalloc.Snapshot.load(after), group_by, limit)
+    _print_allocations(rows)
+
+
+def register_commands(app):
+    """Registrar comandos `flask ...` da aplicação"""
+    app.cli.add_command(rebuild_similar_jobs_command)
+    app.cli.add_command(cleanup_reset_codes_command)
+    app.cli.add_command(send_weekly_jobs_command)
+    app.cli.add_command(export_analytics_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(run_task_command)
+    app.cli.add_command(memory_group)
@@ -1,5 +1,6 @@
+import hmac
 from functools import wraps
-from flask import jsonify, current_app
+from flask import jsonify, current_app, request
 from flask_jwt_extended import (
     jwt_required, get_jwt_identity, verify_jwt_in_request,
     create_access_token, set_access_cookies, get_jwt
@@ -98,6 +99,27 @@ def student_or_company_required(f):
     """Decorator para estudantes OU empresas"""
     return auth_required(['student', 'company'])(f)
 
+def is_admin_request():
+    """Header X-Admin-Token confere com ADMIN_TOKEN (sempre falso sem ADMIN_TOKEN configurado)"""
+    expected = current_app.config.get('ADMIN_TOKEN')
+    provided = request.headers.get('X-Admin-Token', '')
+    return bool(expected) and hmac.compare_digest(provided.encode(), expected.encode())
+
+def admin_required(f):
+    """
+    Decorator para as rotas internas de operação (/api/admin/...)
+
+    Sem ADMIN_TOKEN configurado as rotas respondem 404, como se não existissem.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_app.config.get('ADMIN_TOKEN'):
+            return jsonify({'error': 'Não encontrado'}), 404
+        if not is_admin_request():
+            return jsonify({'error': 'Token de administrador inválido'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
 def refresh_token_if_needed():
     """
     Middleware para renovar token automaticamente se necessário
@@ -124,7 +146,7 @@ def refresh_token_if_needed():
                     
                     if identity and claims:
                         # Validar se usuário ainda existe
-                        user_type = claims.get('type')
+                        user_type = claims.get('user_type')
                         user_id = claims.get('user_id')
                         
                         if AuthMiddleware.validate_user_exists(user_id, user_type):
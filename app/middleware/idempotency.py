@@ -0,0 +1,145 @@
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import request, jsonify, current_app, make_response
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.idempotency_key import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint():
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b'\0')
+    digest.update(request.path.encode())
+    digest.update(b'\0')
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _replay(record):
+    response = current_app.response_class(
+        record.response_body, status=record.response_status, mimetype='application/json'
+    )
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _claim(scope, key, fingerprint):
+    """
+    Inserir a chave como 'processing'
+
+    Uma chave 'processing' mais velha que IDEMPOTENCY_PROCESSING_SECONDS foi
+    abandonada (worker morto no meio da requisição, sem passar pelo _release)
+    e é assumida por esta requisição.
+
+    Returns:
+        (None, resposta) se a chave já existe, ou (id da linha, None) se esta requisição deve executar
+    """
+    now = datetime.utcnow()
+    for _ in range(2):
+        record = IdempotencyKey(
+            scope=scope,
+            key=key,
+            endpoint=request.endpoint or request.path,
+            fingerprint=fingerprint,
+            expires_at=now + timedelta(seconds=current_app.config['IDEMPOTENCY_TTL_SECONDS'])
+        )
+        db.session.add(record)
+        try:
+            db.session.commit()
+            return record.id, None
+        except IntegrityError:
+            db.session.rollback()
+
+        existing = IdempotencyKey.query.filter_by(scope=scope, key=key).first()
+        if existing is None:
+            continue  # apagada entre o INSERT e o SELECT
+        if existing.is_expired():
+            db.session.delete(existing)
+            db.session.commit()
+            continue
+        if existing.fingerprint != fingerprint:
+            return None, (jsonify({
+                'error': 'Idempotency-Key já usada com outra requisição'
+            }), 422)
+        if existing.status != 'completed':
+            if _take_over(existing, now):
+                return existing.id, None
+            return None, (jsonify({
+                'error': 'Requisição com esta Idempotency-Key ainda em processamento'
+            }), 409, {'Retry-After': '1'})
+        return None, _replay(existing)
+
+    return None, (jsonify({'error': 'Não foi possível registrar a Idempotency-Key'}), 409, {'Retry-After': '1'})
+
+
+def _take_over(record, now):
+    """Assumir uma chave 'processing' abandonada; só uma requisição ganha o UPDATE condicional"""
+    if record.created_at > now - timedelta(seconds=current_app.config['IDEMPOTENCY_PROCESSING_SECONDS']):
+        return False
+    taken = IdempotencyKey.query.filter_by(
+        id=record.id, status='processing', created_at=record.created_at
+    ).update({
+        'created_at': now,
+        'expires_at': now + timedelta(seconds=current_app.config['IDEMPOTENCY_TTL_SECONDS'])
+    }, synchronize_session=False)
+    db.session.commit()
+    return taken == 1
+
+
+def _release(record_id):
+    """Apagar a chave para que uma nova tentativa execute de novo (erro no servidor)"""
+    db.session.rollback()
+    IdempotencyKey.query.filter_by(id=record_id).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def idempotent(f):
+    """
+    Decorator de rota: suporte ao header Idempotency-Key
+
+    Deve vir depois do decorator de autenticação (usa `current_user` como escopo).
+    A primeira requisição executa normalmente e a resposta (status < 500) fica
+    guardada por IDEMPOTENCY_TTL_SECONDS; repetições com a mesma chave e o mesmo
+    corpo recebem a resposta guardada sem executar a rota. Sem o header nada muda.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return f(*args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{HEADER} inválida (1 a {MAX_KEY_LENGTH} caracteres)'}), 400
+
+        current_user = kwargs.get('current_user') or {}
+        scope = f"{current_user.get('type')}:{current_user.get('id')}"
+
+        record_id, response = _claim(scope, key, _fingerprint())
+        if response is not None:
+            return response
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            _release(record_id)
+            raise
+
+        if response.status_code >= 500:
+            _release(record_id)
+            return response
+
+        IdempotencyKey.query.filter_by(id=record_id).update({
+            'status': 'completed',
+            'response_status': response.status_code,
+            'response_body': response.get_data(as_text=True)
+        }, synchronize_session=False)
+        db.session.commit()
+        return response
+    return decorated_function
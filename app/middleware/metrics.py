@@ -0,0 +1,273 @@
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from flask import g, request, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Limites superiores (ms) dos baldes do histograma de latência; o último é "acima de 10s"
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def percentile_from_buckets(buckets, q):
+    """Percentil aproximado (limite superior do balde) a partir das contagens do histograma"""
+    total = sum(buckets)
+    if not total:
+        return None
+    target = q * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= target:
+            return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float('inf')
+    return float('inf')
+
+
+class MetricsStore:
+    """
+    Métricas agregadas por minuto em um arquivo SQLite local
+
+    Os workers gravam os agregados a cada METRICS_FLUSH_INTERVAL segundos; o
+    dashboard de operação lê daqui e nunca do banco da aplicação.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS request_metrics ('
+                'minute INTEGER NOT NULL, route TEXT NOT NULL, method TEXT NOT NULL, '
+                'requests INTEGER NOT NULL, errors INTEGER NOT NULL, total_ms REAL NOT NULL, '
+                'max_ms REAL NOT NULL, queries INTEGER NOT NULL, max_queries INTEGER NOT NULL, '
+                'buckets TEXT NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_request_metrics_minute ON request_metrics (minute)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS gauges ('
+                'ts REAL NOT NULL, name TEXT NOT NULL, pid INTEGER NOT NULL, value REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_gauges_ts ON gauges (ts)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def write(self, request_rows, gauge_rows):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('INSERT INTO request_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', request_rows)
+            conn.executemany('INSERT INTO gauges VALUES (?, ?, ?, ?)', gauge_rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def prune(self, before):
+        conn = self._conn()
+        conn.execute('DELETE FROM request_metrics WHERE minute < ?', (int(before // 60),))
+        conn.execute('DELETE FROM gauges WHERE ts < ?', (before,))
+
+    def route_summary(self, since):
+        """Por rota: requisições, erros, p50/p95/p99 e consultas ao banco por requisição"""
+        rows = self._conn().execute(
+            'SELECT route, method, requests, errors, total_ms, max_ms, queries, max_queries, buckets '
+            'FROM request_metrics WHERE minute >= ?', (int(since // 60),)
+        ).fetchall()
+
+        totals = {}
+        for route, method, requests, errors, total_ms, max_ms, queries, max_queries, buckets in rows:
+            item = totals.setdefault((method, route), {
+                'route': route, 'method': method, 'requests': 0, 'errors': 0, 'total_ms': 0.0,
+                'max_ms': 0.0, 'queries': 0, 'max_queries': 0, 'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            })
+            item['requests'] += requests
+            item['errors'] += errors
+            item['total_ms'] += total_ms
+            item['max_ms'] = max(item['max_ms'], max_ms)
+            item['queries'] += queries
+            item['max_queries'] = max(item['max_queries'], max_queries)
+            for i, count in enumerate(json.loads(buckets)):
+                item['buckets'][i] += count
+
+        summary = []
+        for item in totals.values():
+            buckets = item.pop('buckets')
+            item['avg_ms'] = round(item.pop('total_ms') / item['requests'], 1)
+            item['p50_ms'] = percentile_from_buckets(buckets, 0.50)
+            item['p95_ms'] = percentile_from_buckets(buckets, 0.95)
+            item['p99_ms'] = percentile_from_buckets(buckets, 0.99)
+            item['avg_queries'] = round(item['queries'] / item['requests'], 2)
+            summary.append(item)
+        return sorted(summary, key=lambda item: item['requests'], reverse=True)
+
+    def request_series(self, since):
+        """Requisições e erros por minuto"""
+        return self._conn().execute(
+            'SELECT minute * 60, SUM(requests), SUM(errors) FROM request_metrics '
+            'WHERE minute >= ? GROUP BY minute ORDER BY minute', (int(since // 60),)
+        ).fetchall()
+
+    def gauge_series(self, since):
+        """(ts, nome, pid, valor) das amostras de gauges"""
+        return self._conn().execute(
+            'SELECT ts, name, pid, value FROM gauges WHERE ts >= ? ORDER BY ts', (since,)
+        ).fetchall()
+
+
+class Metrics:
+    """
+    Coleta de métricas por requisição (latência, status, consultas ao banco)
+
+    Cada worker agrega em memória por (minuto, rota, método) e grava no
+    MetricsStore no máximo a cada METRICS_FLUSH_INTERVAL segundos, junto com
+    as gauges registradas (pool de conexões, filas).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.store = None
+        self.flush_interval = 10
+        self.retention = 7 * 86400
+        self._gauges = {}
+        self._pending = {}
+        self._gauge_rows = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_prune = 0.0
+        self._listening = False
+
+    def init_app(self, app):
+        self.enabled = app.config['METRICS_ENABLED']
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+        self.store = MetricsStore(app.config['METRICS_STORAGE'])
+        self.flush_interval = app.config['METRICS_FLUSH_INTERVAL']
+        self.retention = app.config['METRICS_RETENTION_DAYS'] * 86400
+
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', _count_query)
+            self._listening = True
+        app.before_request(_before_request)
+        app.after_request(self._after_request)
+
+    def register_gauge(self, name, reader):
+        """Registrar uma gauge lida a cada flush: reader() -> número ou None"""
+        self._gauges[name] = reader
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        duration_ms = (time.perf_counter() - started) * 1000
+        route = request.url_rule.rule if request.url_rule else 'sem rota'
+        self.record(route, request.method, response.status_code, duration_ms, g.pop('metrics_queries', 0))
+        return response
+
+    def record(self, route, method, status, duration_ms, queries):
+        minute = int(time.time() // 60)
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+        with self._lock:
+            item = self._pending.get((minute, route, method))
+            if item is None:
+                item = self._pending[(minute, route, method)] = {
+                    'requests': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'queries': 0, 'max_queries': 0, 'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+            item['requests'] += 1
+            item['errors'] += status >= 500
+            item['total_ms'] += duration_ms
+            item['max_ms'] = max(item['max_ms'], duration_ms)
+            item['queries'] += queries
+            item['max_queries'] = max(item['max_queries'], queries)
+            item['buckets'][bucket] += 1
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def gauge(self, name, value):
+        """Gravar uma amostra de gauge no próximo flush"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauge_rows.append((time.time(), name, os.getpid(), float(value)))
+
+    def flush(self):
+        if not self.store:
+            return
+        now = time.time()
+        for name, reader in list(self._gauges.items()):
+            try:
+                value = reader()
+            except Exception:
+                value = None
+            if value is not None:
+                self.gauge(name, value)
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            gauge_rows, self._gauge_rows = self._gauge_rows, []
+            self._last_flush = time.monotonic()
+
+        rows = [
+            (minute, route, method, item['requests'], item['errors'], item['total_ms'], item['max_ms'],
+             item['queries'], item['max_queries'], json.dumps(item['buckets']))
+            for (minute, route, method), item in pending.items()
+        ]
+        try:
+            self.store.write(rows, gauge_rows)
+            if now - self._last_prune > 3600:
+                self._last_prune = now
+                self.store.prune(now - self.retention)
+        except sqlite3.Error:
+            # Métrica perdida não derruba a requisição
+            pass
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_queries = 0
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and 'metrics_queries' in g:
+        g.metrics_queries += 1
+
+
+def collect_default_gauges(app):
+    """Gauges do processo: pool de conexões, fila de SMS e streams SSE abertos"""
+    from app import db
+    from app.services.event_bus import event_bus
+    from app.services.sms_dispatcher import sms_dispatcher
+
+    def pool_stat(method):
+        def reader():
+            with app.app_context():
+                pool = db.engine.pool
+            return getattr(pool, method)() if hasattr(pool, method) else None
+        return reader
+
+    metrics.register_gauge('db_pool_checked_out', pool_stat('checkedout'))
+    metrics.register_gauge('db_pool_size', pool_stat('size'))
+    metrics.register_gauge('db_pool_overflow', pool_stat('overflow'))
+    metrics.register_gauge('sms_queue_depth', lambda: sms_dispatcher._queue.qsize() + len(sms_dispatcher._retries))
+    metrics.register_gauge('sse_channels', lambda: len(event_bus._subscribers))
+
+
+# Instância global de métricas
+metrics = Metrics()
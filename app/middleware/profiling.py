@@ -0,0 +1,376 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from functools import wraps
+from pathlib import Path
+
+from flask import g, request, current_app
+
+from app.middleware.auth_middleware import is_admin_request
+from app.middleware.metrics import metrics
+
+
+class StackSampler:
+    """
+    Profiler por amostragem: uma thread lê a pilha de todas as threads do
+    processo (sys._current_frames) a cada `interval` segundos
+
+    As pilhas são agregadas em memória e gravadas no formato "collapsed"
+    (`frame;frame;frame contagem` por linha), aceito por flamegraph.pl,
+    speedscope e inferno. Parado, não custa nada: a thread só existe
+    enquanto a amostragem está ligada.
+    """
+
+    def __init__(self):
+        self.output_dir = None
+        self.max_seconds = 300
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._stacks = Counter()
+        self._samples = 0
+        self._started_at = None
+        self._interval = None
+        self._last_result = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self):
+        with self._lock:
+            return {
+                'running': self.running,
+                'pid': os.getpid(),
+                'interval': self._interval,
+                'samples': self._samples,
+                'seconds': round(time.monotonic() - self._started_at, 1) if self.running else None,
+                'last': self._last_result,
+            }
+
+    def start(self, interval=0.01, seconds=None):
+        """
+        Ligar a amostragem (neste processo)
+
+        Args:
+            interval: segundos entre amostras
+            seconds: desligar sozinho depois deste tempo (máximo max_seconds)
+        """
+        if not 0.001 <= interval <= 1:
+            raise ValueError('interval deve estar entre 0.001 e 1 segundo')
+        seconds = min(seconds or self.max_seconds, self.max_seconds)
+        with self._lock:
+            if self.running:
+                raise ValueError('Amostragem já está ligada')
+            self._stacks = Counter()
+            self._samples = 0
+            self._interval = interval
+            self._started_at = time.monotonic()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval, self._started_at + seconds),
+                name='stack-sampler', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Desligar a amostragem e gravar o arquivo collapsed
+
+        Returns:
+            dict com arquivo, amostras e duração da última amostragem (None se nunca foi ligada)
+        """
+        thread = self._thread
+        if thread is None:
+            return self._last_result
+        self._stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        return self._last_result
+
+    def _run(self, interval, deadline):
+        own_id = threading.get_ident()
+        while not self._stop.wait(interval):
+            frames = sys._current_frames()
+            frames.pop(own_id, None)
+            with self._lock:
+                for frame in frames.values():
+                    self._stacks[collapse(frame)] += 1
+                self._samples += 1
+            if time.monotonic() >= deadline:
+                break
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            seconds = time.monotonic() - self._started_at
+            path = None
+            if self._stacks:
+                path = Path(self.output_dir) / f'sample-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}.collapsed'
+                write_collapsed(path, self._stacks)
+            self._last_result = {
+                'file': path.name if path else None,
+                'samples': self._samples,
+                'stacks': len(self._stacks),
+                'seconds': round(seconds, 1),
+            }
+            self._stacks = Counter()
+            self._thread = None
+
+
+def collapse(frame):
+    """Pilha de um frame no formato collapsed: da raiz para a folha, separada por ';'"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def write_collapsed(path, stacks):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+    os.replace(tmp_path, path)
+
+
+# Frames do próprio tracemalloc e do import de módulos só poluem o ranking
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+GROUP_BY = ('lineno', 'filename', 'traceback')
+
+
+class MemoryTracer:
+    """
+    Snapshots do tracemalloc sob demanda para achar vazamentos
+
+    Cada snapshot é gravado em PROFILER_OUTPUT_DIR (mem-*.snapshot) e os mais
+    recentes ficam também em memória; o diff entre dois deles mostra quem
+    mais cresceu, por arquivo e linha. Com vários workers, iniciar com
+    PYTHONTRACEMALLOC=<frames> para rastrear todos desde o boot: o start pela
+    rota só liga o processo que atendeu.
+    """
+
+    def __init__(self):
+        self.output_dir = None
+        self.max_snapshots = 10
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()
+        self._sequence = 0
+
+    def start(self, frames=10):
+        if not 1 <= frames <= 100:
+            raise ValueError('frames deve estar entre 1 e 100')
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self):
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def status(self):
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            names = list(self._snapshots)
+        return {
+            'tracing': tracemalloc.is_tracing(),
+            'pid': os.getpid(),
+            'frames': tracemalloc.get_traceback_limit() if tracemalloc.is_tracing() else None,
+            'current_kb': round(current / 1024, 1),
+            'peak_kb': round(peak / 1024, 1),
+            'overhead_kb': round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+            'snapshots': names,
+        }
+
+    def take_snapshot(self):
+        """
+        Tirar, gravar e guardar um snapshot
+
+        Returns:
+            (nome, Snapshot)
+        """
+        if not tracemalloc.is_tracing():
+            raise ValueError('tracemalloc não está ligado (POST /api/admin/memory/start)')
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        with self._lock:
+            self._sequence += 1
+            name = f'mem-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{self._sequence}.snapshot'
+            self._snapshots[name] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        snapshot.dump(str(Path(self.output_dir) / name))
+        return name, snapshot
+
+    def get_snapshot(self, name):
+        """Snapshot pelo nome: da memória ou do arquivo (tirado por outro worker)"""
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+        if snapshot is not None:
+            return snapshot
+        path = Path(self.output_dir) / name
+        if path.name != name or path.suffix != '.snapshot' or not path.is_file():
+            raise ValueError(f'Snapshot não encontrado: {name}')
+        return tracemalloc.Snapshot.load(str(path))
+
+
+def top_allocations(snapshot, group_by='lineno', limit=20):
+    """Maiores alocações vivas de um snapshot"""
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by deve ser um de: {', '.join(GROUP_BY)}")
+    return [
+        {
+            'location': _location(stat.traceback, group_by),
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count,
+        }
+        for stat in snapshot.statistics(group_by)[:limit]
+    ]
+
+
+def compare_snapshots(before, after, group_by='lineno', limit=20):
+    """Quem mais cresceu entre dois snapshots (maior size_diff primeiro)"""
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by deve ser um de: {', '.join(GROUP_BY)}")
+    return [
+        {
+            'location': _location(stat.traceback, group_by),
+            'size_kb': round(stat.size / 1024, 1),
+            'size_diff_kb': round(stat.size_diff / 1024, 1),
+            'count': stat.count,
+            'count_diff': stat.count_diff,
+        }
+        for stat in after.compare_to(before, group_by)[:limit]
+    ]
+
+
+def _location(traceback, group_by):
+    frame = traceback[0]
+    if group_by == 'filename':
+        return frame.filename
+    if group_by == 'traceback':
+        return [f'{f.filename}:{f.lineno}' for f in traceback]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+# reset_peak() zera o pico do processo inteiro: só uma requisição por vez é medida
+_peak_lock = threading.Lock()
+
+
+def track_peak_memory(f):
+    """
+    Pico de memória alocada pela view, gravado como gauge `peak_alloc_kb:<endpoint>`
+
+    Só mede com o tracemalloc ligado (ver MemoryTracer); desligado custa uma
+    chamada a is_tracing(). Como o pico é do processo, uma requisição é
+    medida por vez e as que chegam enquanto outra está sendo medida passam
+    sem medição. Ainda assim, alocações e liberações de outras threads no
+    mesmo intervalo entram na conta: o valor só é exato com um worker
+    atendendo uma requisição por vez (ex.: gunicorn -w 1 --threads 1).
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not tracemalloc.is_tracing() or not _peak_lock.acquire(blocking=False):
+            return f(*args, **kwargs)
+        try:
+            started, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                _, peak = tracemalloc.get_traced_memory()
+                metrics.gauge(f'peak_alloc_kb:{request.endpoint}', max(peak - started, 0) / 1024)
+        finally:
+            _peak_lock.release()
+    return decorated_function
+
+
+class Profiler:
+    """
+    Superfície de profiling para administradores (header X-Admin-Token = ADMIN_TOKEN)
+
+    - `?__profile=1` em qualquer rota (fora de produção): roda a requisição
+      sob cProfile e devolve o relatório do pstats no lugar da resposta; o
+      .prof fica em PROFILER_OUTPUT_DIR (snakeviz, pstats).
+    - Amostragem de pilhas ligada e desligada em tempo de execução pelas
+      rotas /api/admin/profiler (ver StackSampler).
+    - Snapshots e diffs do tracemalloc pelas rotas /api/admin/memory (ver MemoryTracer).
+
+    Sem ADMIN_TOKEN nada disso é ativado e os hooks nem são registrados.
+    """
+
+    def __init__(self):
+        self.sampler = StackSampler()
+        self.memory = MemoryTracer()
+        self.output_dir = None
+
+    def init_app(self, app):
+        self.output_dir = app.config['PROFILER_OUTPUT_DIR']
+        self.sampler.output_dir = self.output_dir
+        self.sampler.max_seconds = app.config['PROFILER_MAX_SECONDS']
+        self.memory.output_dir = self.output_dir
+        self.memory.max_snapshots = app.config['MEMORY_MAX_SNAPSHOTS']
+        app.extensions['profiler'] = self
+        if app.config['ADMIN_TOKEN'] and app.config['PROFILE_REQUESTS_ENABLED']:
+            app.before_request(_start_request_profile)
+            app.after_request(self._finish_request_profile)
+
+    def _finish_request_profile(self, response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+        profile.disable()
+
+        path = Path(self.output_dir) / (
+            f'request-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{request.endpoint or "sem-rota"}.prof'
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(path)
+
+        sort = request.args.get('__sort', 'cumulative')
+        if sort not in ('cumulative', 'tottime', 'ncalls'):
+            sort = 'cumulative'
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out)
+        stats.sort_stats(sort).print_stats(request.args.get('__limit', 40, type=int))
+
+        response.set_data(f'{request.method} {request.full_path} -> {response.status}\n{out.getvalue()}')
+        response.mimetype = 'text/plain'
+        response.headers['X-Profile-File'] = path.name
+        return response
+
+
+def _start_request_profile():
+    if request.args.get('__profile') != '1' or not is_admin_request():
+        return
+    g.request_profile = cProfile.Profile()
+    g.request_profile.enable()
+
+
+def profile_file(name):
+    """Caminho de um arquivo gerado pelo profiler (só nomes simples, sem diretórios)"""
+    output_dir = Path(current_app.extensions['profiler'].output_dir)
+    path = output_dir / name
+    if path.name != name or path.suffix not in ('.prof', '.collapsed', '.snapshot') or not path.is_file():
+        return None
+    return path
+
+
+# Instância global do profiler
+profiler = Profiler()
@@ -0,0 +1,204 @@
+import math
+import sqlite3
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+from flask import request, jsonify, current_app
+
+# Políticas padrão: (capacidade do balde, período em segundos para encher de novo)
+DEFAULT_POLICIES = {
+    'login': {'ip': (20, 60), 'account': (5, 300)},
+    'register': {'ip': (5, 3600)},
+    'reset_password': {'ip': (5, 900), 'account': (3, 900)},
+    'verify_reset_code': {'ip': (10, 900), 'account': (5, 900)},
+}
+
+
+class MemoryBucketStore:
+    """Baldes em memória - vale só para o processo atual (testes/desenvolvimento)"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Baldes em um arquivo SQLite local compartilhado entre os workers
+
+    Cada `take` é uma transação `BEGIN IMMEDIATE`, então workers diferentes
+    nunca gastam o mesmo token. Não toca no banco da aplicação.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._calls = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate, now=None):
+        now = time.time() if now is None else now
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._calls += 1
+        if self._calls % self.PRUNE_EVERY == 0:
+            self.prune(now)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def prune(self, now=None, max_age=86400):
+        """Apagar baldes parados há mais de `max_age` segundos (já estariam cheios)"""
+        now = time.time() if now is None else now
+        self._conn().execute('DELETE FROM buckets WHERE updated_at < ?', (now - max_age,))
+
+    def reset(self):
+        self._conn().execute('DELETE FROM buckets')
+
+
+class RateLimiter:
+    """Limite de requisições por token bucket, por IP e por conta (email/telefone)"""
+
+    def __init__(self):
+        self.enabled = True
+        self.policies = dict(DEFAULT_POLICIES)
+        self.trust_proxy = False
+        self.store = MemoryBucketStore()
+
+    def init_app(self, app):
+        self.enabled = app.config['RATE_LIMIT_ENABLED']
+        self.policies = app.config['RATE_LIMIT_POLICIES']
+        self.trust_proxy = app.config['RATE_LIMIT_TRUST_PROXY']
+
+        storage = app.config['RATE_LIMIT_STORAGE']
+        if storage == 'memory':
+            self.store = MemoryBucketStore()
+        else:
+            self.store = SQLiteBucketStore(storage)
+        app.extensions['rate_limiter'] = self
+
+    def client_ip(self):
+        if self.trust_proxy and request.access_route:
+            return request.access_route[0]
+        return request.remote_addr or 'unknown'
+
+    def check(self, policy_name, account=None):
+        """
+        Consumir um token de cada balde da política
+
+        Returns:
+            Segundos até a próxima tentativa permitida, ou 0 se liberado
+        """
+        policy = self.policies.get(policy_name, {})
+        keys = []
+        if 'ip' in policy:
+            keys.append(('ip', f'{policy_name}:ip:{self.client_ip()}'))
+        if 'account' in policy and account:
+            keys.append(('account', f'{policy_name}:account:{account}'))
+
+        retry_after = 0
+        for scope, key in keys:
+            capacity, period = policy[scope]
+            try:
+                allowed, wait = self.store.take(key, capacity, capacity / period)
+            except sqlite3.Error as e:
+                # Falha no contador não derruba o login
+                current_app.logger.warning(f'Rate limit indisponível: {str(e)}')
+                return 0
+            if not allowed:
+                retry_after = max(retry_after, wait)
+        return retry_after
+
+    def limit(self, policy_name, account_fields=()):
+        """
+        Decorator de rota: rejeita com 429 antes de qualquer acesso ao banco ou hash
+
+        Args:
+            policy_name: Nome da política em RATE_LIMIT_POLICIES
+            account_fields: Campos do JSON usados como identificador da conta
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if not self.enabled:
+                    return f(*args, **kwargs)
+
+                data = request.get_json(silent=True) or {}
+                account = None
+                for field in account_fields:
+                    value = data.get(field)
+                    if isinstance(value, str) and value.strip():
+                        account = _normalize_identifier(value)
+                        break
+
+                retry_after = self.check(policy_name, account)
+                if retry_after:
+                    return jsonify({
+                        'error': 'Muitas tentativas. Tente novamente mais tarde'
+                    }), 429, {'Retry-After': str(math.ceil(retry_after))}
+
+                return f(*args, **kwargs)
+            return decorated_function
+        return decorator
+
+
+def _normalize_identifier(value):
+    """Email em minúsculo ou só os dígitos do telefone"""
+    value = value.strip().lower()
+    if '@' in value:
+        return value
+    digits = ''.join(c for c in value if c.isdigit())
+    return digits or value
+
+
+# Instância global do limitador
+rate_limiter = RateLimiter()
@@ -4,5 +4,16 @@ from .job import Job
 from .application import Application
 from .savedjob import SavedJob
 from .reset_code import ResetCode
+from .job_similarity import JobSimilarity, JobSimilarityRefresh
+from .task_lease import TaskLease
+from .account import Account
+from .checkpoint import Checkpoint
+from .application_status_event import ApplicationStatusEvent
+from .email_outbox import EmailOutbox
+from .idempotency_key import IdempotencyKey
+from .job_daily_stats import JobDailyStats
+from .job_response_stats import JobResponseStats
 
-__all__ = ['Student', 'Company', 'Job', 'Application', 'SavedJob', 'ResetCode']
\ No newline at end of file
+__all__ = ['Student', 'Company', 'Job', 'Application', 'SavedJob', 'ResetCode', 'JobSimilarity', 'JobSimilarityRefresh', 'TaskLease', 'Account', 'Checkpoint',
+           'ApplicationStatusEvent', 'EmailOutbox', 'IdempotencyKey',
+           'JobDailyStats', 'JobResponseStats']
\ No newline at end of file
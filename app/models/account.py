@@ -0,0 +1,26 @@
+from app import db
+from datetime import datetime
+
+class Account(db.Model):
+    """
+    Índice de identidade compartilhado entre estudantes e empresas
+
+    Uma linha por conta com email/telefone normalizados, para que buscas
+    por identidade (login, reset de senha, cadastro) consultem uma única
+    tabela indexada e o email seja único entre os dois tipos de conta.
+    """
+    __tablename__ = 'accounts'
+    __table_args__ = (
+        db.UniqueConstraint('user_type', 'user_id', name='uq_accounts_user'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(255), unique=True, nullable=False)  # minúsculo
+    phone = db.Column(db.String(20), unique=True, nullable=True)  # E.164
+    user_type = db.Column(db.Enum('student', 'company', name='account_user_type'), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<Account {self.user_type}:{self.user_id} - {self.email}>'
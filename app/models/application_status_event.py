@@ -0,0 +1,34 @@
+from app import db
+from datetime import datetime
+
+class ApplicationStatusEvent(db.Model):
+    """
+    Histórico de mudanças de status de candidaturas (somente inserção)
+
+    Gravado na mesma transação que altera `applications.status`; os workers
+    de notificação leem a tabela em ordem de `id` a partir de um checkpoint.
+    Não tem FK para `applications` para sobreviver à exclusão da candidatura.
+    """
+    __tablename__ = 'application_status_events'
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    application_id = db.Column(db.Integer, nullable=False, index=True)
+    student_id = db.Column(db.Integer, nullable=False, index=True)
+    job_id = db.Column(db.Integer, nullable=False)
+    old_status = db.Column(db.String(20), nullable=True)
+    new_status = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<ApplicationStatusEvent {self.id} app={self.application_id} {self.old_status}->{self.new_status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'application_id': self.application_id,
+            'student_id': self.student_id,
+            'job_id': self.job_id,
+            'old_status': self.old_status,
+            'new_status': self.new_status,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
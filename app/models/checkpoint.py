@@ -0,0 +1,74 @@
+from app import db
+from datetime import datetime
+
+class Checkpoint(db.Model):
+    """
+    Progresso salvo de processos em lote (newsletter, workers de eventos, exports)
+
+    `position` é o último id processado; `run_key` identifica a execução
+    (ex.: semana ISO da newsletter) para saber quando recomeçar do zero.
+    Nas exportações por (updated_at, id), `run_key` guarda o updated_at do watermark.
+    """
+    __tablename__ = 'checkpoints'
+
+    name = db.Column(db.String(100), primary_key=True)
+    run_key = db.Column(db.String(50), nullable=True)
+    position = db.Column(db.BigInteger, default=0, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<Checkpoint {self.name} run={self.run_key} position={self.position}>'
+
+    @staticmethod
+    def load(name):
+        """Obter (ou criar na sessão) o checkpoint com este nome"""
+        checkpoint = db.session.get(Checkpoint, name)
+        if checkpoint is None:
+            checkpoint = Checkpoint(name=name, position=0)
+            db.session.add(checkpoint)
+        return checkpoint
+
+    @staticmethod
+    def ensure(name):
+        """Obter o checkpoint garantindo que a linha já existe no banco (para `advance`)"""
+        from sqlalchemy.exc import IntegrityError
+
+        checkpoint = db.session.get(Checkpoint, name)
+        if checkpoint is not None:
+            return checkpoint
+        db.session.add(Checkpoint(name=name, position=0))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Outro worker criou ao mesmo tempo
+            db.session.rollback()
+        return db.session.get(Checkpoint, name)
+
+    @staticmethod
+    def advance(name, expected, position):
+        """
+        Avançar o checkpoint só se ele ainda está em `expected` (UPDATE condicional, sem commit)
+
+        O UPDATE trava a linha até o commit: um segundo worker que leu a mesma
+        posição espera e recebe False, e deve desfazer o lote (rollback).
+
+        Returns:
+            True se este worker avançou o checkpoint
+        """
+        result = db.session.execute(
+            db.update(Checkpoint)
+            .where(Checkpoint.name == name, Checkpoint.position == expected)
+            .values(position=position, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'run_key': self.run_key,
+            'position': self.position,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -1,5 +1,5 @@
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_service import password_service
 from datetime import datetime, timezone
 
 class Company(db.Model):
@@ -19,6 +19,7 @@ class Company(db.Model):
     city = db.Column(db.String(100))
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)  # UTC; watermark da exportação analítica
     
     # Relacionamentos
     jobs = db.relationship('Job', back_populates='company', lazy=True, cascade='all, delete-orphan')
@@ -27,10 +28,13 @@ class Company(db.Model):
         return f'<Company {self.name} - {self.email}>'
     
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = password_service.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return password_service.verify(self.password, password)
+    
+    def password_needs_rehash(self):
+        return password_service.needs_rehash(self.password)
     
     def to_dict(self):
         return {
@@ -0,0 +1,43 @@
+from app import db
+from datetime import datetime
+
+class EmailOutbox(db.Model):
+    """
+    Emails aguardando envio
+
+    Quem gera o email só insere a linha (na mesma transação do resto);
+    a tarefa `email_outbox` envia em lote pelo pool SMTP. `dedupe_key`
+    impede que um worker reprocessado gere o mesmo email duas vezes.
+    Cada lote é reservado (status 'sending' + claimed_by) antes do envio,
+    para dois workers nunca enviarem o mesmo email.
+    """
+    __tablename__ = 'email_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    dedupe_key = db.Column(db.String(150), unique=True, nullable=True)
+    to_email = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    html_body = db.Column(db.Text, nullable=False)
+    text_body = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), default='pending', nullable=False, index=True)  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    claimed_by = db.Column(db.String(150), nullable=True, index=True)  # lote que reservou o email
+    claimed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.to_email} {self.status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'to_email': self.to_email,
+            'subject': self.subject,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
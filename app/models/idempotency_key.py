@@ -0,0 +1,57 @@
+from app import db
+from datetime import datetime
+
+class IdempotencyKey(db.Model):
+    """
+    Respostas guardadas por header Idempotency-Key
+
+    Uma linha por (escopo, chave): a primeira requisição grava 'processing',
+    executa e guarda status + corpo; as repetições com a mesma chave recebem
+    a resposta guardada até `expires_at`.
+    """
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (db.UniqueConstraint('scope', 'key', name='uq_idempotency_keys_scope_key'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(50), nullable=False)  # ex: company:3, student:7
+    key = db.Column(db.String(255), nullable=False)
+    endpoint = db.Column(db.String(100), nullable=False)
+    fingerprint = db.Column(db.String(64), nullable=False)  # sha256 de método + caminho + corpo
+    status = db.Column(db.String(20), default='processing', nullable=False)  # processing, completed
+    response_status = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.scope} {self.key} {self.status}>'
+
+    def is_expired(self):
+        return datetime.utcnow() >= self.expires_at
+
+    @classmethod
+    def cleanup_expired(cls, batch_size=1000):
+        """
+        Apagar chaves expiradas em lotes (executado periodicamente pelo scheduler)
+
+        Returns:
+            Total de chaves apagadas
+        """
+        now = datetime.utcnow()
+        if db.session.get_bind().dialect.name == 'mysql':
+            statement = db.text("DELETE FROM idempotency_keys WHERE expires_at <= :now LIMIT :limit")
+            params = {'now': now, 'limit': batch_size}
+        else:
+            expired_ids = db.select(cls.id).where(cls.expires_at <= now).limit(batch_size)
+            statement = db.delete(cls).where(cls.id.in_(expired_ids))\
+                .execution_options(synchronize_session=False)
+            params = {}
+
+        total = 0
+        while True:
+            deleted = db.session.execute(statement, params).rowcount
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+        return total
@@ -19,6 +19,7 @@ class Job(db.Model):
     skills = db.Column(db.Text)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)  # UTC; watermark da exportação analítica
     
     # Foreign Keys - agora referencia companies diretamente
     company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False)
@@ -30,7 +31,9 @@ class Job(db.Model):
     def __repr__(self):
         return f'<Job {self.title}>'
     
-    def to_dict(self):
+    def to_dict(self, applications_count=None):
+        # applications_count: total já contado em lote (ApplicationService.get_applications_count_by_job),
+        # evita uma consulta COUNT por vaga em listagens
         # Parse benefits if it's a string
         benefits_list = []
         if self.benefits:
@@ -68,5 +71,5 @@ class Job(db.Model):
             'company_phone': self.company.phone if self.company else None,
             'company_email': self.company.email if self.company else None,
             # Contagem de candidaturas
-            'applications_count': self.applications.count() if self.applications else 0,
+            'applications_count': self.applications.count() if applications_count is None else applications_count,
         }
\ No newline at end of file
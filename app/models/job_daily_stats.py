@@ -0,0 +1,30 @@
+from app import db
+
+class JobDailyStats(db.Model):
+    """
+    Rollup diário por vaga para o dashboard de analytics da empresa
+
+    `applications` conta candidaturas recebidas no dia; as outras colunas
+    contam quantas candidaturas entraram naquele status no dia (eventos de
+    `application_status_events`). Mantida pela tarefa `analytics_rollup`.
+    """
+    __tablename__ = 'job_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'day', name='uq_job_daily_stats_job_day'),
+        db.Index('ix_job_daily_stats_company_id_day', 'company_id', 'day'),
+    )
+
+    STATUS_COLUMNS = ('analysis', 'interview', 'accepted', 'rejected')
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=False)
+    company_id = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    applications = db.Column(db.Integer, default=0, nullable=False)
+    analysis = db.Column(db.Integer, default=0, nullable=False)
+    interview = db.Column(db.Integer, default=0, nullable=False)
+    accepted = db.Column(db.Integer, default=0, nullable=False)
+    rejected = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<JobDailyStats job={self.job_id} {self.day}>'
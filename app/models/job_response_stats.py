@@ -0,0 +1,24 @@
+from app import db
+
+class JobResponseStats(db.Model):
+    """
+    Tempo até a primeira resposta por vaga (rollup)
+
+    Soma dos segundos entre a candidatura e sua primeira mudança de status;
+    a média é `total_response_seconds / responded`.
+    """
+    __tablename__ = 'job_response_stats'
+
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    company_id = db.Column(db.Integer, nullable=False, index=True)
+    responded = db.Column(db.Integer, default=0, nullable=False)
+    total_response_seconds = db.Column(db.BigInteger, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<JobResponseStats job={self.job_id} responded={self.responded}>'
+
+    @property
+    def average_response_hours(self):
+        if not self.responded:
+            return None
+        return round(self.total_response_seconds / self.responded / 3600, 1)
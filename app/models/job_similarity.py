@@ -0,0 +1,38 @@
+from app import db
+from datetime import datetime
+
+class JobSimilarity(db.Model):
+    """Tabela de vizinhos mais próximos (TF-IDF) pré-calculada para cada vaga"""
+    __tablename__ = 'job_similarities'
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'similar_job_id', name='uq_job_similarities_pair'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
+    similar_job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    similar_job = db.relationship('Job', foreign_keys=[similar_job_id])
+
+    def __repr__(self):
+        return f'<JobSimilarity {self.job_id} -> {self.similar_job_id} ({self.score:.3f})>'
+
+
+class JobSimilarityRefresh(db.Model):
+    """
+    Fila de vagas com vizinhos a recalcular
+
+    Criar/editar/desativar vaga só insere a linha (na mesma transação);
+    a tarefa `similar_jobs_refresh` processa a fila em lote, fora da requisição.
+    """
+    __tablename__ = 'job_similarity_refreshes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=False)  # sem FK: a vaga pode ter sido deletada
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<JobSimilarityRefresh {self.job_id}>'
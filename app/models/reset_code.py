@@ -15,7 +15,7 @@ class ResetCode(db.Model):
     user_type = db.Column(db.Enum('student', 'company', name='user_type'), nullable=False)
     is_used = db.Column(db.Boolean, default=False, nullable=False)
     verification_token = db.Column(db.String(64), nullable=True, index=True)  # Token para confirmar nova senha
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     def __init__(self, email=None, phone=None, method='email', user_type='student', expires_in_minutes=15):
@@ -49,15 +49,49 @@ class ResetCode(db.Model):
         """Verificar se o código é válido (não usado e não expirado)"""
         return not self.is_used and not self.is_expired()
     
-    def mark_as_used(self):
-        """Marcar código como usado"""
-        self.is_used = True
-        db.session.commit()
-    
-    def set_verification_token(self, token):
-        """Definir token de verificação para confirmar nova senha"""
-        self.verification_token = token
+    @classmethod
+    def redeem(cls, code, token, email=None, phone=None, method='email'):
+        """
+        Resgatar um código de forma atômica
+
+        Um único UPDATE condicional marca o código como usado e grava o token
+        de verificação. Só a primeira requisição concorrente afeta a linha;
+        as demais recebem rowcount 0.
+
+        Args:
+            code: Código de 6 dígitos
+            token: Token de verificação a ser gravado
+            email: Email do usuário (se method='email')
+            phone: Telefone do usuário (se method='sms')
+            method: 'email' ou 'sms'
+
+        Returns:
+            user_type gravado no código ('student' ou 'company') ou None se inválido/expirado
+        """
+        conditions = [
+            cls.code == code,
+            cls.method == method,
+            cls.is_used == False,
+            cls.expires_at > datetime.utcnow()
+        ]
+        if method == 'email':
+            conditions.append(cls.email == email)
+        else:
+            conditions.append(cls.phone == phone)
+
+        result = db.session.execute(
+            db.update(cls)
+            .where(*conditions)
+            .values(is_used=True, verification_token=token)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
+            return None
+
+        user_type = db.session.query(cls.user_type).filter_by(verification_token=token).scalar()
         db.session.commit()
+        return user_type
     
     @classmethod
     def find_by_token(cls, token):
@@ -94,13 +128,38 @@ class ResetCode(db.Model):
         return query.first()
     
     @classmethod
-    def cleanup_expired(cls):
-        """Limpar códigos expirados (executar periodicamente)"""
-        expired_codes = cls.query.filter(cls.expires_at <= datetime.utcnow()).all()
-        for code in expired_codes:
-            db.session.delete(code)
-        db.session.commit()
-        return len(expired_codes)
+    def cleanup_expired(cls, batch_size=1000):
+        """
+        Apagar códigos expirados em lotes (executado periodicamente pelo scheduler)
+
+        Cada lote é um único DELETE no banco com commit próprio, sem carregar
+        as linhas na memória e sem segurar locks por muito tempo.
+
+        Args:
+            batch_size: Máximo de linhas apagadas por DELETE
+
+        Returns:
+            Total de códigos apagados
+        """
+        now = datetime.utcnow()
+        if db.session.get_bind().dialect.name == 'mysql':
+            statement = db.text("DELETE FROM reset_codes WHERE expires_at <= :now LIMIT :limit")
+            params = {'now': now, 'limit': batch_size}
+        else:
+            # SQLite/PostgreSQL não aceitam LIMIT no DELETE: limitar via subconsulta de ids
+            expired_ids = db.select(cls.id).where(cls.expires_at <= now).limit(batch_size)
+            statement = db.delete(cls).where(cls.id.in_(expired_ids))\
+                .execution_options(synchronize_session=False)
+            params = {}
+
+        total = 0
+        while True:
+            deleted = db.session.execute(statement, params).rowcount
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+        return total
     
     def to_dict(self):
         """Converter para dicionário (sem expor o código)"""
@@ -1,11 +1,30 @@
 from app import db
 from datetime import datetime
-from enum import Enum
-from werkzeug.security import generate_password_hash,check_password_hash
 
 class SavedJob(db.Model):
- __tablename__ = "saved_jobs"
- id = db.Column(db.Integer, primary_key=True)
- created_at = db.Column(db.DateTime, default=datetime.utcnow)
- student_id = db.Column(db.Integer, db.ForeignKey("students.id"))
- job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"))
\ No newline at end of file
+    """Vaga salva (favoritada) por um estudante"""
+    __tablename__ = "saved_jobs"
+    __table_args__ = (
+        # Também atende as buscas por student_id (prefixo do índice)
+        db.UniqueConstraint('student_id', 'job_id', name='uq_saved_jobs_student_job'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    student_id = db.Column(db.Integer, db.ForeignKey("students.id"), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), nullable=False, index=True)
+
+    # Relationships
+    job = db.relationship('Job')
+
+    def __repr__(self):
+        return f'<SavedJob student={self.student_id} job={self.job_id}>'
+
+    def to_dict(self, applications_count=None):
+        return {
+            'id': self.id,
+            'student_id': self.student_id,
+            'job_id': self.job_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'job': self.job.to_dict(applications_count=applications_count) if self.job else None
+        }
@@ -0,0 +1,22 @@
+from app import db
+from datetime import datetime
+
+class TaskLease(db.Model):
+    """Lease de tarefas periódicas - garante uma única execução entre vários workers"""
+    __tablename__ = 'task_leases'
+
+    name = db.Column(db.String(100), primary_key=True)
+    owner = db.Column(db.String(150), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    last_run_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<TaskLease {self.name} owner={self.owner} expires_at={self.expires_at}>'
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'owner': self.owner,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None
+        }
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, make_response, current_app
 from app import db
 from app.services.auth_services import AuthService
+from app.services.password_service import PasswordServiceBusy
 from app.services.student_service import StudentService
 from app.services.company_services import CompanyService
 from app.schemas.student_schema import StudentSchema
@@ -11,6 +12,7 @@ from flask_jwt_extended import (
     get_jwt
 )
 from app.middleware.auth_middleware import student_or_company_required
+from app.middleware.rate_limit import rate_limiter
 
 auth_bp = Blueprint('auth', __name__)
 student_schema = StudentSchema()
@@ -57,6 +59,7 @@ def debug_cookies():
     return jsonify(debug_info), 200
 
 @auth_bp.route('/register/student', methods=['POST'])
+@rate_limiter.limit('register')
 def register_student():
     """Registrar novo estudante"""
     try:
@@ -83,12 +86,15 @@ def register_student():
             'student': student_schema.dump(student)
         }), 201
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except ValueError as e:
         return jsonify({'error': str(e)}), 409
     except Exception as e:
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/register/company', methods=['POST'])
+@rate_limiter.limit('register')
 def register_company():
     """Registrar nova empresa"""
     try:
@@ -117,12 +123,15 @@ def register_company():
             'company': company_schema.dump(company)
         }), 201
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except ValueError as e:
         return jsonify({'error': str(e)}), 409
     except Exception as e:
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/login/student', methods=['POST'])
+@rate_limiter.limit('login', account_fields=('email',))
 def login_student():
     """Login para estudantes com cookies seguros"""
     try:
@@ -145,12 +154,13 @@ def login_student():
                 'type': 'student'
             }
         )
+        # 'type' é reservado pelo flask-jwt-extended (access/refresh): no refresh token o tipo vai em 'user_type'
         refresh_token = create_refresh_token(
             identity=user_identity,
             additional_claims={
                 'user_id': student.id,
                 'email': student.email,
-                'type': 'student'
+                'user_type': 'student'
             }
         )
         
@@ -185,6 +195,8 @@ def login_student():
         
         return response, 200
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except ValueError as e:
         return jsonify({'error': str(e)}), 401
     except Exception as e:
@@ -192,6 +204,7 @@ def login_student():
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/login/company', methods=['POST'])
+@rate_limiter.limit('login', account_fields=('email',))
 def login_company():
     """Login para empresas com cookies seguros"""
     try:
@@ -214,12 +227,13 @@ def login_company():
                 'type': 'company'
             }
         )
+        # 'type' é reservado pelo flask-jwt-extended (access/refresh): no refresh token o tipo vai em 'user_type'
         refresh_token = create_refresh_token(
             identity=user_identity,
             additional_claims={
                 'user_id': company.id,
                 'email': company.email,
-                'type': 'company'
+                'user_type': 'company'
             }
         )
         
@@ -254,6 +268,8 @@ def login_company():
         
         return response, 200
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except ValueError as e:
         return jsonify({'error': str(e)}), 401
     except Exception as e:
@@ -305,7 +321,7 @@ def refresh():
             return jsonify({'error': 'Refresh token inválido - sem claims'}), 401
         
         # Verificar se usuário ainda existe e está ativo
-        user_type = claims.get('type')
+        user_type = claims.get('user_type')
         user_id = claims.get('user_id')
         
         if current_app.debug:
@@ -385,6 +401,8 @@ def get_current_user(**kwargs):
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
         if user_type == 'student':
+            # Recarregar com candidaturas e vagas em lote (o dump percorre todas)
+            user_data = StudentService.get_student_with_applications(user_data.id) or user_data
             return jsonify({
                 'user': student_schema.dump(user_data),
                 'type': 'student'
@@ -403,6 +421,7 @@ def get_current_user(**kwargs):
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/reset-password', methods=['POST'])
+@rate_limiter.limit('reset_password', account_fields=('email', 'phone'))
 def reset_password():
     """Enviar código de reset de senha por email ou SMS"""
     try:
@@ -450,6 +469,7 @@ def reset_password():
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/verify-reset-code', methods=['POST'])
+@rate_limiter.limit('verify_reset_code', account_fields=('email', 'phone'))
 def verify_reset_code():
     """Verificar código de reset de senha"""
     try:
@@ -537,6 +557,8 @@ def confirm_new_password():
         
         return jsonify(result), 200
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
@@ -0,0 +1,120 @@
+from flask import Blueprint, request, jsonify, current_app, send_file
+from app.middleware.auth_middleware import admin_required
+from app.middleware.profiling import profiler, profile_file, top_allocations, compare_snapshots, GROUP_BY
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/admin/profiler', methods=['GET'])
+@admin_required
+def get_profiler_status():
+    """Estado da amostragem de pilhas neste processo"""
+    return jsonify(profiler.sampler.status()), 200
+
+@admin_bp.route('/admin/profiler/start', methods=['POST'])
+@admin_required
+def start_profiler():
+    """
+    Ligar a amostragem de pilhas neste processo
+
+    Corpo opcional: {"interval": 0.01, "seconds": 60}. Com vários workers só
+    o processo que atendeu a requisição é amostrado (o pid vem na resposta).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        interval = float(data.get('interval', current_app.config['PROFILER_SAMPLE_INTERVAL']))
+        seconds = float(data['seconds']) if data.get('seconds') else None
+        profiler.sampler.start(interval=interval, seconds=seconds)
+        return jsonify(profiler.sampler.status()), 201
+
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@admin_bp.route('/admin/profiler/stop', methods=['POST'])
+@admin_required
+def stop_profiler():
+    """Desligar a amostragem e gravar o arquivo collapsed (flamegraph)"""
+    result = profiler.sampler.stop()
+    if result is None:
+        return jsonify({'error': 'Amostragem não foi ligada neste processo'}), 409
+    return jsonify(result), 200
+
+@admin_bp.route('/admin/profiler/files/<name>', methods=['GET'])
+@admin_required
+def download_profile(name):
+    """Baixar um .collapsed (flamegraph.pl, speedscope), .prof (snakeviz, pstats) ou .snapshot (flask memory compare)"""
+    path = profile_file(name)
+    if path is None:
+        return jsonify({'error': 'Arquivo não encontrado'}), 404
+    return send_file(path, as_attachment=True, download_name=name)
+
+@admin_bp.route('/admin/memory', methods=['GET'])
+@admin_required
+def get_memory_status():
+    """Estado do tracemalloc neste processo (memória rastreada e snapshots guardados)"""
+    return jsonify(profiler.memory.status()), 200
+
+@admin_bp.route('/admin/memory/start', methods=['POST'])
+@admin_required
+def start_memory_tracing():
+    """Ligar o tracemalloc neste processo. Corpo opcional: {"frames": 10}"""
+    try:
+        data = request.get_json(silent=True) or {}
+        return jsonify(profiler.memory.start(frames=int(data.get('frames', 10)))), 201
+
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@admin_bp.route('/admin/memory/stop', methods=['POST'])
+@admin_required
+def stop_memory_tracing():
+    """Desligar o tracemalloc e descartar os snapshots em memória (os arquivos ficam)"""
+    profiler.memory.stop()
+    return jsonify(profiler.memory.status()), 200
+
+@admin_bp.route('/admin/memory/snapshots', methods=['POST'])
+@admin_required
+def take_memory_snapshot():
+    """Tirar um snapshot; devolve o nome (para o diff) e as maiores alocações vivas"""
+    try:
+        group_by = request.args.get('group_by', 'lineno')
+        limit = request.args.get('limit', 20, type=int)
+        if group_by not in GROUP_BY:
+            return jsonify({'error': f"group_by deve ser um de: {', '.join(GROUP_BY)}"}), 400
+        name, snapshot = profiler.memory.take_snapshot()
+        return jsonify({'name': name, 'top': top_allocations(snapshot, group_by, limit)}), 201
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@admin_bp.route('/admin/memory/diff', methods=['GET'])
+@admin_required
+def diff_memory_snapshots():
+    """
+    Diferença entre dois snapshots, por arquivo e linha (?group_by=filename por arquivo)
+
+    ?before=<nome>&after=<nome>; sem `after` um snapshot novo é tirado agora.
+    """
+    try:
+        before_name = request.args.get('before')
+        if not before_name:
+            return jsonify({'error': 'Parâmetro before é obrigatório'}), 400
+        group_by = request.args.get('group_by', 'lineno')
+        limit = request.args.get('limit', 20, type=int)
+        if group_by not in GROUP_BY:
+            return jsonify({'error': f"group_by deve ser um de: {', '.join(GROUP_BY)}"}), 400
+
+        before = profiler.memory.get_snapshot(before_name)
+        after_name = request.args.get('after')
+        if after_name:
+            after = profiler.memory.get_snapshot(after_name)
+        else:
+            after_name, after = profiler.memory.take_snapshot()
+
+        return jsonify({
+            'before': before_name,
+            'after': after_name,
+            'diff': compare_snapshots(before, after, group_by, limit),
+        }), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
@@ -1,7 +1,9 @@
-from flask import Blueprint, request, jsonify
-from app.services.application_services import ApplicationService
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from app.services.application_services import ApplicationService, JobNotFound, NotJobOwner
 from app.schemas.application_schema import ApplicationSchema, ApplyToJobSchema, ApplicationStatusUpdateSchema
 from app.middleware.auth_middleware import student_required, company_required
+from app.middleware.idempotency import idempotent
+from app.utils.streaming_export import iter_csv, iter_xlsx
 
 application_bp = Blueprint('application', __name__)
 application_schema = ApplicationSchema()
@@ -11,6 +13,7 @@ status_update_schema = ApplicationStatusUpdateSchema()
 
 @application_bp.route('/jobs/<int:job_id>/apply', methods=['POST'])
 @student_required
+@idempotent
 def apply_to_job(job_id, **kwargs):
     """Estudante se candidatar a uma vaga"""
     try:
@@ -52,6 +55,45 @@ def apply_to_job(job_id, **kwargs):
         current_app.logger.error(f"Erro ao aplicar para vaga: {str(e)}")
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
+@application_bp.route('/jobs/<int:job_id>/applications/export', methods=['GET'])
+@company_required
+def export_job_applications(job_id, **kwargs):
+    """Empresa exportar candidatos de uma vaga em CSV ou XLSX (streaming)"""
+    try:
+        current_user = kwargs.get('current_user')
+        if not current_user or not current_user.get('id'):
+            return jsonify({'error': 'Usuário não autenticado'}), 401
+
+        export_format = request.args.get('format', 'csv').lower()
+        if export_format not in ('csv', 'xlsx'):
+            return jsonify({'error': 'Formato inválido. Use csv ou xlsx'}), 400
+
+        ApplicationService.get_job_for_export(job_id, current_user['id'])
+        rows = ApplicationService.iter_export_rows(job_id)
+        filename = f'candidatos_vaga_{job_id}.{export_format}'
+
+        if export_format == 'csv':
+            body = iter_csv(ApplicationService.EXPORT_HEADER, rows)
+            mimetype = 'text/csv'
+        else:
+            body = iter_xlsx(ApplicationService.EXPORT_HEADER, rows, sheet_name='Candidatos')
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+        return Response(stream_with_context(body), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no',
+        })
+
+    except JobNotFound as e:
+        return jsonify({'error': str(e)}), 404
+    except NotJobOwner as e:
+        return jsonify({'error': str(e)}), 403
+    except Exception as e:
+        from flask import current_app
+        current_app.logger.error(f"Erro ao exportar candidaturas: {str(e)}")
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
 @application_bp.route('/jobs/<int:job_id>/applications', methods=['GET'])
 @company_required
 def get_job_applications(job_id, **kwargs):
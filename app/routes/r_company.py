@@ -1,6 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.services.company_services import CompanyService
-from app.services.application_services import ApplicationService
+from app.services.password_service import PasswordServiceBusy
+from app.services.application_services import ApplicationService, company_channel
+from app.services.analytics_rollup_services import AnalyticsRollupService
+from app.services.event_bus import event_bus
+from app.utils.sse import format_event, sse_response, stream_subscription
+from app.middleware.profiling import track_peak_memory
 from app.schemas.company_schema import CompanySchema
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
@@ -137,6 +142,9 @@ def update_company_profile():
         company = CompanyService.update_company(user_id, mapped_data)
         return jsonify(company_schema.dump(company)), 200
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+        
     except ValueError as e:
         print('[UPDATE PROFILE] Validation error:', str(e))
         return jsonify({'error': f'Erro de validação: {str(e)}'}), 400
@@ -149,6 +157,7 @@ def update_company_profile():
 
 @company_bp.route('/companies/applications', methods=['GET'])
 @jwt_required()
+@track_peak_memory
 def get_company_applications():
     """Listar todas as candidaturas da empresa"""
     try:
@@ -186,4 +195,77 @@ def get_company_applications_count():
         print('[GET COMPANY APPLICATIONS COUNT] Unexpected error:', str(e))
         import traceback
         traceback.print_exc()
-        return jsonify({'error': 'Erro interno do servidor'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
+@company_bp.route('/companies/applications/stream', methods=['GET'])
+@jwt_required()
+def stream_company_applications():
+    """Stream SSE com novas candidaturas e o total atualizado (substitui o polling do dashboard)"""
+    try:
+        claims = get_jwt()
+        user_type = claims.get('type')
+        user_id = claims.get('user_id')
+
+        if user_type != 'company':
+            return jsonify({'error': 'Acesso negado'}), 403
+
+        # Inscrever antes de ler o total para não perder candidaturas no meio
+        subscription = event_bus.subscribe(company_channel(user_id))
+        try:
+            total, last_id = ApplicationService.get_company_applications_snapshot(user_id)
+        except Exception:
+            subscription.close()
+            raise
+        state = {'total': total}
+
+        def handle(event_type, data):
+            if event_type == 'application_created':
+                if data['id'] <= last_id:
+                    return  # já contada no total inicial
+                state['total'] += 1
+                yield format_event(data, event='application_created', event_id=data['id'])
+            elif event_type == 'application_deleted':
+                state['total'] = max(state['total'] - 1, 0)
+            else:
+                return
+            yield format_event({'total_applications': state['total']}, event='count_changed')
+
+        config = current_app.config
+        return sse_response(stream_subscription(
+            subscription,
+            handle,
+            heartbeat=config['EVENTS_HEARTBEAT_INTERVAL'],
+            max_seconds=config['EVENTS_STREAM_MAX_SECONDS'],
+            first=[format_event({'total_applications': total}, event='count_changed')]
+        ))
+
+    except Exception as e:
+        print('[STREAM COMPANY APPLICATIONS] Unexpected error:', str(e))
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
+
+@company_bp.route('/companies/analytics', methods=['GET'])
+@jwt_required()
+def get_company_analytics():
+    """Candidaturas por dia, funil de status e tempo até a primeira resposta (lidos dos rollups)"""
+    try:
+        claims = get_jwt()
+        user_type = claims.get('type')
+        user_id = claims.get('user_id')
+
+        if user_type != 'company':
+            return jsonify({'error': 'Acesso negado'}), 403
+
+        days = request.args.get('days', 30, type=int)
+        if days is None or not 1 <= days <= 365:
+            return jsonify({'error': 'Parâmetro days deve estar entre 1 e 365'}), 400
+
+        return jsonify(AnalyticsRollupService.get_company_analytics(user_id, days=days)), 200
+
+    except Exception as e:
+        print('[GET COMPANY ANALYTICS] Unexpected error:', str(e))
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': 'Erro interno do servidor'}), 500
@@ -1,14 +1,25 @@
 from flask import Blueprint, request, jsonify
+from app import db
 from app.services.job_services import JobService
+from app.services.similarity_services import SimilarityService
+from app.services.saved_job_services import SavedJobService
+from app.services.application_services import ApplicationService
 from app.schemas.job_schema import JobSchema
+from app.schemas.application_schema import ApplicationSchema
 from app.middleware.auth_middleware import company_required, refresh_token_if_needed
+from app.middleware.idempotency import idempotent
+from app.middleware.profiling import track_peak_memory
+from flask_jwt_extended import verify_jwt_in_request, get_jwt
 
 job_bp = Blueprint('job', __name__)
 job_schema = JobSchema()
 jobs_schema = JobSchema(many=True)
+company_jobs_schema = JobSchema(many=True, exclude=['applications'])
+job_applications_schema = ApplicationSchema(many=True, exclude=['job'])
 
 @job_bp.route('/jobs', methods=['POST'])
 @company_required
+@idempotent
 def create_job(**kwargs):
     """Empresa criar nova vaga"""
     try:
@@ -75,10 +86,28 @@ def create_job(**kwargs):
                 'errors': e.messages
             }), 422
         
+        if isinstance(e, ValueError):
+            return jsonify({'error': str(e)}), 400
+        
+        # Erro inesperado (banco fora, timeout...): 5xx para o @idempotent liberar a chave
+        # e a nova tentativa do cliente executar de novo, em vez de repetir a falha guardada
+        db.session.rollback()
         current_app.logger.error(f"Erro ao criar vaga: {str(e)}")
-        return jsonify({'error': str(e)}), 400
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
+def _optional_student_id():
+    """Id do estudante autenticado, se houver (rotas públicas não exigem login)"""
+    try:
+        verify_jwt_in_request(optional=True)
+        claims = get_jwt()
+    except Exception:
+        return None
+    if claims and claims.get('type') == 'student':
+        return claims.get('user_id')
+    return None
 
 @job_bp.route('/jobs', methods=['GET'])
+@track_peak_memory
 def get_jobs():
     """Listar todas as vagas ativas (público)"""
     try:
@@ -90,8 +119,15 @@ def get_jobs():
         else:
             jobs = JobService.get_all_jobs()
             
-        # Usar to_dict() para incluir dados da empresa
-        jobs_data = [job.to_dict() for job in jobs]
+        # Usar to_dict() para incluir dados da empresa; contagens em uma única consulta
+        counts = ApplicationService.get_applications_count_by_job([job.id for job in jobs])
+        jobs_data = [job.to_dict(applications_count=counts[job.id]) for job in jobs]
+        
+        # Marcar vagas salvas do estudante logado com uma única consulta
+        saved_ids = SavedJobService.get_saved_job_ids(_optional_student_id(), [job.id for job in jobs])
+        for job_data in jobs_data:
+            job_data['is_saved'] = job_data['id'] in saved_ids
+        
         return jsonify(jobs_data), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -107,6 +143,31 @@ def get_job(id):
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@job_bp.route('/jobs/<int:id>/similar', methods=['GET'])
+def get_similar_jobs(id):
+    """Listar vagas ativas semelhantes a uma vaga (público)"""
+    try:
+        from flask import current_app
+        # Só existem SIMILAR_JOBS_PER_JOB vizinhos gravados por vaga
+        limit = request.args.get('limit', 5, type=int)
+        limit = max(1, min(limit, current_app.config['SIMILAR_JOBS_PER_JOB']))
+        
+        job = JobService.get_job_by_id(id)
+        if not job or not job.is_active:
+            return jsonify({'error': 'Vaga não encontrada'}), 404
+        
+        similar = SimilarityService.get_similar_jobs(id, limit=limit)
+        counts = ApplicationService.get_applications_count_by_job([job.id for _, job in similar])
+        jobs_data = []
+        for score, similar_job in similar:
+            job_data = similar_job.to_dict(applications_count=counts[similar_job.id])
+            job_data['similarity_score'] = round(score, 4)
+            jobs_data.append(job_data)
+        
+        return jsonify(jobs_data), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
 @job_bp.route('/companies/jobs/<int:id>', methods=['PUT'])
 @company_required
 def update_job(id, **kwargs):
@@ -198,7 +259,13 @@ def get_company_jobs(**kwargs):
     try:
         current_user = kwargs.get('current_user')
         jobs = JobService.get_jobs_by_company(current_user['id'])
-        return jsonify(jobs_schema.dump(jobs)), 200
+
+        # Candidaturas de todas as vagas em uma consulta (Job.applications é dinâmico: uma por vaga)
+        applications = ApplicationService.get_applications_by_job([job.id for job in jobs])
+        jobs_data = company_jobs_schema.dump(jobs)
+        for job_data in jobs_data:
+            job_data['applications'] = job_applications_schema.dump(applications[job_data['id']])
+        return jsonify(jobs_data), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -0,0 +1,58 @@
+from flask import Blueprint, jsonify, current_app
+from app.services.saved_job_services import SavedJobService
+from app.services.application_services import ApplicationService
+from app.middleware.auth_middleware import student_required
+
+saved_job_bp = Blueprint('saved_job', __name__)
+
+@saved_job_bp.route('/jobs/<int:job_id>/save', methods=['POST'])
+@student_required
+def save_job(job_id, **kwargs):
+    """Estudante salvar uma vaga"""
+    try:
+        current_user = kwargs.get('current_user')
+        saved_job = SavedJobService.save_job(current_user['id'], job_id)
+
+        return jsonify({
+            'message': 'Vaga salva com sucesso',
+            'saved_job': {
+                'id': saved_job.id,
+                'job_id': saved_job.job_id,
+                'created_at': saved_job.created_at.isoformat() if saved_job.created_at else None
+            }
+        }), 201
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        current_app.logger.error(f"Erro ao salvar vaga: {str(e)}")
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
+@saved_job_bp.route('/jobs/<int:job_id>/save', methods=['DELETE'])
+@student_required
+def unsave_job(job_id, **kwargs):
+    """Estudante remover uma vaga dos salvos"""
+    try:
+        current_user = kwargs.get('current_user')
+        SavedJobService.unsave_job(current_user['id'], job_id)
+        return jsonify({'message': 'Vaga removida dos salvos'}), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        current_app.logger.error(f"Erro ao remover vaga salva: {str(e)}")
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
+@saved_job_bp.route('/students/saved-jobs', methods=['GET'])
+@student_required
+def get_saved_jobs(**kwargs):
+    """Listar vagas salvas do estudante logado"""
+    try:
+        current_user = kwargs.get('current_user')
+        saved_jobs = SavedJobService.get_saved_jobs(current_user['id'])
+        counts = ApplicationService.get_applications_count_by_job([saved_job.job_id for saved_job in saved_jobs])
+        return jsonify([saved_job.to_dict(applications_count=counts[saved_job.job_id]) for saved_job in saved_jobs]), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Erro ao listar vagas salvas: {str(e)}")
+        return jsonify({'error': 'Erro interno do servidor'}), 500
@@ -1,6 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.services.student_service import StudentService
-from app.services.application_services import ApplicationService
+from app.services.password_service import PasswordServiceBusy
+from app.services.application_services import ApplicationService, student_channel
+from app.services.event_bus import event_bus
+from app.utils.sse import format_event, sse_response, stream_subscription
 from app.schemas.student_schema import StudentSchema
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
@@ -21,7 +24,7 @@ def get_students():
 def get_student(id):
     """Buscar estudante por ID"""
     try:
-        student = StudentService.get_student_by_id(id)
+        student = StudentService.get_student_with_applications(id)
         if student:
             return jsonify(student_schema.dump(student)), 200
         return jsonify({'error': 'Estudante não encontrado'}), 404
@@ -41,7 +44,7 @@ def get_student_profile(id):
         if current_user['id'] != id:
             return jsonify({'error': 'Acesso negado - ID não corresponde'}), 403
             
-        student = StudentService.get_student_by_id(id)
+        student = StudentService.get_student_with_applications(id)
         if student:
             return jsonify(student_schema.dump(student)), 200
         return jsonify({'error': 'Estudante não encontrado'}), 404
@@ -61,7 +64,7 @@ def get_my_student_profile():
         if user_type != 'student':
             return jsonify({'error': 'Acesso negado'}), 403
             
-        student = StudentService.get_student_by_id(user_id)
+        student = StudentService.get_student_with_applications(user_id)
         if student:
             return jsonify(student_schema.dump(student)), 200
         return jsonify({'error': 'Estudante não encontrado'}), 404
@@ -126,10 +129,14 @@ def update_student_profile():
         if not mapped_data:
             return jsonify({'error': 'Nenhum campo válido para atualizar'}), 400
 
-        # Atualizar estudante
-        student = StudentService.update_student(user_id, mapped_data)
+        # Atualizar estudante e recarregar com as candidaturas (o dump inclui applications)
+        StudentService.update_student(user_id, mapped_data)
+        student = StudentService.get_student_with_applications(user_id)
         return jsonify(student_schema.dump(student)), 200
         
+    except PasswordServiceBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+        
     except ValueError as e:
         print('[UPDATE PROFILE] Validation error:', str(e))
         return jsonify({'error': f'Erro de validação: {str(e)}'}), 400
@@ -145,11 +152,11 @@ def update_student_profile():
 def get_my_applications():
     """Listar candidaturas do estudante logado"""
     try:
-        current_user = get_jwt_identity()
-        if current_user.get('type') != 'student':
+        claims = get_jwt()
+        if claims.get('type') != 'student':
             return jsonify({'error': 'Acesso negado'}), 403
-            
-        applications = ApplicationService.get_student_applications(current_user['id'])
+
+        applications = ApplicationService.get_student_applications(claims.get('user_id'))
         return jsonify([app.to_dict() for app in applications]), 200
         
     except Exception as e:
@@ -166,3 +173,68 @@ def get_job_by_id(application_id):
         return jsonify({'error': 'Vaga não encontrada'}), 404
     except Exception as e:
         return jsonify({'error': 'Erro interno do servidor'}), 500
+
+
+@student_bp.route('/students/applications/stream', methods=['GET'])
+@jwt_required()
+def stream_my_application_status():
+    """
+    Stream SSE com as mudanças de status das candidaturas do estudante logado
+
+    Cada evento leva o id do ApplicationStatusEvent; ao reconectar o navegador
+    manda o header Last-Event-ID e os eventos perdidos são reenviados.
+    """
+    try:
+        claims = get_jwt()
+        user_type = claims.get('type')
+        user_id = claims.get('user_id')
+
+        if user_type != 'student':
+            return jsonify({'error': 'Acesso negado'}), 403
+
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            return jsonify({'error': 'Last-Event-ID inválido'}), 400
+
+        config = current_app.config
+        # Inscrever antes do reenvio para não perder eventos no meio
+        subscription = event_bus.subscribe(student_channel(user_id))
+        first = []
+        state = {'last_id': last_event_id or 0}
+        if last_event_id is not None:
+            try:
+                missed = ApplicationService.get_student_status_events(
+                    user_id, last_event_id, limit=config['EVENTS_REPLAY_LIMIT'] + 1
+                )
+            except Exception:
+                subscription.close()
+                raise
+            if len(missed) > config['EVENTS_REPLAY_LIMIT']:
+                # Muito tempo desconectado: mais barato recarregar a lista uma vez
+                missed = []
+                first.append(format_event({'reason': 'too_many_events'}, event='resync'))
+            for data in missed:
+                first.append(format_event(data, event='status_changed', event_id=data['id']))
+                state['last_id'] = data['id']
+
+        def handle(event_type, data):
+            if event_type != 'status_changed' or data['id'] <= state['last_id']:
+                return
+            state['last_id'] = data['id']
+            yield format_event(data, event='status_changed', event_id=data['id'])
+
+        return sse_response(stream_subscription(
+            subscription,
+            handle,
+            heartbeat=config['EVENTS_HEARTBEAT_INTERVAL'],
+            max_seconds=config['EVENTS_STREAM_MAX_SECONDS'],
+            first=first
+        ))
+
+    except Exception as e:
+        print('[STREAM STUDENT APPLICATIONS] Unexpected error:', str(e))
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': 'Erro interno do servidor'}), 500
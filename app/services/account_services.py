@@ -0,0 +1,143 @@
+from app import db
+from app.models.account import Account
+from app.utils.validators import normalize_email
+from app.utils.phone_validator import PhoneValidator
+
+class AccountService:
+    """Manutenção e consulta da tabela `accounts` (identidade única entre estudantes e empresas)"""
+
+    @staticmethod
+    def find(email=None, phone=None):
+        """Buscar conta por email ou telefone normalizados (uma consulta indexada)"""
+        if email:
+            return Account.query.filter_by(email=normalize_email(email)).first()
+        if phone:
+            return Account.query.filter_by(phone=PhoneValidator.to_e164(phone)).first()
+        return None
+
+    @staticmethod
+    def resolve_user(email=None, phone=None, user_type=None, active_only=True):
+        """
+        Encontrar o estudante ou empresa dono de um email/telefone
+
+        Args:
+            email: Email da conta
+            phone: Telefone da conta
+            user_type: Restringir a 'student' ou 'company' (opcional)
+            active_only: Ignorar contas inativas
+
+        Returns:
+            Tupla (user_type, user) ou (None, None) se não encontrado
+        """
+        account = AccountService.find(email=email, phone=phone)
+        if not account or (user_type and account.user_type != user_type):
+            return None, None
+
+        from app.models.student import Student
+        from app.models.company import Company
+        model = Student if account.user_type == 'student' else Company
+
+        user = db.session.get(model, account.user_id)
+        if not user or (active_only and not user.is_active):
+            return None, None
+        return account.user_type, user
+
+    @staticmethod
+    def _conflicts(email, phone, exclude_id=None):
+        """Descobrir se email/telefone pertencem a outra conta. Returns: (email_em_uso, telefone_em_uso)"""
+        condition = Account.email == email
+        if phone:
+            condition = condition | (Account.phone == phone)
+
+        query = Account.query.filter(condition)
+        if exclude_id:
+            query = query.filter(Account.id != exclude_id)
+
+        accounts = query.all()
+        return (
+            any(account.email == email for account in accounts),
+            bool(phone) and any(account.phone == phone for account in accounts)
+        )
+
+    @staticmethod
+    def _check_available(email, phone, exclude_id=None):
+        """Garantir que email/telefone não pertencem a outra conta"""
+        email_taken, phone_taken = AccountService._conflicts(email, phone, exclude_id)
+        if email_taken:
+            raise ValueError('Email já cadastrado')
+        if phone_taken:
+            raise ValueError('Telefone já cadastrado')
+
+    @staticmethod
+    def is_email_available(email):
+        """Verificar se o email está livre entre estudantes e empresas"""
+        return AccountService.find(email=email) is None
+
+    @staticmethod
+    def register(user_type, user_id, email, phone):
+        """
+        Adicionar a conta na sessão atual (sem commit)
+
+        Deve ser chamado na mesma transação que cria o estudante/empresa.
+        """
+        email = normalize_email(email)
+        phone = PhoneValidator.to_e164(phone)
+        AccountService._check_available(email, phone)
+
+        account = Account(email=email, phone=phone, user_type=user_type, user_id=user_id)
+        db.session.add(account)
+        return account
+
+    @staticmethod
+    def sync(user_type, user_id, email, phone, previous_email=None, previous_phone=None):
+        """
+        Atualizar email/telefone da conta na sessão atual (sem commit)
+
+        Deve ser chamado na mesma transação que atualiza o estudante/empresa.
+
+        Contas antigas com email/telefone duplicado ficaram fora do índice no
+        backfill (sem linha, ou com phone NULL). Para elas, um valor em uso por
+        outra conta só é erro se o usuário está mudando esse campo (diferente
+        de `previous_email`/`previous_phone`); senão só os campos livres são
+        gravados e o resto da atualização segue.
+
+        Args:
+            previous_email: Email antes da atualização (None: tratar como alterado)
+            previous_phone: Telefone antes da atualização (None: tratar como alterado)
+
+        Returns:
+            Account, ou None se a conta continua fora do índice (email duplicado)
+        """
+        email = normalize_email(email)
+        phone = PhoneValidator.to_e164(phone)
+        email_changed = previous_email is None or normalize_email(previous_email) != email
+        phone_changed = previous_phone is None or PhoneValidator.to_e164(previous_phone) != phone
+
+        account = Account.query.filter_by(user_type=user_type, user_id=user_id).first()
+        if account and account.email == email and account.phone == phone:
+            return account
+
+        email_taken, phone_taken = AccountService._conflicts(email, phone, exclude_id=account.id if account else None)
+        if email_taken and email_changed:
+            raise ValueError('Email já cadastrado')
+        if phone_taken and phone_changed:
+            raise ValueError('Telefone já cadastrado')
+        if phone_taken:
+            phone = None  # telefone duplicado antigo continua fora do índice
+
+        if not account:
+            if email_taken:
+                return None
+            account = Account(email=email, phone=phone, user_type=user_type, user_id=user_id)
+            db.session.add(account)
+            return account
+
+        if not email_taken:
+            account.email = email
+        account.phone = phone
+        return account
+
+    @staticmethod
+    def remove(user_type, user_id):
+        """Remover a conta na sessão atual (sem commit)"""
+        Account.query.filter_by(user_type=user_type, user_id=user_id).delete(synchronize_session=False)
@@ -0,0 +1,163 @@
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import and_, or_, select
+
+from app import db
+from app.models.application import Application
+from app.models.application_status_event import ApplicationStatusEvent
+from app.models.checkpoint import Checkpoint
+from app.models.company import Company
+from app.models.job import Job
+from app.models.student import Student
+
+CHECKPOINT_PREFIX = 'analytics_export:'
+
+# Colunas exportadas por tabela. Dados pessoais ficam de fora: de estudantes
+# só o id (chave de junção), cidade e skills; de candidaturas, sem a carta.
+# Tabelas com `updated_at` (empresas, vagas, estudantes) são exportadas por
+# (updated_at, id): cada alteração gera uma nova versão da linha e quem lê
+# fica com a de maior updated_at por id. Candidaturas não têm updated_at;
+# mudanças de status chegam pela exportação de application_status_events,
+# que é só de inserção.
+EXPORT_TABLES = {
+    'companies': (Company, ['id', 'sector', 'company_size', 'city', 'is_active', 'created_at', 'updated_at']),
+    'jobs': (Job, ['id', 'company_id', 'title', 'location', 'contract_type', 'work_mode', 'salary_range',
+                   'education', 'experience', 'skills', 'is_active', 'created_at', 'updated_at']),
+    'students': (Student, ['id', 'city', 'skills', 'is_active', 'created_at', 'updated_at']),
+    'applications': (Application, ['id', 'job_id', 'student_id', 'status', 'created_at']),
+    'application_status_events': (ApplicationStatusEvent, ['id', 'application_id', 'job_id', 'old_status',
+                                                           'new_status', 'created_at']),
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError('pyarrow não instalado - necessário para a exportação Parquet (pip install pyarrow)')
+    return pyarrow, pyarrow.parquet
+
+
+def _arrow_schema(pa, model, columns):
+    """Schema Parquet estável a partir dos tipos das colunas do modelo"""
+    fields = []
+    for name in columns:
+        python_type = model.__table__.c[name].type.python_type
+        if python_type is bool:
+            arrow_type = pa.bool_()
+        elif python_type is int:
+            arrow_type = pa.int64()
+        elif python_type is datetime:
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _naive_utc(value):
+    # students/companies gravam created_at com timezone; jobs/applications sem
+    if value is not None and value.tzinfo is not None:
+        return value.replace(tzinfo=None) - value.utcoffset()
+    return value
+
+
+class AnalyticsExportService:
+    @staticmethod
+    def export_table(table, export_dir, chunk_size=50000, settle_seconds=60, now=None):
+        """
+        Exportar para Parquet as linhas novas (ou alteradas) de uma tabela desde o último watermark
+
+        Tabelas só de inserção são lidas em lotes por chave primária
+        (`id > watermark ORDER BY id LIMIT chunk_size`), com um arquivo por dia
+        de criação em `<export_dir>/<tabela>/date=AAAA-MM-DD/part-<primeiro id>-<último id>.parquet`.
+        Tabelas com `updated_at` são lidas por (updated_at, id) - o watermark
+        guarda os dois (`run_key` e `position` do checkpoint) - com um arquivo
+        por dia de alteração em `.../part-<updated_at>-<id>.parquet`, do
+        primeiro registro de cada lote. O watermark só avança depois dos
+        arquivos gravados; como os nomes dependem só dos dados, uma execução
+        interrompida regrava os mesmos arquivos.
+
+        Linhas criadas/alteradas há menos de `settle_seconds` ficam para a
+        próxima execução (transações anteriores ainda podem não ter feito commit).
+
+        Returns:
+            dict com linhas e arquivos gravados
+        """
+        pa, pq = _require_pyarrow()
+        model, columns = EXPORT_TABLES[table]
+        schema = _arrow_schema(pa, model, columns)
+        table_columns = model.__table__.c
+        versioned = 'updated_at' in columns
+        day_column = 'updated_at' if versioned else 'created_at'
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=settle_seconds)
+        checkpoint = Checkpoint.load(CHECKPOINT_PREFIX + table)
+        db.session.commit()
+
+        stats = {'table': table, 'rows': 0, 'files': 0, 'watermark': checkpoint.position}
+        stmt = select(*[table_columns[name] for name in columns])
+        if versioned:
+            stmt = stmt.order_by(table_columns.updated_at, table_columns.id)
+        else:
+            stmt = stmt.order_by(table_columns.id)
+
+        while True:
+            if versioned:
+                # Checkpoint sem run_key (antes do updated_at): reexporta a tabela inteira uma vez
+                conditions = [table_columns.updated_at < cutoff]
+                if checkpoint.run_key:
+                    watermark = datetime.fromisoformat(checkpoint.run_key)
+                    conditions.append(or_(
+                        table_columns.updated_at > watermark,
+                        and_(table_columns.updated_at == watermark, table_columns.id > checkpoint.position)
+                    ))
+            else:
+                created_at = table_columns.created_at
+                conditions = [table_columns.id > checkpoint.position, or_(created_at < cutoff, created_at.is_(None))]
+            rows = db.session.execute(stmt.where(*conditions).limit(chunk_size)).all()
+            if not rows:
+                break
+
+            by_day = defaultdict(list)
+            for row in rows:
+                record = dict(row._mapping)
+                record['created_at'] = _naive_utc(record['created_at'])
+                day = record[day_column].date().isoformat() if record[day_column] else 'unknown'
+                by_day[day].append(record)
+
+            for day, records in by_day.items():
+                partition = Path(export_dir) / table / f'date={day}'
+                partition.mkdir(parents=True, exist_ok=True)
+                if versioned:
+                    name = f"part-{records[0]['updated_at']:%Y%m%d%H%M%S%f}-{records[0]['id']:012d}.parquet"
+                else:
+                    name = f"part-{records[0]['id']:012d}-{records[-1]['id']:012d}.parquet"
+                path = partition / name
+                tmp_path = path.with_suffix('.parquet.tmp')
+                pq.write_table(pa.Table.from_pylist(records, schema=schema), tmp_path, compression='zstd')
+                os.replace(tmp_path, path)
+                stats['files'] += 1
+
+            checkpoint.position = rows[-1].id
+            if versioned:
+                checkpoint.run_key = rows[-1].updated_at.isoformat()
+            checkpoint.completed_at = datetime.utcnow()
+            db.session.commit()
+            stats['rows'] += len(rows)
+            stats['watermark'] = checkpoint.position
+
+            if len(rows) < chunk_size:
+                break
+        return stats
+
+    @staticmethod
+    def export_all(export_dir, chunk_size=50000, tables=None):
+        """Exportar todas as tabelas (ou só `tables`)"""
+        return [
+            AnalyticsExportService.export_table(table, export_dir, chunk_size=chunk_size)
+            for table in (tables or EXPORT_TABLES)
+        ]
@@ -0,0 +1,215 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import db
+from app.models.application import Application
+from app.models.application_status_event import ApplicationStatusEvent
+from app.models.checkpoint import Checkpoint
+from app.models.job import Job
+from app.models.job_daily_stats import JobDailyStats
+from app.models.job_response_stats import JobResponseStats
+
+APPLICATIONS_CHECKPOINT = 'analytics_rollup:applications'
+EVENTS_CHECKPOINT = 'analytics_rollup:status_events'
+
+
+class AnalyticsRollupService:
+    @staticmethod
+    def _daily_rows(keys):
+        """Linhas existentes do rollup para as (vaga, dia) do lote, criando as que faltam"""
+        job_ids = {job_id for job_id, _ in keys}
+        days = {day for _, day in keys}
+        rows = {
+            (row.job_id, row.day): row
+            for row in JobDailyStats.query.filter(JobDailyStats.job_id.in_(job_ids), JobDailyStats.day.in_(days))
+        }
+        for job_id, day in keys:
+            if (job_id, day) not in rows:
+                row = JobDailyStats(job_id=job_id, company_id=keys[(job_id, day)], day=day,
+                                    applications=0, analysis=0, interview=0, accepted=0, rejected=0)
+                db.session.add(row)
+                rows[(job_id, day)] = row
+        return rows
+
+    @staticmethod
+    def _claim_batch(name, position, new_position):
+        """
+        Avançar o checkpoint antes de aplicar os incrementos do lote
+
+        Com leases sobrepostos dois workers podem ler o mesmo lote; só o que
+        avançar o checkpoint de `position` para `new_position` aplica os
+        incrementos (no mesmo commit), o outro desfaz e não conta nada.
+        """
+        if Checkpoint.advance(name, position, new_position):
+            return True
+        db.session.rollback()
+        return False
+
+    @staticmethod
+    def _roll_applications(cutoff, batch_size):
+        checkpoint = Checkpoint.ensure(APPLICATIONS_CHECKPOINT)
+        rows = db.session.execute(
+            select(Application.id, Application.job_id, Application.created_at, Job.company_id)
+            .join(Job, Application.job_id == Job.id)
+            .where(Application.id > checkpoint.position, Application.created_at < cutoff)
+            .order_by(Application.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return 0
+        if not AnalyticsRollupService._claim_batch(APPLICATIONS_CHECKPOINT, checkpoint.position, rows[-1].id):
+            return 0
+
+        counts = defaultdict(int)
+        companies = {}
+        for row in rows:
+            key = (row.job_id, row.created_at.date())
+            counts[key] += 1
+            companies[key] = row.company_id
+
+        daily = AnalyticsRollupService._daily_rows(companies)
+        for key, count in counts.items():
+            daily[key].applications += count
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def _roll_status_events(cutoff, batch_size):
+        checkpoint = Checkpoint.ensure(EVENTS_CHECKPOINT)
+        events = db.session.execute(
+            select(
+                ApplicationStatusEvent.id, ApplicationStatusEvent.application_id, ApplicationStatusEvent.job_id,
+                ApplicationStatusEvent.new_status, ApplicationStatusEvent.created_at, Job.company_id
+            )
+            .join(Job, ApplicationStatusEvent.job_id == Job.id)
+            .where(ApplicationStatusEvent.id > checkpoint.position, ApplicationStatusEvent.created_at < cutoff)
+            .order_by(ApplicationStatusEvent.id)
+            .limit(batch_size)
+        ).all()
+        if not events:
+            return 0
+        if not AnalyticsRollupService._claim_batch(EVENTS_CHECKPOINT, checkpoint.position, events[-1].id):
+            return 0
+
+        # Primeira resposta = primeiro evento da candidatura (pelo índice de application_id)
+        application_ids = {event.application_id for event in events}
+        first_event_ids = set(db.session.execute(
+            select(db.func.min(ApplicationStatusEvent.id))
+            .where(ApplicationStatusEvent.application_id.in_(application_ids))
+            .group_by(ApplicationStatusEvent.application_id)
+        ).scalars())
+        applied_at = dict(db.session.execute(
+            select(Application.id, Application.created_at).where(Application.id.in_(application_ids))
+        ).all())
+
+        counts = defaultdict(lambda: defaultdict(int))
+        companies = {}
+        responses = defaultdict(lambda: [0, 0])
+        job_companies = {}
+        for event in events:
+            key = (event.job_id, event.created_at.date())
+            companies[key] = event.company_id
+            if event.new_status in JobDailyStats.STATUS_COLUMNS:
+                counts[key][event.new_status] += 1
+
+            created_at = applied_at.get(event.application_id)
+            if event.id in first_event_ids and created_at:
+                responses[event.job_id][0] += 1
+                responses[event.job_id][1] += max(int((event.created_at - created_at).total_seconds()), 0)
+                job_companies[event.job_id] = event.company_id
+
+        daily = AnalyticsRollupService._daily_rows(companies)
+        for key, by_status in counts.items():
+            for status, count in by_status.items():
+                setattr(daily[key], status, getattr(daily[key], status) + count)
+
+        if responses:
+            existing = {row.job_id: row for row in JobResponseStats.query.filter(JobResponseStats.job_id.in_(responses))}
+            for job_id, (responded, seconds) in responses.items():
+                row = existing.get(job_id)
+                if row is None:
+                    row = JobResponseStats(job_id=job_id, company_id=job_companies[job_id],
+                                           responded=0, total_response_seconds=0)
+                    db.session.add(row)
+                row.responded += responded
+                row.total_response_seconds += seconds
+        db.session.commit()
+        return len(events)
+
+    @staticmethod
+    def refresh(batch_size=5000, max_batches=100, settle_seconds=60, now=None):
+        """
+        Atualizar os rollups com as candidaturas e eventos de status novos
+
+        Cada lote lê só o que está depois do checkpoint (pela chave primária) e
+        grava os incrementos e o novo checkpoint no mesmo commit; o checkpoint
+        avança com UPDATE condicional na posição lida, então cada linha entra
+        uma única vez mesmo com dois workers rodando ao mesmo tempo. Linhas com menos de `settle_seconds` ficam
+        para a próxima execução.
+
+        Returns:
+            dict com candidaturas e eventos processados
+        """
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=settle_seconds)
+        stats = {'applications': 0, 'status_events': 0}
+        for _ in range(max_batches):
+            processed = AnalyticsRollupService._roll_applications(cutoff, batch_size)
+            stats['applications'] += processed
+            if processed < batch_size:
+                break
+        for _ in range(max_batches):
+            processed = AnalyticsRollupService._roll_status_events(cutoff, batch_size)
+            stats['status_events'] += processed
+            if processed < batch_size:
+                break
+        db.session.commit()
+        return stats
+
+    @staticmethod
+    def get_company_analytics(company_id, days=30, today=None):
+        """
+        Dados do dashboard da empresa, lidos só dos rollups
+
+        Returns:
+            dict com série diária, funil total e métricas por vaga
+        """
+        today = today or datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        columns = ('applications',) + JobDailyStats.STATUS_COLUMNS
+
+        per_day = {since + timedelta(days=i): dict.fromkeys(columns, 0) for i in range(days)}
+        funnel = dict.fromkeys(columns, 0)
+        per_job = defaultdict(lambda: dict.fromkeys(columns, 0))
+
+        for row in JobDailyStats.query.filter(JobDailyStats.company_id == company_id, JobDailyStats.day >= since):
+            for column in columns:
+                value = getattr(row, column)
+                per_day[row.day][column] += value
+                funnel[column] += value
+                per_job[row.job_id][column] += value
+
+        responses = {row.job_id: row for row in JobResponseStats.query.filter_by(company_id=company_id)}
+        titles = dict(db.session.execute(
+            select(Job.id, Job.title).where(Job.company_id == company_id)
+        ).all())
+
+        jobs = []
+        for job_id in sorted(set(per_job) | set(responses)):
+            response = responses.get(job_id)
+            jobs.append({
+                'job_id': job_id,
+                'title': titles.get(job_id),
+                'funnel': per_job.get(job_id, dict.fromkeys(columns, 0)),
+                'responded': response.responded if response else 0,
+                'avg_first_response_hours': response.average_response_hours if response else None,
+            })
+
+        return {
+            'since': since.isoformat(),
+            'until': today.isoformat(),
+            'daily': [{'day': day.isoformat(), **values} for day, values in per_day.items()],
+            'funnel': funnel,
+            'jobs': jobs,
+        }
@@ -1,8 +1,30 @@
 from app import db
 from app.models.application import Application
 from app.models.student import Student
+from app.models.application_status_event import ApplicationStatusEvent
+from app.services.event_bus import event_bus
+
+class JobNotFound(ValueError):
+    """Vaga inexistente - a rota responde 404"""
+
+
+class NotJobOwner(ValueError):
+    """A vaga é de outra empresa - a rota responde 403"""
+
+
+def company_channel(company_id):
+    return f'company:{company_id}'
+
+def student_channel(student_id):
+    return f'student:{student_id}'
 
 class ApplicationService:
+    # Colunas da exportação de candidatos (mesma ordem de iter_export_rows)
+    EXPORT_HEADER = [
+        'ID da candidatura', 'Status', 'Data da candidatura', 'Nome', 'Email', 'Telefone',
+        'CPF', 'Cidade', 'Habilidades', 'GitHub', 'Currículo', 'Carta de apresentação'
+    ]
+
     @staticmethod
     def apply_to_job(job_id, student_id, cover_letter=None):
         from app.models.job import Job
@@ -31,7 +53,67 @@ class ApplicationService:
         )
         db.session.add(application)
         db.session.commit()
+
+        event_bus.publish(
+            company_channel(job.company_id),
+            'application_created',
+            ApplicationService.created_event(application, job, student)
+        )
         return application
+
+    @staticmethod
+    def created_event(application, job, student):
+        """Dados do evento de nova candidatura enviado no stream da empresa"""
+        return {
+            'id': application.id,
+            'job_id': job.id,
+            'job_title': job.title,
+            'student_id': student.id,
+            'student_name': student.name,
+            'status': application.status,
+            'created_at': application.created_at.isoformat() if application.created_at else None,
+        }
+
+    @staticmethod
+    def poll_new_applications(position, limit=500):
+        """
+        Poller do event_bus (EVENTS_BACKEND=db): candidaturas com id maior que `position`
+
+        Uma consulta por intervalo para o processo inteiro, usando a chave primária.
+        """
+        from app.models.job import Job
+
+        if position is None:
+            return db.session.query(db.func.max(Application.id)).scalar() or 0, []
+
+        rows = (
+            db.session.query(Application, Job, Student)
+            .join(Job, Application.job_id == Job.id)
+            .join(Student, Application.student_id == Student.id)
+            .filter(Application.id > position)
+            .order_by(Application.id)
+            .limit(limit)
+            .all()
+        )
+        events = [
+            (company_channel(job.company_id), 'application_created',
+             ApplicationService.created_event(application, job, student))
+            for application, job, student in rows
+        ]
+        return (rows[-1][0].id if rows else position), events
+
+    @staticmethod
+    def get_company_applications_snapshot(company_id):
+        """Total de candidaturas da empresa e maior id, em uma consulta (estado inicial do stream)"""
+        from app.models.job import Job
+
+        total, last_id = (
+            db.session.query(db.func.count(Application.id), db.func.max(Application.id))
+            .join(Job, Application.job_id == Job.id)
+            .filter(Job.company_id == company_id)
+            .one()
+        )
+        return total, last_id or 0
     
     @staticmethod
     def get_applications_for_job(job_id, company_id=None):
@@ -50,7 +132,7 @@ class ApplicationService:
         from sqlalchemy.orm import joinedload
         return Application.query.options(
             joinedload(Application.student),
-            joinedload(Application.job)
+            joinedload(Application.job).joinedload(Job.company)
         ).filter_by(job_id=job_id).all()
     
     @staticmethod
@@ -63,7 +145,7 @@ class ApplicationService:
         from sqlalchemy.orm import joinedload
         return Application.query.options(
             joinedload(Application.student),
-            joinedload(Application.job)
+            joinedload(Application.job).joinedload(Job.company)
         ).filter(Application.job_id.in_(job_ids))\
          .order_by(Application.created_at.desc())\
          .all()
@@ -71,10 +153,11 @@ class ApplicationService:
     @staticmethod
     def get_student_applications(student_id):
         """Buscar todas as candidaturas de um estudante"""
+        from app.models.job import Job
         from sqlalchemy.orm import joinedload
         return Application.query.options(
             joinedload(Application.student),
-            joinedload(Application.job)
+            joinedload(Application.job).joinedload(Job.company)
         ).filter_by(student_id=student_id)\
          .order_by(Application.created_at.desc())\
          .all()
@@ -94,9 +177,79 @@ class ApplicationService:
         if status not in valid_statuses:
             raise ValueError(f'Status inválido. Use um de: {", ".join(valid_statuses)}')
             
-        application.status = status
+        event = None
+        if application.status != status:
+            # Evento gravado na mesma transação (lido pelo digest de notificações e pelo stream do estudante)
+            event = ApplicationStatusEvent(
+                application_id=application.id,
+                student_id=application.student_id,
+                job_id=application.job_id,
+                old_status=application.status,
+                new_status=status
+            )
+            db.session.add(event)
+            application.status = status
         db.session.commit()
+
+        if event is not None:
+            event_bus.publish(
+                student_channel(event.student_id),
+                'status_changed',
+                ApplicationService.status_event(event, application.job.title if application.job else None)
+            )
         return application
+
+    @staticmethod
+    def status_event(event, job_title):
+        """Dados do evento de mudança de status enviado no stream do estudante"""
+        return {
+            'id': event.id,
+            'application_id': event.application_id,
+            'job_id': event.job_id,
+            'job_title': job_title,
+            'old_status': event.old_status,
+            'new_status': event.new_status,
+            'created_at': event.created_at.isoformat() if event.created_at else None,
+        }
+
+    @staticmethod
+    def _status_events_query():
+        from app.models.job import Job
+
+        return (
+            db.session.query(ApplicationStatusEvent, Job.title)
+            .outerjoin(Job, ApplicationStatusEvent.job_id == Job.id)
+            .order_by(ApplicationStatusEvent.id)
+        )
+
+    @staticmethod
+    def get_student_status_events(student_id, after_id, limit=100):
+        """Mudanças de status do estudante depois de `after_id` (reenvio pelo Last-Event-ID)"""
+        rows = (
+            ApplicationService._status_events_query()
+            .filter(ApplicationStatusEvent.student_id == student_id, ApplicationStatusEvent.id > after_id)
+            .limit(limit)
+            .all()
+        )
+        return [ApplicationService.status_event(event, job_title) for event, job_title in rows]
+
+    @staticmethod
+    def poll_status_events(position, limit=500):
+        """Poller do event_bus (EVENTS_BACKEND=db): mudanças de status com id maior que `position`"""
+        if position is None:
+            return db.session.query(db.func.max(ApplicationStatusEvent.id)).scalar() or 0, []
+
+        rows = (
+            ApplicationService._status_events_query()
+            .filter(ApplicationStatusEvent.id > position)
+            .limit(limit)
+            .all()
+        )
+        events = [
+            (student_channel(event.student_id), 'status_changed', ApplicationService.status_event(event, job_title))
+            for event, job_title in rows
+        ]
+        return (rows[-1][0].id if rows else position), events
     
     @staticmethod
     def get_company_applications_count(company_id):
@@ -125,11 +278,98 @@ class ApplicationService:
         if company_id and application.job.company_id != company_id:
             raise ValueError('Não autorizado a deletar esta candidatura')
         
+        channel = company_channel(application.job.company_id)
+        application_id = application.id
         db.session.delete(application)
         db.session.commit()
+
+        event_bus.publish(channel, 'application_deleted', {'id': application_id})
         return True
     
     @staticmethod
     def get_job_applications_count(job_id):
         """Contar candidaturas de uma vaga específica"""
-        return Application.query.filter_by(job_id=job_id).count()
\ No newline at end of file
+        return Application.query.filter_by(job_id=job_id).count()
+
+    @staticmethod
+    def get_applications_count_by_job(job_ids):
+        """
+        Contar candidaturas de várias vagas de uma vez
+
+        Uma única consulta com GROUP BY, em vez de um COUNT por vaga.
+
+        Returns:
+            dict {job_id: total}, com 0 para as vagas sem candidaturas
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+
+        rows = db.session.query(Application.job_id, db.func.count(Application.id))\
+            .filter(Application.job_id.in_(job_ids))\
+            .group_by(Application.job_id)\
+            .all()
+        counts = dict.fromkeys(job_ids, 0)
+        counts.update({job_id: total for job_id, total in rows})
+        return counts
+
+    @staticmethod
+    def get_applications_by_job(job_ids):
+        """
+        Candidaturas de várias vagas com o estudante carregado, em uma consulta
+
+        Returns:
+            dict {job_id: [Application, ...]}, com lista vazia para as vagas sem candidaturas
+        """
+        from sqlalchemy.orm import joinedload
+
+        job_ids = list(job_ids)
+        grouped = {job_id: [] for job_id in job_ids}
+        if not job_ids:
+            return grouped
+
+        applications = Application.query.options(joinedload(Application.student))\
+            .filter(Application.job_id.in_(job_ids))\
+            .order_by(Application.id)\
+            .all()
+        for application in applications:
+            grouped[application.job_id].append(application)
+        return grouped
+
+    @staticmethod
+    def get_job_for_export(job_id, company_id):
+        """Validar que a vaga existe e pertence à empresa antes de começar o stream"""
+        from app.models.job import Job
+
+        job = Job.query.get(job_id)
+        if not job:
+            raise JobNotFound('Vaga não encontrada')
+        if job.company_id != company_id:
+            raise NotJobOwner('Não autorizado a exportar candidaturas desta vaga')
+        return job
+
+    @staticmethod
+    def iter_export_rows(job_id, batch_size=1000):
+        """
+        Linhas da exportação de candidatos de uma vaga, lidas em streaming
+
+        Uma única consulta applications ⋈ students só com as colunas exportadas,
+        lida em lotes (`yield_per`) por uma conexão própria: a memória fica
+        constante independente do número de candidatos.
+        """
+        from sqlalchemy import select
+
+        stmt = (
+            select(
+                Application.id, Application.status, Application.created_at,
+                Student.name, Student.email, Student.phone, Student.cpf, Student.city,
+                Student.skills, Student.github_url, Student.resume_url, Application.cover_letter
+            )
+            .join(Student, Application.student_id == Student.id)
+            .where(Application.job_id == job_id)
+            .order_by(Application.id)
+        )
+        with db.engine.connect() as connection:
+            result = connection.execution_options(yield_per=batch_size).execute(stmt)
+            for row in result:
+                yield row
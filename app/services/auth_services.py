@@ -4,12 +4,32 @@ from app.models.reset_code import ResetCode
 from app import db
 from app.utils.notifications import NotificationService
 from app.services.email_send import email_service
+from app.services.account_services import AccountService
+from app.services.password_service import PasswordServiceBusy
+from app.utils.validators import normalize_email
+from app.utils.phone_validator import PhoneValidator
+from flask import current_app
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import secrets
 import string
 
 class AuthService:
+    @staticmethod
+    def _rehash_if_needed(user, password):
+        """Regravar o hash com os parâmetros atuais após um login bem-sucedido"""
+        if not user.password_needs_rehash():
+            return
+        try:
+            user.set_password(password)
+            db.session.commit()
+        except PasswordServiceBusy:
+            # Fica para o próximo login
+            db.session.rollback()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Erro ao atualizar hash da senha: {str(e)}")
+
     @staticmethod
     def login_student(email, password):
         """Login para estudantes"""
@@ -20,6 +40,7 @@ class AuthService:
         if not student.check_password(password):
             raise ValueError('Senha incorreta')
         
+        AuthService._rehash_if_needed(student, password)
         return student
     
     @staticmethod
@@ -32,6 +53,7 @@ class AuthService:
         if not company.check_password(password):
             raise ValueError('Senha incorreta')
         
+        AuthService._rehash_if_needed(company, password)
         return company
     
     @staticmethod
@@ -64,6 +86,9 @@ class AuthService:
         except IntegrityError:
             db.session.rollback()
             raise ValueError('Email ou CPF já cadastrados')
+        except PasswordServiceBusy:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             raise ValueError(f'Erro ao registrar estudante: {str(e)}')
@@ -107,45 +132,23 @@ class AuthService:
             method: 'email' ou 'sms'
         """
         try:
-            # Determinar tipo de usuário e buscar usuário
-            user = None
-            user_type = None
-            user_name = ""
-            
+            # Determinar tipo de usuário com uma única busca no índice de contas
             if method == 'email' and email:
-                # Buscar por email em ambas as tabelas
-                student = Student.query.filter_by(email=email, is_active=True).first()
-                company = Company.query.filter_by(email=email, is_active=True).first()
-                
-                if student:
-                    user = student
-                    user_type = 'student'
-                    user_name = student.name
-                elif company:
-                    user = company
-                    user_type = 'company'
-                    user_name = company.name
-                else:
+                email = normalize_email(email)
+                user_type, user = AccountService.resolve_user(email=email)
+                if not user:
                     raise ValueError('Email não encontrado ou conta inativa')
                     
             elif method == 'sms' and phone:
-                # Buscar por telefone em ambas as tabelas
-                student = Student.query.filter_by(phone=phone, is_active=True).first()
-                company = Company.query.filter_by(phone=phone, is_active=True).first()
-                
-                if student:
-                    user = student
-                    user_type = 'student'
-                    user_name = student.name
-                elif company:
-                    user = company
-                    user_type = 'company'
-                    user_name = company.name
-                else:
+                phone = PhoneValidator.to_e164(phone)
+                user_type, user = AccountService.resolve_user(phone=phone)
+                if not user:
                     raise ValueError('Telefone não encontrado ou conta inativa')
             else:
                 raise ValueError('Email ou telefone é obrigatório')
             
+            user_name = user.name
+            
             print(f"DEBUG: Iniciando processo de reset para {email or phone} ({user_type})")
             
             # Invalidar códigos anteriores não utilizados
@@ -209,6 +212,7 @@ class AuthService:
                 success = NotificationService.send_reset_code_sms(formatted_phone, reset_code.code)
                 if not success:
                     raise ValueError(f'Erro ao enviar código por {method}')
+                current_app.logger.debug(f"SMS de reset enfileirado para ****{formatted_phone[-4:]}")
             
             # Preparar resposta baseada no sucesso do envio
             if method == 'email':
@@ -246,40 +250,31 @@ class AuthService:
             method: 'email' ou 'sms'
         """
         try:
-            # Determinar tipo de usuário
-            user_type = None
+            if method == 'email' and not email:
+                raise ValueError('Email é obrigatório')
+            if method == 'sms' and not phone:
+                raise ValueError('Telefone é obrigatório')
             
-            if method == 'email' and email:
-                student = Student.query.filter_by(email=email, is_active=True).first()
-                company = Company.query.filter_by(email=email, is_active=True).first()
-                user_type = 'student' if student else ('company' if company else None)
-            elif method == 'sms' and phone:
-                student = Student.query.filter_by(phone=phone, is_active=True).first()
-                company = Company.query.filter_by(phone=phone, is_active=True).first()
-                user_type = 'student' if student else ('company' if company else None)
+            # Mesma normalização usada ao gravar o código
+            email = normalize_email(email)
+            phone = PhoneValidator.to_e164(phone)
             
-            if not user_type:
-                raise ValueError('Usuário não encontrado')
+            # Gerar token temporário para confirmar nova senha
+            token = secrets.token_urlsafe(32)
             
-            # Buscar código válido
-            reset_code = ResetCode.find_valid_code(
+            # Marcar código como usado e salvar token em um único UPDATE atômico
+            # (o tipo de usuário já foi gravado no código quando ele foi enviado)
+            user_type = ResetCode.redeem(
                 code=code,
+                token=token,
                 email=email,
                 phone=phone,
-                method=method,
-                user_type=user_type
+                method=method
             )
             
-            if not reset_code:
+            if not user_type:
                 raise ValueError('Código inválido ou expirado')
             
-            # Gerar token temporário para confirmar nova senha
-            token = secrets.token_urlsafe(32)
-            
-            # Marcar código como usado e salvar token
-            reset_code.mark_as_used()
-            reset_code.set_verification_token(token)
-            
             return {
                 'message': 'Código verificado com sucesso',
                 'valid': True,
@@ -290,6 +285,7 @@ class AuthService:
         except ValueError:
             raise
         except Exception as e:
+            db.session.rollback()
             raise ValueError(f'Erro interno: {str(e)}')
     
     @staticmethod
@@ -318,17 +314,11 @@ class AuthService:
                 raise ValueError('Token inválido ou expirado')
             
             # Buscar usuário baseado nos dados do código de reset
-            user = None
-            if reset_code.method == 'email' and reset_code.email:
-                if reset_code.user_type == 'student':
-                    user = Student.query.filter_by(email=reset_code.email, is_active=True).first()
-                else:
-                    user = Company.query.filter_by(email=reset_code.email, is_active=True).first()
-            elif reset_code.method == 'sms' and reset_code.phone:
-                if reset_code.user_type == 'student':
-                    user = Student.query.filter_by(phone=reset_code.phone, is_active=True).first()
-                else:
-                    user = Company.query.filter_by(phone=reset_code.phone, is_active=True).first()
+            _, user = AccountService.resolve_user(
+                email=reset_code.email if reset_code.method == 'email' else None,
+                phone=reset_code.phone if reset_code.method == 'sms' else None,
+                user_type=reset_code.user_type
+            )
             
             if not user:
                 raise ValueError('Usuário não encontrado')
@@ -345,7 +335,8 @@ class AuthService:
                 'success': True
             }
             
-        except ValueError:
+        except (ValueError, PasswordServiceBusy):
+            db.session.rollback()
             raise
         except Exception as e:
             db.session.rollback()
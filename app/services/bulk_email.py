@@ -0,0 +1,171 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _RateLimiter:
+    """Espaçamento mínimo entre envios, compartilhado por todas as conexões"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BulkEmailSender:
+    """
+    Envio em massa com um pool de conexões SMTP persistentes
+
+    Cada thread do pool mantém sua conexão aberta entre mensagens (reabrindo
+    quando o servidor derruba ou após `max_per_connection` envios) e todas
+    respeitam o mesmo limite de mensagens por segundo. `send_batch` bloqueia
+    até o lote terminar, então o chamador pode salvar o checkpoint logo depois.
+
+    Uso:
+        with BulkEmailSender(email_service) as sender:
+            sent, failed = sender.send_batch(messages)
+    """
+
+    def __init__(self, email_service, pool_size=2, rate_per_second=5, max_per_connection=100,
+                 connection_factory=None):
+        self.email_service = email_service
+        self.pool_size = pool_size
+        self.max_per_connection = max_per_connection
+        self.connection_factory = connection_factory or self._connect
+        self._rate = _RateLimiter(rate_per_second)
+        self._queue = queue.Queue(maxsize=pool_size * 2)
+        self._threads = []
+        self._results_lock = threading.Lock()
+        self._sent = 0
+        self._failed = 0
+        self._on_result = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.email_service.smtp_server, self.email_service.smtp_port, timeout=30)
+        server.starttls()
+        server.login(self.email_service.email_user, self.email_service.email_password)
+        return server
+
+    def _build_message(self, to_email, subject, html_body, text_body):
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"{self.email_service.from_name} <{self.email_service.email_user}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        if text_body:
+            msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
+        msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg
+
+    def start(self):
+        for i in range(self.pool_size):
+            thread = threading.Thread(target=self._worker, name=f'bulk-email-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _worker(self):
+        server = None
+        used = 0
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            try:
+                for attempt in range(2):
+                    try:
+                        if server is None or used >= self.max_per_connection:
+                            self._quit(server)
+                            server = self.connection_factory()
+                            used = 0
+                        self._rate.wait()
+                        server.send_message(self._build_message(*item[:4]))
+                        used += 1
+                        self._record(item, sent=True)
+                        break
+                    except smtplib.SMTPRecipientsRefused as e:
+                        # Endereço recusado - repetir não adianta
+                        logger.warning(f"Destinatário recusado {item[0]}: {str(e)}")
+                        self._record(item, sent=False, error=str(e))
+                        break
+                    except (smtplib.SMTPException, OSError) as e:
+                        # Conexão caiu: descartar e tentar uma vez com uma nova
+                        self._quit(server)
+                        server = None
+                        if attempt == 1:
+                            logger.error(f"Erro ao enviar email para {item[0]}: {str(e)}")
+                            self._record(item, sent=False, error=str(e))
+            finally:
+                self._queue.task_done()
+        self._quit(server)
+
+    @staticmethod
+    def _quit(server):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def _record(self, item, sent, error=None):
+        with self._results_lock:
+            if sent:
+                self._sent += 1
+            else:
+                self._failed += 1
+            if self._on_result:
+                self._on_result(item, sent, error)
+
+    def send_batch(self, messages, on_result=None):
+        """
+        Enviar um lote e aguardar o fim
+
+        Args:
+            messages: Iterável de (to_email, subject, html_body, text_body[, extra...]);
+                      itens extras são ignorados no envio e repassados ao `on_result`
+            on_result: Chamado como on_result(message, enviado, erro) para cada mensagem
+
+        Returns:
+            Tupla (enviados, falhas) deste lote
+        """
+        with self._results_lock:
+            sent_before, failed_before = self._sent, self._failed
+            self._on_result = on_result
+        for message in messages:
+            self._queue.put(message)
+        self._queue.join()
+        with self._results_lock:
+            self._on_result = None
+            return self._sent - sent_before, self._failed - failed_before
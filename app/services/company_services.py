@@ -1,5 +1,6 @@
 from app import db
 from app.models.company import Company
+from app.services.account_services import AccountService
 from sqlalchemy.exc import IntegrityError
 
 class CompanyService:
@@ -15,8 +16,8 @@ class CompanyService:
         if not cnpj:
             raise ValueError('CNPJ é obrigatório')
 
-        # Garantir unicidade do email
-        if Company.query.filter_by(email=email).first():
+        # Garantir unicidade do email entre estudantes e empresas
+        if not AccountService.is_email_available(email):
             raise ValueError('Email já cadastrado')
 
         # Garantir unicidade do CNPJ
@@ -33,7 +34,13 @@ class CompanyService:
         
         db.session.add(company)
         try:
+            # Registrar no índice de contas na mesma transação
+            db.session.flush()
+            AccountService.register('company', company.id, company.email, company.phone)
             db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
         except IntegrityError:
             db.session.rollback()
             raise ValueError('Violação de unicidade: email ou cnpj já cadastrados')
@@ -79,17 +86,15 @@ class CompanyService:
                 print('[COMPANY SERVICE] Updating password')
                 company.set_password(password)
         
-        # Validar unicidade de email e CNPJ se estão sendo alterados
-        if 'email' in data and data['email'] and data['email'] != company.email:
-            existing_email = Company.query.filter_by(email=data['email']).first()
-            if existing_email:
-                raise ValueError('Email já está em uso por outra empresa')
-        
+        # Validar unicidade do CNPJ se está sendo alterado (email é validado pelo índice de contas)
         if 'cnpj' in data and data['cnpj'] and data['cnpj'] != company.cnpj:
             existing_cnpj = Company.query.filter_by(cnpj=data['cnpj']).first()
             if existing_cnpj:
                 raise ValueError('CNPJ já está em uso por outra empresa')
         
+        # Valores antigos: o índice de contas só recusa duplicado no campo que mudou
+        previous_email, previous_phone = company.email, company.phone
+
         # Atualizar apenas campos permitidos
         updated_fields = []
         for key, value in data.items():
@@ -116,10 +121,16 @@ class CompanyService:
         print(f'[COMPANY SERVICE] Updated fields: {updated_fields}')
         
         try:
+            # Manter o índice de contas em sincronia na mesma transação
+            AccountService.sync('company', company.id, company.email, company.phone,
+                                previous_email=previous_email, previous_phone=previous_phone)
             db.session.commit()
             print(f'[COMPANY SERVICE] Successfully updated company {id}')
             # Forçar refresh do objeto após commit
             db.session.refresh(company)
+        except ValueError:
+            db.session.rollback()
+            raise
         except IntegrityError as e:
             db.session.rollback()
             print(f'[COMPANY SERVICE] IntegrityError: {str(e)}')
@@ -146,5 +157,6 @@ class CompanyService:
             db.session.commit()
             return company
         
+        AccountService.remove('company', id)
         db.session.delete(company)
         db.session.commit()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, update
+
+from app import db
+from app.models.email_outbox import EmailOutbox
+
+
+class EmailOutboxService:
+    @staticmethod
+    def enqueue(to_email, subject, html_body, text_body=None, dedupe_key=None):
+        """
+        Adicionar email na outbox na sessão atual (sem commit)
+
+        Deve ser chamado na mesma transação que gerou o email.
+        """
+        message = EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body,
+            dedupe_key=dedupe_key
+        )
+        db.session.add(message)
+        return message
+
+    @staticmethod
+    def _claim(batch_size, claim_timeout, after_id=0):
+        """
+        Reservar um lote de emails para este worker
+
+        UPDATE condicional nos ids lidos: só as linhas que ainda estão livres
+        mudam para 'sending' com o token do lote, e o lote é relido pelo token.
+        Um email reservado por um worker que morreu volta a ficar livre depois
+        de `claim_timeout` segundos.
+
+        Returns:
+            Lista de EmailOutbox reservados por este lote (vazia se não há pendentes)
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            EmailOutbox.status == 'pending',
+            and_(EmailOutbox.status == 'sending', EmailOutbox.claimed_at < now - timedelta(seconds=claim_timeout))
+        )
+        token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        while True:
+            ids = [row.id for row in db.session.query(EmailOutbox.id).filter(claimable, EmailOutbox.id > after_id)
+                   .order_by(EmailOutbox.id).limit(batch_size)]
+            if not ids:
+                db.session.commit()
+                return []
+
+            db.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(ids), claimable)
+                .values(status='sending', claimed_by=token, claimed_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            claimed = EmailOutbox.query.filter_by(claimed_by=token, status='sending').order_by(EmailOutbox.id).all()
+            if claimed:
+                return claimed
+            # Outro worker reservou todas as linhas lidas: seguir para as próximas
+            after_id = ids[-1]
+
+    @staticmethod
+    def drain(sender, batch_size=100, max_attempts=5, max_seconds=None, claim_timeout=600):
+        """
+        Enviar emails pendentes da outbox
+
+        Cada lote é reservado antes do envio, então outro worker rodando ao
+        mesmo tempo pega outros emails. A execução para de reservar lotes
+        depois de `max_seconds`; o restante fica para a próxima rodada.
+
+        Args:
+            sender: BulkEmailSender já iniciado
+            batch_size: Emails por lote
+            max_attempts: Tentativas antes de marcar como 'failed'
+            max_seconds: Tempo máximo reservando lotes (None: até esvaziar)
+            claim_timeout: Segundos até um lote reservado e não concluído voltar para a fila
+
+        Returns:
+            dict com enviados e falhas
+        """
+        stats = {'sent': 0, 'failed': 0}
+        last_id = 0  # falhas voltam para 'pending' e só são tentadas de novo na próxima rodada
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        while True:
+            claimed = EmailOutboxService._claim(batch_size, claim_timeout, after_id=last_id)
+            if not claimed:
+                return stats
+            last_id = claimed[-1].id
+
+            results = []
+            sender.send_batch(
+                [(m.to_email, m.subject, m.html_body, m.text_body, m.id) for m in claimed],
+                on_result=lambda item, sent, error: results.append((item[4], sent, error))
+            )
+
+            by_id = {m.id: m for m in claimed}
+            now = datetime.utcnow()
+            for message_id, sent, error in results:
+                message = by_id[message_id]
+                message.attempts += 1
+                if sent:
+                    message.status = 'sent'
+                    message.sent_at = now
+                    stats['sent'] += 1
+                else:
+                    message.last_error = (error or '')[:255]
+                    message.status = 'failed' if message.attempts >= max_attempts else 'pending'
+                    stats['failed'] += 1
+            db.session.commit()
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return stats
+
+    @staticmethod
+    def purge_sent(before, batch_size=1000):
+        """Apagar emails já enviados antes de `before`"""
+        total = 0
+        while True:
+            ids = [row.id for row in db.session.query(EmailOutbox.id)
+                   .filter(EmailOutbox.status == 'sent', EmailOutbox.sent_at < before)
+                   .limit(batch_size)]
+            if not ids:
+                return total
+            EmailOutbox.query.filter(EmailOutbox.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            total += len(ids)
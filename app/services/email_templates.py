@@ -0,0 +1,177 @@
+import re
+import threading
+from html.parser import HTMLParser
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'templates' / 'email'
+
+# Separador das variáveis por destinatário no HTML pré-renderizado
+_MARK = '\x00'
+
+
+def minify_html(source):
+    """Remover comentários e espaços entre tags; compactar o CSS dos blocos <style>"""
+    source = re.sub(r'<!--(?!\[if).*?-->', '', source, flags=re.S)
+
+    def _minify_css(match):
+        css = re.sub(r'/\*.*?\*/', '', match.group(2), flags=re.S)
+        css = re.sub(r'\s+', ' ', css)
+        css = re.sub(r'\s*([{};:,>])\s*', r'\1', css).replace(';}', '}')
+        return match.group(1) + css.strip() + match.group(3)
+
+    source = re.sub(r'(<style[^>]*>)(.*?)(</style>)', _minify_css, source, flags=re.S | re.I)
+    source = re.sub(r'>\s+<', '><', source)
+    source = re.sub(r'\s{2,}', ' ', source)
+    return source.strip()
+
+
+class _MinifyingLoader(FileSystemLoader):
+    """Carrega os .html já minificados, antes da compilação do Jinja"""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if template.endswith('.html'):
+            source = minify_html(source)
+        return source, filename, uptodate
+
+
+class _TextExtractor(HTMLParser):
+    """Gerar a versão texto a partir do HTML (uma vez por template)"""
+
+    BLOCK_TAGS = {'p', 'div', 'br', 'tr', 'table', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    SKIP_TAGS = {'head', 'style', 'script', 'title'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self._skip = 0
+        self._href = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag == 'li':
+            self.chunks.append('\n- ')
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+        elif tag == 'a':
+            self._href = dict(attrs).get('href')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+        elif tag == 'a' and self._href:
+            self.chunks.append(f' ({self._href})')
+            self._href = None
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.chunks.append(data)
+
+    def text(self):
+        lines = [re.sub(r'[ \t]+', ' ', line).strip() for line in ''.join(self.chunks).split('\n')]
+        text = '\n'.join(lines)
+        return re.sub(r'\n{2,}', '\n\n', text).strip() + '\n'
+
+
+def html_to_text(html):
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+class EmailTemplate:
+    """
+    Template pré-renderizado: partes estáticas já prontas, só falta substituir as variáveis
+
+    `parts` alterna texto fixo e nome de variável: [fixo, var, fixo, var, ..., fixo].
+    """
+
+    def __init__(self, html_parts, text_parts):
+        self.html_parts = html_parts
+        self.text_parts = text_parts
+
+    @staticmethod
+    def _join(parts, variables, escape_values):
+        out = list(parts)
+        for i in range(1, len(out), 2):
+            value = variables[out[i]]
+            out[i] = escape(value) if escape_values else str(value)
+        return ''.join(out)
+
+    def render(self, **variables):
+        """Retorna (html, texto) - valores com __html__ (Markup) entram sem escape"""
+        return (
+            self._join(self.html_parts, variables, True),
+            self._join(self.text_parts, variables, False)
+        )
+
+
+class EmailTemplates:
+    """
+    Cache dos templates de email
+
+    Cada combinação de template + contexto estático (ex.: user_type) é
+    renderizada uma única vez pelo Jinja com marcadores no lugar das
+    variáveis por destinatário; envios seguintes só fazem a substituição.
+    Variáveis por destinatário devem ser usadas apenas como `{{ nome }}`
+    (sem filtros ou condições).
+    """
+
+    def __init__(self, template_dir=TEMPLATE_DIR):
+        self.env = Environment(
+            loader=_MinifyingLoader(str(template_dir)),
+            autoescape=select_autoescape(['html']),
+            keep_trailing_newline=True
+        )
+        self.template_dir = Path(template_dir)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, variables, **static):
+        """
+        Obter o template pré-renderizado
+
+        Args:
+            name: Nome do template (sem extensão) em app/templates/email
+            variables: Nomes das variáveis por destinatário
+            **static: Contexto fixo para esta variante do template
+        """
+        key = (name, tuple(variables), tuple(sorted(static.items())))
+        template = self._cache.get(key)
+        if template is None:
+            with self._lock:
+                template = self._cache.get(key)
+                if template is None:
+                    template = self._compile(name, variables, static)
+                    self._cache[key] = template
+        return template
+
+    def _compile(self, name, variables, static):
+        context = dict(static)
+        context.update({var: f'{_MARK}{var}{_MARK}' for var in variables})
+
+        html = self.env.get_template(f'{name}.html').render(**context)
+        if (self.template_dir / f'{name}.txt').exists():
+            text = self.env.get_template(f'{name}.txt').render(**context)
+        else:
+            text = html_to_text(html)
+        return EmailTemplate(html.split(_MARK), text.split(_MARK))
+
+    def render_fragment(self, name, **context):
+        """Renderizar um trecho HTML (ex.: card de vaga) para reutilizar em vários emails"""
+        return Markup(self.env.get_template(f'{name}.html').render(**context))
+
+    def render(self, name, static=None, **variables):
+        """Atalho: obter o template e substituir as variáveis"""
+        return self.get(name, tuple(sorted(variables)), **(static or {})).render(**variables)
+
+
+# Instância global (templates compilados uma vez por processo)
+email_templates = EmailTemplates()
@@ -0,0 +1,146 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Fila de eventos de um cliente conectado (um stream SSE)"""
+
+    def __init__(self, bus, channel, maxsize):
+        self.bus = bus
+        self.channel = channel
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Cliente lento: em vez de crescer sem limite, o stream pede reconexão
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Próximo evento (tipo, dados) ou None se nada chegou em `timeout` segundos"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Pub/sub em memória para os streams SSE
+
+    Backends (EVENTS_BACKEND):
+        memory: os serviços publicam depois do commit e os eventos vão direto
+                para os streams do mesmo processo (um worker só).
+        db:     `publish` não faz nada; uma única thread por processo consulta
+                o banco a cada EVENTS_POLL_INTERVAL segundos com os pollers
+                registrados e distribui os eventos. Funciona com vários workers,
+                e o custo é uma consulta por intervalo por processo, não por cliente.
+
+    Um poller é uma função poller(posição) -> (nova_posição, [(canal, tipo, dados)]),
+    chamada com posição None na primeira vez (deve retornar a posição atual sem eventos).
+    """
+
+    def __init__(self):
+        self.app = None
+        self.backend = 'memory'
+        self.poll_interval = 2.0
+        self.queue_size = 100
+        self._subscribers = {}
+        self._pollers = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def init_app(self, app):
+        self.app = app
+        self.backend = app.config['EVENTS_BACKEND']
+        self.poll_interval = app.config['EVENTS_POLL_INTERVAL']
+        self.queue_size = app.config['EVENTS_QUEUE_SIZE']
+        app.extensions['event_bus'] = self
+
+    def register_poller(self, name, poller):
+        self._pollers[name] = poller
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        if self.backend == 'db':
+            self._ensure_poller()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def has_subscribers(self, channel):
+        return channel in self._subscribers
+
+    def publish(self, channel, event_type, data):
+        """Publicar um evento (chamar depois do commit que o originou)"""
+        if self.backend != 'memory':
+            return
+        self._dispatch(channel, event_type, data)
+
+    def _dispatch(self, channel, event_type, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put((event_type, data))
+
+    def _ensure_poller(self):
+        # Depois de um fork (gunicorn) a thread do processo pai não existe no filho
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._positions = {}
+                self._thread = threading.Thread(target=self._run, name='event-bus-poller', daemon=True)
+                self._thread.start()
+
+    def poll_once(self):
+        """Rodar todos os pollers uma vez e distribuir os eventos novos"""
+        from app import db
+
+        if not self._subscribers:
+            # Ninguém conectado: não consultar e recomeçar da posição atual depois
+            self._positions = {}
+            return
+        with self.app.app_context():
+            try:
+                for name, poller in self._pollers.items():
+                    position, events = poller(self._positions.get(name))
+                    self._positions[name] = position
+                    for channel, event_type, data in events:
+                        if self.has_subscribers(channel):
+                            self._dispatch(channel, event_type, data)
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Erro ao consultar eventos no banco: {str(e)}")
+            time.sleep(self.poll_interval)
+
+
+# Instância global do barramento de eventos
+event_bus = EventBus()
@@ -1,6 +1,8 @@
 from app import db
 from app.models.job import Job
 from app.models.company import Company
+from app.services.similarity_services import SimilarityService
+from app.services.saved_job_services import SavedJobService
 
 class JobService:
     @staticmethod
@@ -41,6 +43,8 @@ class JobService:
         # Criar a vaga com os dados fornecidos
         job = Job(**data)
         db.session.add(job)
+        db.session.flush()
+        SimilarityService.enqueue_refresh(job.id)
         db.session.commit()
         
         # Recarregar a vaga com os dados da empresa para garantir que o relacionamento está carregado
@@ -92,6 +96,7 @@ class JobService:
         for key, value in data.items():
             setattr(job, key, value)
         
+        SimilarityService.enqueue_refresh(job.id)
         db.session.commit()
         return job
     
@@ -101,6 +106,8 @@ class JobService:
         if not job:
             raise ValueError('Vaga não encontrada')
         
+        SimilarityService.remove_job(id)
+        SavedJobService.delete_for_job(id)
         db.session.delete(job)
         db.session.commit()
     
@@ -111,5 +118,6 @@ class JobService:
             raise ValueError('Vaga não encontrada')
         
         job.is_active = False
+        SimilarityService.enqueue_refresh(job.id)
         db.session.commit()
         return job
\ No newline at end of file
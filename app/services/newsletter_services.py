@@ -0,0 +1,223 @@
+import heapq
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from markupsafe import Markup
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models.checkpoint import Checkpoint
+from app.models.email_outbox import EmailOutbox
+from app.models.job import Job
+from app.models.student import Student
+from app.services.email_outbox_services import EmailOutboxService
+from app.services.email_send import email_service
+from app.services.similarity_services import tokenize
+
+CHECKPOINT_NAME = 'weekly_jobs_newsletter'
+
+
+def week_window(now=None):
+    """
+    Semana ISO anterior a `now`: (chave da execução, início, fim)
+
+    A chave é a semana em que o envio acontece, então uma execução
+    interrompida continua com a mesma janela de vagas.
+    """
+    now = now or datetime.utcnow()
+    week_start = datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+    iso_year, iso_week, _ = now.isocalendar()
+    return f'{iso_year}-W{iso_week:02d}', week_start - timedelta(days=7), week_start
+
+
+class JobMatcher:
+    """
+    Índice invertido das vagas novas para casar lotes de estudantes
+
+    Montado uma vez por execução; cada estudante custa só a consulta dos
+    termos das suas skills no índice.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = {job['id']: job for job in jobs}
+        self.postings = defaultdict(list)
+        for job in jobs:
+            for term in job['terms']:
+                self.postings[term].append(job['id'])
+
+    def match(self, skills, city, limit):
+        scores = defaultdict(float)
+        for term in set(tokenize(skills)):
+            for job_id in self.postings.get(term, ()):
+                scores[job_id] += 1.0
+        if not scores:
+            return []
+
+        city_terms = set(tokenize(city))
+        if city_terms:
+            for job_id in scores:
+                job = self.jobs[job_id]
+                if job['remote'] or city_terms & job['location_terms']:
+                    scores[job_id] += 0.5
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [self.jobs[job_id] for job_id, _ in best]
+
+    def match_batch(self, students, limit):
+        """Vagas recomendadas para cada estudante do lote: [(estudante, [vagas])]"""
+        return [(student, self.match(student.skills, student.city, limit)) for student in students]
+
+
+class NewsletterService:
+    @staticmethod
+    def load_new_jobs(since, until, max_jobs=500):
+        """Vagas ativas publicadas na janela, já com termos e card HTML renderizados"""
+        jobs = (
+            Job.query.options(joinedload(Job.company))
+            .filter(Job.is_active == True, Job.created_at >= since, Job.created_at < until)
+            .order_by(Job.created_at.desc())
+            .limit(max_jobs)
+            .all()
+        )
+
+        url_template = current_app.config['JOB_URL_TEMPLATE']
+        prepared = []
+        for job in jobs:
+            data = {
+                'id': job.id,
+                'title': job.title,
+                'company_name': job.company.name if job.company else 'Empresa não informada',
+                'location': job.location,
+                'work_mode': job.work_mode,
+            }
+            url = url_template.format(id=job.id)
+            data['terms'] = set(tokenize(job.title)) | set(tokenize(job.skills)) | set(tokenize(job.requirements))
+            data['location_terms'] = set(tokenize(job.location))
+            data['remote'] = 'remoto' in tokenize(job.work_mode) or 'remote' in tokenize(job.work_mode)
+            # Card renderizado uma vez e reaproveitado em todos os emails
+            data['html'] = email_service.templates.render_fragment('_job_item', job=data, url=url)
+            data['text'] = f"- {data['title']} ({data['company_name']}, {data['location']})\n  {url}\n"
+            prepared.append(data)
+        return prepared
+
+    @staticmethod
+    def _messages(matches, template):
+        for student, jobs in matches:
+            if not jobs:
+                continue
+            html_body, text_body = template.render(
+                user_name=student.name,
+                jobs_html=Markup(''.join(job['html'] for job in jobs)),
+                jobs_text=''.join(job['text'] for job in jobs)
+            )
+            yield student.email, 'YouthVagas - Novas vagas para você esta semana', html_body, text_body
+
+    @staticmethod
+    def send_weekly_jobs(batch_size=500, max_seconds=None, dry_run=False, sender=None, now=None):
+        """
+        Enviar a newsletter semanal de vagas, retomando do último checkpoint
+
+        Os estudantes são lidos em streaming (`yield_per`) em uma conexão
+        separada; a cada lote as mensagens vão para o `sender` e o
+        checkpoint (último id de estudante) é gravado. Os emails que falharam
+        vão para a outbox na mesma transação do checkpoint, e a tarefa
+        `email_outbox` tenta de novo até EMAIL_OUTBOX_MAX_ATTEMPTS. Um lote
+        interrompido pode ser reenviado na retomada.
+
+        Args:
+            batch_size: Estudantes por lote
+            max_seconds: Parar depois deste tempo (retoma na próxima execução)
+            dry_run: Só calcular quantos emails seriam enviados
+            sender: BulkEmailSender já iniciado (obrigatório se não for dry_run)
+            now: Data de referência (testes)
+
+        Returns:
+            dict com enviados, falhas (enfileiradas na outbox), estudantes processados e se a semana terminou
+        """
+        run_key, since, until = week_window(now)
+        stats = {'run_key': run_key, 'students': 0, 'sent': 0, 'failed': 0, 'completed': False}
+
+        checkpoint = None
+        position = 0
+        if not dry_run:
+            checkpoint = Checkpoint.load(CHECKPOINT_NAME)
+            if checkpoint.run_key != run_key:
+                checkpoint.run_key = run_key
+                checkpoint.position = 0
+                checkpoint.completed_at = None
+            db.session.commit()
+            if checkpoint.completed_at:
+                stats['completed'] = True
+                return stats
+            position = checkpoint.position
+
+        jobs = NewsletterService.load_new_jobs(since, until, current_app.config['NEWSLETTER_MAX_JOBS'])
+        if not jobs:
+            NewsletterService._complete(checkpoint)
+            stats['completed'] = True
+            return stats
+
+        matcher = JobMatcher(jobs)
+        limit = current_app.config['NEWSLETTER_JOBS_PER_EMAIL']
+        template = email_service.templates.get('weekly_jobs', ('user_name', 'jobs_html', 'jobs_text'))
+        started = time.monotonic()
+
+        failures = []
+
+        def record_failure(message, ok, error):
+            if not ok:
+                failures.append(message)
+
+        stmt = (
+            select(Student.id, Student.name, Student.email, Student.skills, Student.city)
+            .where(Student.is_active == True, Student.id > position)
+            .order_by(Student.id)
+        )
+        with db.engine.connect() as connection:
+            result = connection.execution_options(yield_per=batch_size).execute(stmt)
+            for students in result.partitions():
+                messages = list(NewsletterService._messages(matcher.match_batch(students, limit), template))
+                stats['students'] += len(students)
+
+                if dry_run:
+                    stats['sent'] += len(messages)
+                    continue
+
+                failures.clear()
+                sent, failed = sender.send_batch(messages, on_result=record_failure)
+                stats['sent'] += sent
+                stats['failed'] += failed
+                NewsletterService._retry_later(run_key, failures)
+
+                checkpoint.position = students[-1].id
+                db.session.commit()
+
+                if max_seconds is not None and time.monotonic() - started >= max_seconds:
+                    result.close()
+                    return stats
+
+        NewsletterService._complete(checkpoint)
+        stats['completed'] = True
+        return stats
+
+    @staticmethod
+    def _retry_later(run_key, failures):
+        """Enfileirar na outbox os emails que falharam (sem commit; uma vez por estudante e semana)"""
+        keys = {f'{CHECKPOINT_NAME}:{run_key}:{message[0]}': message for message in failures}
+        if not keys:
+            return
+        queued = {
+            key for (key,) in db.session.query(EmailOutbox.dedupe_key).filter(EmailOutbox.dedupe_key.in_(keys))
+        }
+        for key, (to_email, subject, html_body, text_body) in keys.items():
+            if key not in queued:
+                EmailOutboxService.enqueue(to_email, subject, html_body, text_body, dedupe_key=key)
+
+    @staticmethod
+    def _complete(checkpoint):
+        if checkpoint is not None:
+            checkpoint.completed_at = datetime.utcnow()
+            db.session.commit()
@@ -0,0 +1,113 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+logger = logging.getLogger(__name__)
+
+# Mesmo padrão do Werkzeug 3.x - hashes já gravados não precisam ser refeitos
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+
+class PasswordServiceBusy(Exception):
+    """Fila de hashing cheia ou lenta demais - a requisição deve ser recusada com 503"""
+
+
+def _hash_password(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify_password(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+class PasswordService:
+    """
+    Hash e verificação de senhas em um pool de processos limitado
+
+    scrypt/PBKDF2 são propositalmente lentos e seguram o GIL; rodando em
+    processos separados o worker continua atendendo as outras requisições.
+    Quando há mais de `max_pending` operações em andamento neste processo,
+    novas chamadas falham na hora com `PasswordServiceBusy`. A vaga só é
+    devolvida quando a operação termina no pool (ou é cancelada ainda na
+    fila), então uma chamada que estoura `timeout` também vira
+    `PasswordServiceBusy` sem liberar a vaga antes da hora.
+    """
+
+    def __init__(self, method=DEFAULT_HASH_METHOD, max_workers=2, max_pending=32, timeout=10):
+        self.method = method
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.max_workers = app.config['PASSWORD_HASH_WORKERS']
+        self.max_pending = app.config['PASSWORD_HASH_MAX_PENDING']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        app.extensions['password_service'] = self
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn: fork de um processo com threads pode travar
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def _run(self, func, *args):
+        # PASSWORD_HASH_WORKERS=0 executa na própria thread (testes, scripts, seed)
+        if self.max_workers <= 0:
+            return func(*args)
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            logger.warning("Fila de hashing de senhas cheia")
+            raise PasswordServiceBusy('Servidor ocupado, tente novamente em instantes')
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()  # ainda na fila: sai dela e devolve a vaga
+            logger.warning("Hashing de senha excedeu %ss", self.timeout)
+            raise PasswordServiceBusy('Servidor ocupado, tente novamente em instantes')
+
+    def hash(self, password):
+        """Gerar hash com os parâmetros configurados"""
+        return self._run(_hash_password, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Verificar senha contra o hash armazenado"""
+        if not password_hash:
+            return False
+        return self._run(_verify_password, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Verificar se o hash foi gerado com parâmetros diferentes dos atuais"""
+        if not password_hash or '$' not in password_hash:
+            return True
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instância global do serviço
+password_service = PasswordService()
@@ -0,0 +1,77 @@
+from app import db
+from app.models.job import Job
+from app.models.savedjob import SavedJob
+from sqlalchemy.exc import IntegrityError
+
+class SavedJobService:
+    @staticmethod
+    def save_job(student_id, job_id):
+        """Salvar vaga para o estudante (idempotente: salvar de novo não duplica)"""
+        job = Job.query.filter_by(id=job_id, is_active=True).first()
+        if not job:
+            raise ValueError('Vaga não encontrada ou inativa')
+
+        existing = SavedJob.query.filter_by(student_id=student_id, job_id=job_id).first()
+        if existing:
+            return existing
+
+        saved_job = SavedJob(student_id=student_id, job_id=job_id)
+        db.session.add(saved_job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Requisição concorrente já salvou a mesma vaga
+            db.session.rollback()
+            return SavedJob.query.filter_by(student_id=student_id, job_id=job_id).first()
+        return saved_job
+
+    @staticmethod
+    def unsave_job(student_id, job_id):
+        """Remover vaga dos salvos do estudante"""
+        deleted = SavedJob.query.filter_by(student_id=student_id, job_id=job_id)\
+            .delete(synchronize_session=False)
+        db.session.commit()
+
+        if not deleted:
+            raise ValueError('Vaga não está nos seus salvos')
+        return True
+
+    @staticmethod
+    def get_saved_jobs(student_id):
+        """Buscar vagas salvas do estudante, mais recentes primeiro"""
+        from sqlalchemy.orm import joinedload
+        return SavedJob.query.options(
+            joinedload(SavedJob.job).joinedload(Job.company)
+        ).filter_by(student_id=student_id)\
+         .order_by(SavedJob.created_at.desc())\
+         .all()
+
+    @staticmethod
+    def get_saved_job_ids(student_id, job_ids):
+        """
+        Descobrir quais vagas de uma página estão salvas pelo estudante
+
+        Uma única consulta com IN, em vez de uma consulta por vaga.
+
+        Returns:
+            set com os ids das vagas salvas
+        """
+        job_ids = list(job_ids)
+        if not student_id or not job_ids:
+            return set()
+
+        rows = db.session.query(SavedJob.job_id).filter(
+            SavedJob.student_id == student_id,
+            SavedJob.job_id.in_(job_ids)
+        ).all()
+        return {row.job_id for row in rows}
+
+    @staticmethod
+    def delete_for_job(job_id):
+        """Remover registros de vaga salva antes de deletar a vaga"""
+        SavedJob.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def delete_for_student(student_id):
+        """Remover registros de vaga salva antes de deletar o estudante"""
+        SavedJob.query.filter_by(student_id=student_id).delete(synchronize_session=False)
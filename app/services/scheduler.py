@@ -0,0 +1,234 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.task_lease import TaskLease
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledTask:
+    """Tarefa periódica registrada no scheduler"""
+
+    def __init__(self, name, interval_seconds, func, lease_seconds=None):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.lease_seconds = lease_seconds
+        self.next_run = 0.0
+        self.thread = None
+
+
+class TaskScheduler:
+    """
+    Scheduler de tarefas periódicas dentro do processo
+
+    Cada worker (gunicorn, reloader do Flask, ...) roda sua própria thread,
+    mas uma tarefa só executa no worker que conseguir o lease no banco
+    (UPDATE condicional em `task_leases`). O lease tem validade própria
+    (`lease_seconds`), é renovado enquanto a tarefa roda e, no fim, fica
+    preso até completar o intervalo: a tarefa nunca roda em dois workers ao
+    mesmo tempo e roda no máximo uma vez por intervalo no cluster. Se o
+    worker morrer, outro assume quando o lease vencer.
+
+    Cada execução roda em uma thread própria, então uma tarefa longa
+    (newsletter) não atrasa as curtas (outbox, digest).
+
+    A thread só sobe nos processos que atendem requisições (python run.py,
+    gunicorn): comandos do Flask CLI (`flask db upgrade`, `flask seed`,
+    `flask run-task`...) terminam logo e matariam uma tarefa no meio,
+    deixando o lease preso até vencer.
+    """
+
+    def __init__(self, tick_seconds=5, lease_seconds=300):
+        self.app = None
+        self.tasks = {}
+        self.tick_seconds = tick_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.lease_seconds = app.config.get('SCHEDULER_LEASE_SECONDS', self.lease_seconds)
+        app.extensions['task_scheduler'] = self
+        # O Flask CLI marca o processo com FLASK_RUN_FROM_CLI antes de carregar o app
+        if app.config.get('SCHEDULER_ENABLED') and os.environ.get('FLASK_RUN_FROM_CLI') != 'true':
+            self.start()
+
+    def register(self, name, interval_seconds, func, lease_seconds=None):
+        """
+        Registrar tarefa `func()` para rodar a cada `interval_seconds`
+
+        Args:
+            lease_seconds: Validade do lease (padrão SCHEDULER_LEASE_SECONDS);
+                deve passar do tempo máximo de uma execução da tarefa
+        """
+        self.tasks[name] = ScheduledTask(name, interval_seconds, func, lease_seconds)
+
+    def task(self, name, interval_seconds, lease_seconds=None):
+        """Decorator equivalente a `register`"""
+        def decorator(func):
+            self.register(name, interval_seconds, func, lease_seconds)
+            return func
+        return decorator
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name='task-scheduler', daemon=True)
+        self._thread.start()
+        print(f"⏰ Scheduler iniciado ({self.owner}) com tarefas: {', '.join(self.tasks) or 'nenhuma'}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.tick_seconds * 2)
+            self._thread = None
+
+    def _run_loop(self):
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            for task in list(self.tasks.values()):
+                # Execução anterior ainda em andamento neste worker: espera terminar
+                if task.thread and task.thread.is_alive():
+                    continue
+                if now >= task.next_run:
+                    task.next_run = now + task.interval_seconds
+                    task.thread = threading.Thread(
+                        target=self.run_task, args=(task.name,), name=f'task-{task.name}', daemon=True
+                    )
+                    task.thread.start()
+            self._stop_event.wait(self.tick_seconds)
+
+    def _lease_seconds(self, task):
+        return task.lease_seconds or self.lease_seconds
+
+    def run_task(self, name, force=False, **kwargs):
+        """
+        Executar uma tarefa se este worker conseguir o lease
+
+        Args:
+            name: Nome da tarefa registrada
+            force: Ignorar o lease (uso manual via CLI)
+            **kwargs: Repassados para a tarefa (execuções manuais com parâmetros)
+
+        Returns:
+            Resultado da tarefa, ou None se outro worker está com o lease
+        """
+        task = self.tasks.get(name)
+        if not task:
+            raise ValueError(f'Tarefa não registrada: {name}')
+
+        with self.app.app_context():
+            started_at = datetime.utcnow()
+            heartbeat = None
+            try:
+                if not force:
+                    if not self._acquire_lease(name, self._lease_seconds(task)):
+                        return None
+                    heartbeat = self._start_heartbeat(task)
+                result = task.func(**kwargs)
+                logger.info(f"Tarefa {name} executada: {result}")
+                return result
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Erro na tarefa {name}: {str(e)}")
+                print(f"ERRO SCHEDULER: tarefa {name} falhou: {str(e)}")
+                return None
+            finally:
+                if heartbeat:
+                    heartbeat.set()
+                    self._release_lease(name, started_at + timedelta(seconds=task.interval_seconds))
+                db.session.remove()
+
+    def _start_heartbeat(self, task):
+        """Renovar o lease a cada 1/3 da validade até o evento devolvido ser sinalizado"""
+        stop = threading.Event()
+        lease_seconds = self._lease_seconds(task)
+
+        def beat():
+            with self.app.app_context():
+                try:
+                    while not stop.wait(lease_seconds / 3):
+                        if not self._renew_lease(task.name, lease_seconds):
+                            logger.warning(f"Lease da tarefa {task.name} perdido por {self.owner}")
+                            return
+                finally:
+                    db.session.remove()
+
+        threading.Thread(target=beat, name=f'lease-{task.name}', daemon=True).start()
+        return stop
+
+    def _acquire_lease(self, name, lease_seconds):
+        """Tentar obter o lease com um único UPDATE condicional (ou INSERT na primeira vez)"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=lease_seconds)
+
+        result = db.session.execute(
+            update(TaskLease)
+            .where(TaskLease.name == name, TaskLease.expires_at <= now)
+            .values(owner=self.owner, expires_at=expires_at, last_run_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return True
+
+        if db.session.get(TaskLease, name) is not None:
+            return False
+
+        db.session.add(TaskLease(name=name, owner=self.owner, expires_at=expires_at, last_run_at=now))
+        try:
+            db.session.commit()
+            return True
+        except IntegrityError:
+            # Outro worker criou o lease ao mesmo tempo
+            db.session.rollback()
+            return False
+
+    def _renew_lease(self, name, lease_seconds):
+        """Estender o lease se ele ainda é deste worker (False se outro assumiu)"""
+        result = db.session.execute(
+            update(TaskLease)
+            .where(TaskLease.name == name, TaskLease.owner == self.owner)
+            .values(expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _release_lease(self, name, next_run_at):
+        """
+        Liberar o lease no fim da execução
+
+        O lease fica até `next_run_at` (início + intervalo), para a tarefa não
+        rodar de novo antes do intervalo em outro worker; se a execução passou
+        do intervalo, fica livre na hora.
+        """
+        try:
+            db.session.rollback()
+            db.session.execute(
+                update(TaskLease)
+                .where(TaskLease.name == name, TaskLease.owner == self.owner)
+                .values(expires_at=max(next_run_at, datetime.utcnow()))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Erro ao liberar lease da tarefa {name}: {str(e)}")
+
+
+# Instância global do scheduler
+scheduler = TaskScheduler()
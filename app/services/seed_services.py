@@ -0,0 +1,362 @@
+import bisect
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from app import db
+from app.models.account import Account
+from app.models.application import Application
+from app.models.application_status_event import ApplicationStatusEvent
+from app.models.company import Company
+from app.models.job import Job
+from app.models.student import Student
+from app.utils.phone_validator import PhoneValidator
+
+SEED_EMAIL_DOMAIN = 'seed.youthvagas.dev'
+
+FIRST_NAMES = (
+    'Ana', 'Beatriz', 'Bruna', 'Camila', 'Carolina', 'Débora', 'Fernanda', 'Gabriela', 'Isabela', 'Júlia',
+    'Larissa', 'Letícia', 'Luana', 'Mariana', 'Natália', 'Rafaela', 'Sofia', 'Thaís', 'Vitória', 'Yasmin',
+    'Arthur', 'Bruno', 'Caio', 'Daniel', 'Eduardo', 'Felipe', 'Gabriel', 'Gustavo', 'Henrique', 'Igor',
+    'João', 'Kauã', 'Leonardo', 'Lucas', 'Matheus', 'Miguel', 'Pedro', 'Rafael', 'Thiago', 'Vinícius',
+)
+LAST_NAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+    'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas',
+)
+
+# (cidade, DDD) em ordem de peso: a maior parte das vagas e candidatos fica nas capitais do Sudeste
+CITIES = (
+    ('São Paulo, SP', '11'), ('Rio de Janeiro, RJ', '21'), ('Belo Horizonte, MG', '31'), ('Curitiba, PR', '41'),
+    ('Porto Alegre, RS', '51'), ('Brasília, DF', '61'), ('Salvador, BA', '71'), ('Recife, PE', '81'),
+    ('Fortaleza, CE', '85'), ('Campinas, SP', '19'), ('Goiânia, GO', '62'), ('Florianópolis, SC', '48'),
+    ('Manaus, AM', '92'), ('Belém, PA', '91'), ('Vitória, ES', '27'), ('Natal, RN', '84'),
+)
+
+SKILLS = (
+    'Comunicação', 'Excel', 'Trabalho em equipe', 'Python', 'JavaScript', 'SQL', 'Atendimento ao cliente',
+    'Inglês', 'HTML', 'CSS', 'React', 'Power BI', 'Java', 'Git', 'Vendas', 'Marketing digital', 'Node.js',
+    'Canva', 'Figma', 'Espanhol', 'Photoshop', 'Análise de dados', 'TypeScript', 'Docker', 'Flask',
+    'Django', 'Redes sociais', 'Logística', 'Contabilidade', 'AWS', 'Kotlin', 'Linux', 'C#', 'PHP',
+)
+SKILL_CUM_WEIGHTS = list(itertools.accumulate(1 / rank ** 0.8 for rank in range(1, len(SKILLS) + 1)))
+
+JOB_TITLES = (
+    'Jovem Aprendiz Administrativo', 'Estágio em Desenvolvimento Web', 'Assistente de Atendimento',
+    'Estágio em Marketing Digital', 'Auxiliar de Logística', 'Estágio em Análise de Dados',
+    'Desenvolvedor(a) Júnior Python', 'Assistente Financeiro', 'Estágio em Recursos Humanos',
+    'Desenvolvedor(a) Front-end Júnior', 'Vendedor(a) Interno', 'Estágio em Design Gráfico',
+    'Suporte Técnico N1', 'Assistente de Compras', 'Estágio em Contabilidade', 'Analista de QA Júnior',
+)
+SECTORS = ('Tecnologia', 'Varejo', 'Serviços', 'Educação', 'Saúde', 'Indústria', 'Finanças', 'Logística')
+COMPANY_SIZES = ('1-10', '11-50', '51-200', '201-500', '500+')
+COMPANY_SUFFIXES = ('Tecnologia', 'Soluções', 'Serviços', 'Digital', 'Comércio', 'Consultoria', 'Logística')
+CONTRACT_TYPES = ('CLT', 'Estágio', 'Jovem Aprendiz', 'PJ', 'Temporário')
+WORK_MODES = ('Presencial', 'Híbrido', 'Remoto')
+EDUCATION = ('Ensino Médio', 'Ensino Médio completo', 'Técnico', 'Superior em andamento', 'Superior completo')
+EXPERIENCE = ('Sem experiência', 'Até 1 ano', '1 a 2 anos', '2 anos ou mais')
+
+# (status, peso): a maioria das candidaturas ainda não foi respondida
+APPLICATION_STATUSES = (('pending', 55), ('analysis', 20), ('interview', 10), ('rejected', 10), ('accepted', 5))
+
+CPF_WEIGHTS = ((10, 9, 8, 7, 6, 5, 4, 3, 2), (11, 10, 9, 8, 7, 6, 5, 4, 3, 2))
+CNPJ_WEIGHTS = ((5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2), (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2))
+
+
+def _check_digit(digits, weights):
+    remainder = sum(int(digit) * weight for digit, weight in zip(digits, weights)) % 11
+    return '0' if remainder < 2 else str(11 - remainder)
+
+
+def make_cpf(number):
+    """CPF formatado (000.000.000-00) com dígitos verificadores válidos para uma base de 9 dígitos"""
+    base = f'{number % 10**9:09d}'
+    base += _check_digit(base, CPF_WEIGHTS[0])
+    base += _check_digit(base, CPF_WEIGHTS[1])
+    return f'{base[:3]}.{base[3:6]}.{base[6:9]}-{base[9:]}'
+
+
+def make_cnpj(number):
+    """CNPJ formatado (00.000.000/0001-00) da matriz com uma raiz de 8 dígitos"""
+    base = f'{number % 10**8:08d}0001'
+    base += _check_digit(base, CNPJ_WEIGHTS[0])
+    base += _check_digit(base, CNPJ_WEIGHTS[1])
+    return f'{base[:2]}.{base[2:5]}.{base[5:8]}/{base[8:12]}-{base[12:]}'
+
+
+def _scrambled(start, modulus):
+    """
+    Sequência sem repetição de números de `modulus` que não parece sequencial
+
+    Multiplicar por um primo que não divide 10^n é uma bijeção módulo 10^n;
+    bases com todos os dígitos iguais (inválidas no CPF/CNPJ) são puladas.
+    """
+    for index in itertools.count(start):
+        number = index * 7919 % modulus
+        digits = f'{number:0{len(str(modulus)) - 1}d}'
+        if digits != digits[0] * len(digits):
+            yield number
+
+
+def _zipf_cum_weights(count, exponent, rng):
+    """Pesos acumulados ~ 1/posição^exponent, com as posições embaralhadas"""
+    weights = [1 / rank ** exponent for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+    return list(itertools.accumulate(weights))
+
+
+class SeedService:
+    """
+    Geração de dados sintéticos em volume para testes de carga e benchmarks
+
+    As linhas são montadas em Python e gravadas com `insert()` do Core em
+    executemany por lote (sem ORM, sem RETURNING); os ids são atribuídos aqui
+    a partir do maior id existente, então dá para rodar várias vezes no mesmo
+    banco. Emails, CPFs, CNPJs e telefones são únicos e válidos nos validadores
+    do projeto.
+    """
+
+    def __init__(self, seed=None, batch_size=10000, password='Senha@123', days=180, now=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.password = password
+        self.days = days
+        self.now = now or datetime.utcnow()
+        self.stats = {}
+
+    def _next_id(self, model):
+        return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+    def _write(self, model, batch):
+        """Um INSERT executemany e um commit"""
+        table = model.__tablename__
+        self.stats.setdefault(table, 0)
+        if batch:
+            db.session.execute(insert(model.__table__), batch)
+            db.session.commit()
+            self.stats[table] += len(batch)
+
+    def _insert(self, model, rows):
+        """Gravar as linhas em lotes de `batch_size`"""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._write(model, batch)
+                batch = []
+        self._write(model, batch)
+
+    def _past(self, max_days=None):
+        return self.now - timedelta(seconds=self.rng.random() * (max_days or self.days) * 86400)
+
+    def _skills(self, low, high):
+        # Vocabulário em cauda longa: Comunicação e Excel aparecem muito mais que Kotlin
+        wanted = self.rng.randint(low, high)
+        chosen = []
+        while len(chosen) < wanted:
+            skill = SKILLS[bisect.bisect_left(SKILL_CUM_WEIGHTS, self.rng.random() * SKILL_CUM_WEIGHTS[-1])]
+            if skill not in chosen:
+                chosen.append(skill)
+        return ', '.join(chosen)
+
+    def _phone(self, ddd, number):
+        return PhoneValidator.format_phone(f'{ddd}9{number:08d}')
+
+    def _accounts(self, user_type, people):
+        for user_id, email, phone in people:
+            yield {
+                'email': email.lower(),
+                'phone': PhoneValidator.to_e164(phone),
+                'user_type': user_type,
+                'user_id': user_id,
+                'created_at': self.now,
+                'updated_at': self.now,
+            }
+
+    def seed_companies(self, count, password_hash):
+        first_id = self._next_id(Company)
+        cnpjs = _scrambled(first_id, 10**8)
+        phones = _scrambled(first_id + 5 * 10**7, 10**8)
+        city_weights = list(itertools.accumulate(range(len(CITIES), 0, -1)))
+        companies, people = [], []
+        for company_id in range(first_id, first_id + count):
+            city, ddd = self.rng.choices(CITIES, cum_weights=city_weights)[0]
+            name = f'{self.rng.choice(LAST_NAMES)} {self.rng.choice(COMPANY_SUFFIXES)} {company_id}'
+            email = f'empresa{company_id}@{SEED_EMAIL_DOMAIN}'
+            phone = self._phone(ddd, next(phones))
+            companies.append({
+                'id': company_id,
+                'name': name,
+                'email': email,
+                'password': password_hash,
+                'phone': phone,
+                'cnpj': make_cnpj(next(cnpjs)),
+                'sector': self.rng.choice(SECTORS),
+                'company_size': self.rng.choice(COMPANY_SIZES),
+                'city': city,
+                'is_active': True,
+                'created_at': self._past(self.days * 2),
+            })
+            people.append((company_id, email, phone))
+        self._insert(Company, companies)
+        self._insert(Account, self._accounts('company', people))
+        return list(range(first_id, first_id + count))
+
+    def seed_students(self, count, password_hash):
+        first_id = self._next_id(Student)
+        cpfs = _scrambled(first_id, 10**9)
+        phones = _scrambled(first_id, 10**8)
+        city_weights = list(itertools.accumulate(range(len(CITIES), 0, -1)))
+        people = []
+
+        def rows():
+            for student_id in range(first_id, first_id + count):
+                city, ddd = self.rng.choices(CITIES, cum_weights=city_weights)[0]
+                email = f'aluno{student_id}@{SEED_EMAIL_DOMAIN}'
+                phone = self._phone(ddd, next(phones))
+                people.append((student_id, email, phone))
+                yield {
+                    'id': student_id,
+                    'name': f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                    'email': email,
+                    'password': password_hash,
+                    'phone': phone,
+                    'cpf': make_cpf(next(cpfs)),
+                    'city': city,
+                    'skills': self._skills(2, 8),
+                    'is_active': True,
+                    'created_at': self._past(self.days * 2),
+                }
+
+        self._insert(Student, rows())
+        self._insert(Account, self._accounts('student', people))
+        return first_id, count
+
+    def seed_jobs(self, count, company_ids):
+        first_id = self._next_id(Job)
+        # Poucas empresas publicam a maior parte das vagas
+        company_weights = _zipf_cum_weights(len(company_ids), 1.0, self.rng)
+        jobs = []
+        for job_id in range(first_id, first_id + count):
+            title = self.rng.choice(JOB_TITLES)
+            created_at = self._past()
+            jobs.append({
+                'id': job_id,
+                'title': title,
+                'description': f'Vaga de {title.lower()} para jovens em início de carreira.',
+                'salary_range': f'R$ {self.rng.randrange(1200, 4000, 100)},00',
+                'contract_type': self.rng.choice(CONTRACT_TYPES),
+                'location': self.rng.choice(CITIES)[0],
+                'work_hours': self.rng.choice(('20h semanais', '30h semanais', '44h semanais')),
+                'work_mode': self.rng.choice(WORK_MODES),
+                'education': self.rng.choice(EDUCATION),
+                'experience': self.rng.choice(EXPERIENCE),
+                'skills': self._skills(3, 6),
+                'is_active': self.rng.random() < 0.85,
+                'created_at': created_at,
+                'company_id': self.rng.choices(company_ids, cum_weights=company_weights)[0],
+            })
+        self._insert(Job, jobs)
+        return [(job['id'], job['created_at']) for job in jobs]
+
+    def seed_applications(self, count, jobs, first_student_id, student_count):
+        """
+        Candidaturas com popularidade de vagas em cauda longa (Zipf)
+
+        Cada estudante se candidata a algumas vagas distintas e o par
+        (vaga, estudante) nunca se repete. Candidaturas fora de 'pending'
+        ganham o evento de status correspondente, gravado no mesmo lote.
+        """
+        count = min(count, len(jobs) * student_count)
+        application_id = self._next_id(Application)
+        event_id = self._next_id(ApplicationStatusEvent)
+        job_weights = _zipf_cum_weights(len(jobs), 1.1, self.rng)
+        total_weight = job_weights[-1]
+        last_job = len(jobs) - 1
+        statuses = [status for status, _ in APPLICATION_STATUSES]
+        status_weights = list(itertools.accumulate(weight for _, weight in APPLICATION_STATUSES))
+        per_student = max(1.0, count / student_count)
+        random_ = self.rng.random
+        seen = set()
+        applications, events = [], []
+
+        while count > 0:
+            student = self.rng.randrange(student_count)
+            student_id = first_student_id + student
+            for _ in range(min(count, max(1, int(self.rng.expovariate(1 / per_student))))):
+                index = min(bisect.bisect_left(job_weights, random_() * total_weight), last_job)
+                key = index * student_count + student
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                job_id, job_created_at = jobs[index]
+                age = max((self.now - job_created_at).total_seconds(), 60)
+                created_at = job_created_at + timedelta(seconds=random_() * age)
+                status = statuses[bisect.bisect_left(status_weights, random_() * status_weights[-1])]
+                applications.append({
+                    'id': application_id,
+                    'job_id': job_id,
+                    'student_id': student_id,
+                    'status': status,
+                    'created_at': created_at,
+                })
+                if status != 'pending':
+                    answered_after = min(self.rng.expovariate(1 / (3 * 86400)), (self.now - created_at).total_seconds())
+                    events.append({
+                        'id': event_id,
+                        'application_id': application_id,
+                        'student_id': student_id,
+                        'job_id': job_id,
+                        'old_status': 'pending',
+                        'new_status': status,
+                        'created_at': created_at + timedelta(seconds=answered_after),
+                    })
+                    event_id += 1
+                application_id += 1
+                count -= 1
+
+            if len(applications) >= self.batch_size:
+                self._write(Application, applications)
+                self._write(ApplicationStatusEvent, events)
+                applications, events = [], []
+
+        self._write(Application, applications)
+        self._write(ApplicationStatusEvent, events)
+
+    def run(self, companies, students, jobs, applications, progress=None):
+        """
+        Gerar empresas, estudantes, vagas e candidaturas
+
+        Returns:
+            dict com linhas inseridas por tabela e o tempo total
+        """
+        from app.services.password_service import password_service
+
+        if jobs and not companies:
+            raise ValueError('Vagas precisam de empresas (--companies)')
+        if applications and not (jobs and students):
+            raise ValueError('Candidaturas precisam de vagas e estudantes (--jobs e --students)')
+
+        started = time.perf_counter()
+        echo, db.engine.echo = db.engine.echo, False  # SQLALCHEMY_ECHO imprimiria cada lote
+        try:
+            password_hash = password_service.hash(self.password)
+
+            company_ids = self.seed_companies(companies, password_hash) if companies else []
+            progress and progress('companies', self.stats)
+            first_student_id, student_count = self.seed_students(students, password_hash) if students else (0, 0)
+            progress and progress('students', self.stats)
+            job_rows = self.seed_jobs(jobs, company_ids) if jobs else []
+            progress and progress('jobs', self.stats)
+            if applications:
+                self.seed_applications(applications, job_rows, first_student_id, student_count)
+                progress and progress('applications', self.stats)
+        finally:
+            db.engine.echo = echo
+
+        return {**self.stats, 'seconds': round(time.perf_counter() - started, 1)}
@@ -0,0 +1,249 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models.job import Job
+from app.models.job_similarity import JobSimilarity, JobSimilarityRefresh
+
+# Quantidade de vizinhos mantidos na tabela para cada vaga
+SIMILAR_JOBS_PER_JOB = 10
+
+# Palavras muito comuns que não ajudam a diferenciar vagas
+STOPWORDS = {
+    'a', 'ao', 'aos', 'as', 'com', 'como', 'da', 'das', 'de', 'do', 'dos', 'e', 'em',
+    'entre', 'na', 'nas', 'no', 'nos', 'o', 'os', 'ou', 'para', 'pela', 'pelas', 'pelo',
+    'pelos', 'por', 'que', 'se', 'sem', 'ser', 'sua', 'suas', 'seu', 'seus', 'um', 'uma',
+    'voce', 'nossa', 'nosso', 'sobre', 'mais', 'muito', 'and', 'the', 'of', 'to', 'in',
+    'for', 'with', 'vaga', 'vagas', 'empresa',
+}
+
+TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+
+def tokenize(text):
+    """Quebrar texto em termos normalizados (minúsculas, sem acentos, sem stopwords)"""
+    if not text:
+        return []
+    normalized = unicodedata.normalize('NFKD', text.lower())
+    normalized = ''.join(c for c in normalized if not unicodedata.combining(c))
+    return [token for token in TOKEN_RE.findall(normalized)
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+def job_terms(title, description, skills):
+    """Contagem de termos de uma vaga - título e skills pesam mais que a descrição"""
+    counts = Counter(tokenize(description))
+    for token in tokenize(title):
+        counts[token] += 2
+    for token in tokenize(skills):
+        counts[token] += 2
+    return counts
+
+
+def build_tfidf_vectors(documents):
+    """
+    Calcular vetores TF-IDF normalizados (L2)
+
+    Args:
+        documents: dict {job_id: Counter de termos}
+
+    Returns:
+        dict {job_id: {termo: peso}}
+    """
+    total = len(documents)
+    document_frequency = Counter()
+    for terms in documents.values():
+        document_frequency.update(terms.keys())
+
+    vectors = {}
+    for job_id, terms in documents.items():
+        vector = {
+            term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+            for term, count in terms.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors[job_id] = {term: weight / norm for term, weight in vector.items()} if norm else {}
+    return vectors
+
+
+def cosine_similarity(vector_a, vector_b):
+    """Similaridade de cosseno entre dois vetores já normalizados"""
+    if len(vector_a) > len(vector_b):
+        vector_a, vector_b = vector_b, vector_a
+    return sum(weight * vector_b.get(term, 0.0) for term, weight in vector_a.items())
+
+
+def _build_postings(vectors):
+    """Índice invertido termo -> [(job_id, peso)] para comparar só vagas com termos em comum"""
+    postings = defaultdict(list)
+    for job_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((job_id, weight))
+    return postings
+
+
+def _scores_for(job_id, vectors, postings):
+    """Similaridade da vaga com todas as outras que compartilham pelo menos um termo"""
+    scores = defaultdict(float)
+    for term, weight in vectors.get(job_id, {}).items():
+        for other_id, other_weight in postings[term]:
+            if other_id != job_id:
+                scores[other_id] += weight * other_weight
+    return scores
+
+
+class SimilarityService:
+    @staticmethod
+    def _load_active_documents():
+        """Carregar apenas as colunas de texto das vagas ativas"""
+        rows = db.session.query(Job.id, Job.title, Job.description, Job.skills)\
+            .filter(Job.is_active == True)\
+            .all()
+        return {row.id: job_terms(row.title, row.description, row.skills) for row in rows}
+
+    @staticmethod
+    def rebuild_all(limit=SIMILAR_JOBS_PER_JOB):
+        """Recalcular toda a tabela de vizinhos (executar via CLI ou após importações)"""
+        vectors = build_tfidf_vectors(SimilarityService._load_active_documents())
+        postings = _build_postings(vectors)
+
+        now = datetime.utcnow()
+        rows = []
+        for job_id in vectors:
+            scores = _scores_for(job_id, vectors, postings)
+            for other_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+                rows.append({
+                    'job_id': job_id,
+                    'similar_job_id': other_id,
+                    'score': score,
+                    'updated_at': now
+                })
+
+        JobSimilarity.query.delete(synchronize_session=False)
+        if rows:
+            db.session.execute(insert(JobSimilarity), rows)
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def enqueue_refresh(*job_ids):
+        """
+        Marcar vagas para recalcular os vizinhos (na transação de quem chamou)
+
+        O recálculo carrega todas as vagas ativas, então não roda dentro da
+        requisição: a tarefa `similar_jobs_refresh` processa a fila em lote.
+        """
+        for job_id in job_ids:
+            db.session.add(JobSimilarityRefresh(job_id=job_id))
+
+    @staticmethod
+    def process_refresh_queue(batch_size=500, limit=SIMILAR_JOBS_PER_JOB):
+        """
+        Recalcular os vizinhos das vagas na fila (tarefa `similar_jobs_refresh`)
+
+        Lê até `batch_size` entradas e apaga só as lidas, na mesma transação das
+        novas listas: entradas inseridas enquanto isso ficam para a próxima rodada.
+
+        Returns:
+            Quantidade de vagas distintas processadas
+        """
+        entries = db.session.query(JobSimilarityRefresh.id, JobSimilarityRefresh.job_id)\
+            .order_by(JobSimilarityRefresh.id)\
+            .limit(batch_size)\
+            .all()
+        if not entries:
+            db.session.commit()
+            return 0
+
+        job_ids = {entry.job_id for entry in entries}
+        SimilarityService.refresh_jobs(job_ids, limit=limit, commit=False)
+        JobSimilarityRefresh.query.filter(JobSimilarityRefresh.id <= entries[-1].id)\
+            .delete(synchronize_session=False)
+        db.session.commit()
+        return len(job_ids)
+
+    @staticmethod
+    def refresh_jobs(job_ids, limit=SIMILAR_JOBS_PER_JOB, commit=True):
+        """
+        Atualizar os vizinhos de vagas criadas/alteradas/desativadas
+
+        O TF-IDF é montado uma vez para o lote inteiro. Além das próprias vagas,
+        regrava por completo a lista de quem as listava (uma vaga desativada sai
+        e a lista é completada com a próxima mais próxima) e das vagas mais
+        próximas (que podem passar a listá-las). Pontuações dos demais pares não
+        mudam - o `rebuild_all` corrige a pequena deriva causada pelo IDF.
+
+        Returns:
+            Quantidade de listas regravadas
+        """
+        job_ids = set(job_ids)
+        vectors = build_tfidf_vectors(SimilarityService._load_active_documents())
+        postings = _build_postings(vectors)
+
+        # Quem já listava alguma das vagas
+        affected = set(job_ids)
+        affected.update(
+            row.job_id for row in db.session.query(JobSimilarity.job_id)
+            .filter(JobSimilarity.similar_job_id.in_(job_ids))
+        )
+        # Candidatas a passar a listar as vagas ativas: as mais próximas (a similaridade é simétrica)
+        for job_id in job_ids & vectors.keys():
+            scores = _scores_for(job_id, vectors, postings)
+            affected.update(other_id for other_id, _ in heapq.nlargest(limit * 3, scores.items(), key=lambda item: item[1]))
+
+        now = datetime.utcnow()
+        rows = []
+        for job_id in affected & vectors.keys():
+            scores = _scores_for(job_id, vectors, postings)
+            for other_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+                rows.append({'job_id': job_id, 'similar_job_id': other_id, 'score': score, 'updated_at': now})
+
+        # Inativas saem das listas (as de quem as listava já são regravadas acima)
+        JobSimilarity.query.filter(JobSimilarity.job_id.in_(affected)).delete(synchronize_session=False)
+        if rows:
+            db.session.execute(insert(JobSimilarity), rows)
+        if commit:
+            db.session.commit()
+        return len(affected & vectors.keys())
+
+    @staticmethod
+    def refresh_job(job_id, limit=SIMILAR_JOBS_PER_JOB):
+        """Atualizar na hora os vizinhos de uma vaga (CLI/testes; as rotas usam `enqueue_refresh`)"""
+        return SimilarityService.refresh_jobs([job_id], limit=limit)
+
+    @staticmethod
+    def remove_job(job_id):
+        """
+        Remover todas as linhas de similaridade de uma vaga (antes de deletá-la)
+
+        Quem a listava entra na fila para completar a lista com outra vaga.
+        """
+        listed_by = [row.job_id for row in db.session.query(JobSimilarity.job_id).filter_by(similar_job_id=job_id)]
+        JobSimilarity.query.filter(
+            (JobSimilarity.job_id == job_id) | (JobSimilarity.similar_job_id == job_id)
+        ).delete(synchronize_session=False)
+        SimilarityService.enqueue_refresh(*listed_by)
+
+    @staticmethod
+    def get_similar_jobs(job_id, limit=5):
+        """
+        Buscar vagas ativas semelhantes a partir da tabela pré-calculada
+
+        Returns:
+            Lista de tuplas (score, job) ordenada da mais para a menos semelhante
+        """
+        rows = db.session.query(JobSimilarity.score, Job)\
+            .join(Job, Job.id == JobSimilarity.similar_job_id)\
+            .options(joinedload(Job.company))\
+            .filter(JobSimilarity.job_id == job_id, Job.is_active == True)\
+            .order_by(JobSimilarity.score.desc())\
+            .limit(limit)\
+            .all()
+        return [(row[0], row[1]) for row in rows]
@@ -0,0 +1,193 @@
+import heapq
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TwilioTransport:
+    """Envio pelo Twilio com um único `Client` (e pool HTTP) por processo"""
+
+    def __init__(self, account_sid, auth_token, from_phone):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_phone = from_phone
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return bool(self.account_sid and self.auth_token and self.from_phone)
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from twilio.rest import Client
+                    self._client = Client(self.account_sid, self.auth_token)
+        return self._client
+
+    def send(self, to_phone, body):
+        message = self._get_client().messages.create(body=body, from_=self.from_phone, to=to_phone)
+        return message.sid
+
+    @staticmethod
+    def is_retryable(error):
+        """Erros 4xx do Twilio (número inválido, bloqueado...) não adiantam repetir, exceto 429"""
+        from twilio.base.exceptions import TwilioRestException
+        if isinstance(error, TwilioRestException):
+            return error.status == 429 or error.status >= 500
+        return True
+
+
+class FakeTwilioTransport:
+    """Transporte local para testes/desenvolvimento - guarda as mensagens em memória"""
+
+    configured = True
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.sent = []
+        self.attempts = 0
+        self._lock = threading.Lock()
+
+    def send(self, to_phone, body):
+        with self._lock:
+            self.attempts += 1
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                raise ConnectionError('Falha simulada no envio de SMS')
+            self.sent.append({'to': to_phone, 'body': body})
+            return f'SMfake{len(self.sent):06d}'
+
+    @staticmethod
+    def is_retryable(error):
+        return True
+
+
+class SmsDispatcher:
+    """
+    Fila de SMS processada por uma thread em segundo plano
+
+    A requisição só enfileira a mensagem; a thread envia com o transporte
+    configurado e repete falhas temporárias com backoff exponencial.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.max_retries = 3
+        self.backoff = 2.0
+        self._queue = queue.Queue(maxsize=1000)
+        self._retries = []  # heap de (quando, seq, mensagem)
+        self._seq = itertools.count()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        if app.config['SMS_TRANSPORT'] == 'fake':
+            self.transport = FakeTwilioTransport()
+        else:
+            self.transport = TwilioTransport(
+                app.config['TWILIO_ACCOUNT_SID'],
+                app.config['TWILIO_AUTH_TOKEN'],
+                app.config['TWILIO_PHONE_NUMBER']
+            )
+        self.max_retries = app.config['SMS_MAX_RETRIES']
+        self.backoff = app.config['SMS_RETRY_BACKOFF']
+        self._queue = queue.Queue(maxsize=app.config['SMS_QUEUE_SIZE'])
+        app.extensions['sms_dispatcher'] = self
+
+    def _ensure_worker(self):
+        # Depois de um fork (gunicorn) a thread do processo pai não existe no filho
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='sms-dispatcher', daemon=True)
+                self._thread.start()
+
+    def send_now(self, to_phone, body):
+        """Enviar na thread atual (sem fila) - retorna o SID ou None"""
+        if not self.transport or not self.transport.configured:
+            logger.warning("Twilio credentials not configured")
+            return None
+        return self.transport.send(to_phone, body)
+
+    def enqueue(self, to_phone, body):
+        """
+        Colocar a mensagem na fila de envio
+
+        Returns:
+            True se enfileirada, False se o transporte não está configurado ou a fila está cheia
+        """
+        if not self.transport or not self.transport.configured:
+            logger.warning("Twilio credentials not configured")
+            return False
+
+        self._ensure_worker()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait({'to': to_phone, 'body': body, 'attempt': 0})
+        except queue.Full:
+            self._done()
+            logger.error(f"Fila de SMS cheia, mensagem para {to_phone} descartada")
+            return False
+        return True
+
+    def _done(self):
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Aguardar até que todas as mensagens tenham sido enviadas ou descartadas"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def _next_message(self):
+        timeout = None
+        if self._retries:
+            when, _, message = self._retries[0]
+            timeout = when - time.monotonic()
+            if timeout <= 0:
+                heapq.heappop(self._retries)
+                return message
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _run(self):
+        while True:
+            message = self._next_message()
+            if message is None:
+                continue
+            self._deliver(message)
+
+    def _deliver(self, message):
+        try:
+            sid = self.transport.send(message['to'], message['body'])
+            logger.info(f"SMS sent successfully to {message['to']}, SID: {sid}")
+        except Exception as e:
+            message['attempt'] += 1
+            if message['attempt'] <= self.max_retries and self.transport.is_retryable(e):
+                delay = self.backoff * (2 ** (message['attempt'] - 1))
+                logger.warning(f"Falha ao enviar SMS para {message['to']} (tentativa {message['attempt']}), nova tentativa em {delay}s: {str(e)}")
+                heapq.heappush(self._retries, (time.monotonic() + delay, next(self._seq), message))
+                return
+            logger.error(f"Failed to send SMS to {message['to']}: {str(e)}")
+        self._done()
+
+
+# Instância global do dispatcher
+sms_dispatcher = SmsDispatcher()
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from markupsafe import Markup
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models.application_status_event import ApplicationStatusEvent
+from app.models.checkpoint import Checkpoint
+from app.models.job import Job
+from app.models.student import Student
+from app.services.email_outbox_services import EmailOutboxService
+from app.services.email_send import email_service
+
+CHECKPOINT_NAME = 'application_status_digest'
+
+STATUS_LABELS = {
+    'pending': 'Pendente',
+    'analysis': 'Em análise',
+    'interview': 'Entrevista',
+    'accepted': 'Aprovado',
+    'rejected': 'Não selecionado',
+}
+
+
+class StatusDigestService:
+    @staticmethod
+    def coalesce(events):
+        """
+        Agrupar eventos por estudante, mantendo só o status final de cada candidatura
+
+        Candidaturas que voltaram ao status inicial dentro da janela são descartadas.
+
+        Returns:
+            OrderedDict {student_id: OrderedDict {application_id: (job_id, status_inicial, status_final)}}
+        """
+        digests = OrderedDict()
+        for event in events:
+            changes = digests.setdefault(event.student_id, OrderedDict())
+            first = changes.get(event.application_id)
+            old_status = first[1] if first else event.old_status
+            changes[event.application_id] = (event.job_id, old_status, event.new_status)
+
+        for student_id in list(digests):
+            changes = digests[student_id]
+            for application_id in [a for a, (_, old, new) in changes.items() if old == new]:
+                del changes[application_id]
+            if not changes:
+                del digests[student_id]
+        return digests
+
+    @staticmethod
+    def _item(jobs, job_id, status, cache):
+        """(html, texto) de uma mudança - renderizado uma vez por vaga+status na execução"""
+        key = (job_id, status)
+        if key not in cache:
+            job = jobs.get(job_id)
+            job_title = job.title if job else 'Vaga removida'
+            company_name = job.company.name if job and job.company else 'Empresa não informada'
+            status_label = STATUS_LABELS.get(status, status)
+            html = email_service.templates.render_fragment(
+                '_status_change_item', job_title=job_title, company_name=company_name, status_label=status_label
+            )
+            cache[key] = (html, f"- {job_title} ({company_name}): {status_label}\n")
+        return cache[key]
+
+    @staticmethod
+    def build_digests(window_seconds, settle_seconds=30, max_events=20000, now=None):
+        """
+        Transformar eventos de status em um email por estudante na outbox
+
+        Lê os eventos depois do checkpoint até o fim da última janela fechada
+        (janelas de `window_seconds` alinhadas ao relógio, com `settle_seconds`
+        de margem para transações ainda não commitadas), agrupa por estudante
+        e grava os emails e o novo checkpoint na mesma transação. Rodar mais
+        vezes que a janela não gera emails extras.
+
+        Returns:
+            dict com eventos lidos e emails gerados
+        """
+        now = now or datetime.utcnow()
+        settled = (now - timedelta(seconds=settle_seconds) - datetime(1970, 1, 1)).total_seconds()
+        window_end = datetime(1970, 1, 1) + timedelta(seconds=settled - settled % window_seconds)
+        checkpoint = Checkpoint.load(CHECKPOINT_NAME)
+        stats = {'events': 0, 'emails': 0}
+
+        events = (
+            ApplicationStatusEvent.query
+            .filter(
+                ApplicationStatusEvent.id > checkpoint.position,
+                ApplicationStatusEvent.created_at < window_end
+            )
+            .order_by(ApplicationStatusEvent.id)
+            .limit(max_events)
+            .all()
+        )
+        if not events:
+            db.session.commit()
+            return stats
+
+        digests = StatusDigestService.coalesce(events)
+        stats['events'] = len(events)
+
+        job_ids = {job_id for changes in digests.values() for job_id, _, _ in changes.values()}
+        jobs = {job.id: job for job in Job.query.options(joinedload(Job.company)).filter(Job.id.in_(job_ids))}
+        students = {student.id: student for student in Student.query.filter(
+            Student.id.in_(list(digests)), Student.is_active == True)}
+
+        template = email_service.templates.get('status_digest', ('user_name', 'changes_html', 'changes_text'))
+        fragments = {}
+        for student_id, changes in digests.items():
+            student = students.get(student_id)
+            if not student:
+                continue
+
+            items = [StatusDigestService._item(jobs, job_id, status, fragments)
+                     for job_id, _, status in changes.values()]
+
+            html_body, text_body = template.render(
+                user_name=student.name,
+                changes_html=Markup(''.join(html for html, _ in items)),
+                changes_text=''.join(text for _, text in items)
+            )
+            EmailOutboxService.enqueue(
+                student.email,
+                'YouthVagas - Atualizações das suas candidaturas',
+                html_body,
+                text_body,
+                dedupe_key=f'status_digest:{student_id}:{events[-1].id}'
+            )
+            stats['emails'] += 1
+
+        checkpoint.position = events[-1].id
+        db.session.commit()
+        return stats
@@ -1,5 +1,7 @@
 from app import db
 from app.models.student import Student
+from app.models.application import Application
+from app.services.account_services import AccountService
 from sqlalchemy.exc import IntegrityError
 
 class StudentService:
@@ -15,8 +17,8 @@ class StudentService:
         if not cpf:
             raise ValueError('CPF é obrigatório')
 
-        # Garantir unicidade do email
-        if Student.query.filter_by(email=email).first():
+        # Garantir unicidade do email entre estudantes e empresas
+        if not AccountService.is_email_available(email):
             raise ValueError('Email já cadastrado')
 
         # Garantir unicidade do CPF
@@ -33,7 +35,13 @@ class StudentService:
         
         db.session.add(student)
         try:
+            # Registrar no índice de contas na mesma transação
+            db.session.flush()
+            AccountService.register('student', student.id, student.email, student.phone)
             db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
         except IntegrityError:
             db.session.rollback()
             raise ValueError('Violação de unicidade: email ou cpf já cadastrados')
@@ -42,13 +50,25 @@ class StudentService:
     @staticmethod
     def get_all_students():
         try:
-            return Student.query.filter_by(is_active=True).all()
+            return Student.query.options(*StudentService._applications_loader())\
+                .filter_by(is_active=True).all()
         except Exception as e:
             raise Exception(f"Erro ao buscar estudantes: {str(e)}")
     
     @staticmethod
     def get_student_by_id(id):
         return Student.query.get(id)
+
+    @staticmethod
+    def _applications_loader():
+        # StudentSchema serializa applications e, em cada uma, a vaga: carregar tudo no mesmo SELECT
+        from sqlalchemy.orm import joinedload
+        return (joinedload(Student.applications).joinedload(Application.job),)
+
+    @staticmethod
+    def get_student_with_applications(id):
+        """Buscar estudante com candidaturas e vagas carregadas (para StudentSchema.dump)"""
+        return Student.query.options(*StudentService._applications_loader()).filter_by(id=id).first()
     
     @staticmethod
     def get_student_by_email(email):
@@ -82,17 +102,15 @@ class StudentService:
                 print('[STUDENT SERVICE] Updating password')
                 student.set_password(password)
         
-        # Validar unicidade de email e CPF se estão sendo alterados
-        if 'email' in data and data['email'] and data['email'] != student.email:
-            existing_email = Student.query.filter_by(email=data['email']).first()
-            if existing_email:
-                raise ValueError('Email já está em uso por outro estudante')
-        
+        # Validar unicidade do CPF se está sendo alterado (email é validado pelo índice de contas)
         if 'cpf' in data and data['cpf'] and data['cpf'] != student.cpf:
             existing_cpf = Student.query.filter_by(cpf=data['cpf']).first()
             if existing_cpf:
                 raise ValueError('CPF já está em uso por outro estudante')
         
+        # Valores antigos: o índice de contas só recusa duplicado no campo que mudou
+        previous_email, previous_phone = student.email, student.phone
+
         # Atualizar apenas campos permitidos
         updated_fields = []
         for key, value in data.items():
@@ -119,10 +137,16 @@ class StudentService:
         print(f'[STUDENT SERVICE] Updated fields: {updated_fields}')
         
         try:
+            # Manter o índice de contas em sincronia na mesma transação
+            AccountService.sync('student', student.id, student.email, student.phone,
+                                previous_email=previous_email, previous_phone=previous_phone)
             db.session.commit()
             print(f'[STUDENT SERVICE] Successfully updated student {id}')
             # Forçar refresh do objeto após commit
             db.session.refresh(student)
+        except ValueError:
+            db.session.rollback()
+            raise
         except IntegrityError as e:
             db.session.rollback()
             print(f'[STUDENT SERVICE] IntegrityError: {str(e)}')
@@ -149,5 +173,8 @@ class StudentService:
             db.session.commit()
             return student
         
+        from app.services.saved_job_services import SavedJobService
+        SavedJobService.delete_for_student(id)
+        AccountService.remove('student', id)
         db.session.delete(student)
         db.session.commit()
\ No newline at end of file
@@ -0,0 +1,135 @@
+from flask import current_app
+from app.services.scheduler import scheduler
+
+
+def cleanup_reset_codes():
+    """Apagar códigos de reset expirados em lotes"""
+    from app.models.reset_code import ResetCode
+    return ResetCode.cleanup_expired(batch_size=current_app.config['RESET_CODE_CLEANUP_BATCH_SIZE'])
+
+
+def cleanup_idempotency_keys():
+    """Apagar respostas guardadas por Idempotency-Key já expiradas"""
+    from app.models.idempotency_key import IdempotencyKey
+    return IdempotencyKey.cleanup_expired(batch_size=current_app.config['RESET_CODE_CLEANUP_BATCH_SIZE'])
+
+
+def send_weekly_jobs_newsletter(batch_size=None, max_seconds=None, manual=False):
+    """
+    Continuar/iniciar a newsletter semanal (cada execução roda no máximo NEWSLETTER_MAX_RUNTIME)
+
+    O comando `flask send-weekly-jobs` chama esta tarefa pelo scheduler
+    (manual=True), sob o mesmo lease da execução periódica.
+    """
+    from app.services.bulk_email import BulkEmailSender
+    from app.services.email_send import email_service
+    from app.services.newsletter_services import NewsletterService
+
+    config = current_app.config
+    if not config['NEWSLETTER_ENABLED'] and not manual:
+        return 'desabilitada'
+
+    with BulkEmailSender(email_service, pool_size=config['SMTP_POOL_SIZE'],
+                         rate_per_second=config['SMTP_RATE_LIMIT']) as sender:
+        return NewsletterService.send_weekly_jobs(
+            batch_size=batch_size or config['NEWSLETTER_BATCH_SIZE'],
+            max_seconds=max_seconds if manual else config['NEWSLETTER_MAX_RUNTIME'],
+            sender=sender
+        )
+
+
+def build_status_digests():
+    """Gerar na outbox os emails de resumo de mudanças de status"""
+    from app.services.status_digest_services import StatusDigestService
+
+    config = current_app.config
+    return StatusDigestService.build_digests(
+        window_seconds=config['STATUS_DIGEST_WINDOW'],
+        settle_seconds=config['STATUS_DIGEST_SETTLE_SECONDS']
+    )
+
+
+def drain_email_outbox():
+    """Enviar emails pendentes da outbox e apagar os já enviados há mais de EMAIL_OUTBOX_RETENTION_DAYS"""
+    from datetime import datetime, timedelta
+    from app.services.bulk_email import BulkEmailSender
+    from app.services.email_send import email_service
+    from app.services.email_outbox_services import EmailOutboxService
+
+    config = current_app.config
+    with BulkEmailSender(email_service, pool_size=config['SMTP_POOL_SIZE'],
+                         rate_per_second=config['SMTP_RATE_LIMIT']) as sender:
+        stats = EmailOutboxService.drain(
+            sender,
+            max_attempts=config['EMAIL_OUTBOX_MAX_ATTEMPTS'],
+            max_seconds=config['EMAIL_OUTBOX_MAX_RUNTIME'],
+            claim_timeout=config['EMAIL_OUTBOX_CLAIM_TIMEOUT']
+        )
+    stats['purged'] = EmailOutboxService.purge_sent(
+        datetime.utcnow() - timedelta(days=config['EMAIL_OUTBOX_RETENTION_DAYS'])
+    )
+    return stats
+
+
+def export_analytics():
+    """Exportar linhas novas das tabelas para Parquet (leitura dos analistas fora do MySQL)"""
+    from app.services.analytics_export_services import AnalyticsExportService
+
+    config = current_app.config
+    if not config['ANALYTICS_EXPORT_ENABLED']:
+        return 'desabilitada'
+    return AnalyticsExportService.export_all(
+        config['ANALYTICS_EXPORT_DIR'],
+        chunk_size=config['ANALYTICS_EXPORT_CHUNK_SIZE']
+    )
+
+
+def refresh_analytics_rollups():
+    """Atualizar os rollups do dashboard de analytics com as candidaturas e eventos novos"""
+    from app.services.analytics_rollup_services import AnalyticsRollupService
+    return AnalyticsRollupService.refresh(batch_size=current_app.config['ANALYTICS_ROLLUP_BATCH_SIZE'])
+
+
+def refresh_similar_jobs():
+    """Recalcular os vizinhos das vagas criadas/editadas/desativadas desde a última rodada"""
+    from app.services.similarity_services import SimilarityService
+    return SimilarityService.process_refresh_queue(
+        batch_size=current_app.config['SIMILAR_JOBS_REFRESH_BATCH_SIZE'],
+        limit=current_app.config['SIMILAR_JOBS_PER_JOB']
+    )
+
+
+def sample_queue_gauges():
+    """Gravar a profundidade da outbox de emails no store de métricas (uma contagem por minuto)"""
+    from app import db
+    from app.middleware.metrics import metrics
+    from app.models.email_outbox import EmailOutbox
+
+    counts = dict(
+        db.session.query(EmailOutbox.status, db.func.count(EmailOutbox.id))
+        .filter(EmailOutbox.status.in_(['pending', 'failed']))
+        .group_by(EmailOutbox.status)
+        .all()
+    )
+    db.session.commit()
+    metrics.gauge('email_outbox_pending', counts.get('pending', 0))
+    metrics.gauge('email_outbox_failed', counts.get('failed', 0))
+    metrics.flush()
+    return counts
+
+
+def register_tasks(app):
+    """Registrar tarefas periódicas e iniciar o scheduler (se SCHEDULER_ENABLED)"""
+    scheduler.register('cleanup_reset_codes', app.config['RESET_CODE_CLEANUP_INTERVAL'], cleanup_reset_codes)
+    scheduler.register('cleanup_idempotency_keys', app.config['IDEMPOTENCY_CLEANUP_INTERVAL'], cleanup_idempotency_keys)
+    # Verifica de hora em hora; a semana só é enviada uma vez (checkpoint em `checkpoints`)
+    scheduler.register('weekly_jobs_newsletter', app.config['NEWSLETTER_CHECK_INTERVAL'], send_weekly_jobs_newsletter,
+                       lease_seconds=app.config['NEWSLETTER_MAX_RUNTIME'] + app.config['SCHEDULER_LEASE_SECONDS'])
+    scheduler.register('status_digest', app.config['STATUS_DIGEST_INTERVAL'], build_status_digests)
+    scheduler.register('email_outbox', app.config['EMAIL_OUTBOX_INTERVAL'], drain_email_outbox)
+    scheduler.register('analytics_export', app.config['ANALYTICS_EXPORT_INTERVAL'], export_analytics)
+    scheduler.register('analytics_rollup', app.config['ANALYTICS_ROLLUP_INTERVAL'], refresh_analytics_rollups)
+    scheduler.register('similar_jobs_refresh', app.config['SIMILAR_JOBS_REFRESH_INTERVAL'], refresh_similar_jobs)
+    if app.config['METRICS_ENABLED']:
+        scheduler.register('metrics_gauges', app.config['METRICS_GAUGE_INTERVAL'], sample_queue_gauges)
+    scheduler.init_app(app)
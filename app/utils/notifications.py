@@ -2,7 +2,6 @@ import smtplib
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from twilio.rest import Client
 from flask import current_app
 import logging
 
@@ -61,33 +60,19 @@ class NotificationService:
     @staticmethod
     def send_sms(to_phone, message):
         """
-        Enviar SMS usando Twilio
+        Enviar SMS na hora usando o cliente Twilio compartilhado
         
         Args:
             to_phone: Número de telefone de destino
             message: Mensagem SMS
         """
+        from app.services.sms_dispatcher import sms_dispatcher
         try:
-            # Configurações Twilio do ambiente
-            account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
-            auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
-            from_phone = os.environ.get('TWILIO_PHONE_NUMBER')
-            
-            if not account_sid or not auth_token or not from_phone:
-                current_app.logger.warning("Twilio credentials not configured")
+            sid = sms_dispatcher.send_now(to_phone, message)
+            if not sid:
                 return False
             
-            # Criar cliente Twilio
-            client = Client(account_sid, auth_token)
-            
-            # Enviar SMS
-            message = client.messages.create(
-                body=message,
-                from_=from_phone,
-                to=to_phone
-            )
-            
-            current_app.logger.info(f"SMS sent successfully to {to_phone}, SID: {message.sid}")
+            current_app.logger.info(f"SMS sent successfully to {to_phone}, SID: {sid}")
             return True
             
         except Exception as e:
@@ -118,9 +103,11 @@ Equipe YouthSpace
     
     @staticmethod
     def send_reset_code_sms(phone, code):
-        """Enviar código de reset por SMS"""
+        """Enfileirar código de reset por SMS"""
+        from app.services.sms_dispatcher import sms_dispatcher
         message = f"YouthSpace: Seu código de redefinição de senha é {code}. Válido por 15 minutos."
-        return NotificationService.send_sms(phone, message)
+        # Só enfileira - o envio (com novas tentativas) acontece em segundo plano
+        return sms_dispatcher.enqueue(phone, message)
     
     @staticmethod
     def format_phone_number(phone):
@@ -133,15 +120,7 @@ Equipe YouthSpace
         Returns:
             Número formatado com +55 (Brasil)
         """
-        # Remove caracteres não numéricos
-        clean_phone = ''.join(filter(str.isdigit, phone))
-        
-        # Se não tem código do país, adiciona +55 (Brasil)
-        if len(clean_phone) == 11 and clean_phone.startswith('11'):
-            return f"+55{clean_phone}"
-        elif len(clean_phone) == 10:
-            return f"+55{clean_phone}"
-        elif len(clean_phone) == 13 and clean_phone.startswith('55'):
-            return f"+{clean_phone}"
-        else:
-            return f"+55{clean_phone}"
+        # Mesma normalização do índice de contas: aceita número já em E.164
+        # (+55 + fixo de 10 dígitos = 12 dígitos) sem prefixar o país de novo
+        from app.utils.phone_validator import PhoneValidator
+        return PhoneValidator.to_e164(phone)
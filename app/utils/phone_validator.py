@@ -54,3 +54,27 @@ class PhoneValidator:
             return f"({clean_phone[:2]}) {clean_phone[2:6]}-{clean_phone[6:]}"
         
         return phone
+    
+    @staticmethod
+    def to_e164(phone):
+        """
+        Normalizar telefone para o padrão E.164 (Brasil como padrão)
+        
+        Args:
+            phone: Número de telefone em qualquer formato
+            
+        Returns:
+            str: Número no formato +55DDNNNNNNNNN ou None se vazio
+        """
+        if not phone:
+            return None
+        
+        clean_phone = re.sub(r'\D', '', phone)
+        if not clean_phone:
+            return None
+        
+        # Já possui código do país
+        if len(clean_phone) in (12, 13) and clean_phone.startswith('55'):
+            return f"+{clean_phone}"
+        
+        return f"+55{clean_phone}"
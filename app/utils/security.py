@@ -1,10 +1,10 @@
 # utils/security.py
-import bcrypt
+from app.services.password_service import password_service
 
 def hash_password(password):
-    """EI VONLINDE AQUI É PRA IMPLEMENTAR AS API"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    """Gerar hash da senha (mesmo serviço usado pelos modelos)"""
+    return password_service.hash(password)
 
 def check_password(password, hashed):
-    """EI VONLINDE AQUI É PRA IMPLEMENTAR AS API"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
\ No newline at end of file
+    """Verificar senha contra o hash armazenado"""
+    return password_service.verify(hashed, password)
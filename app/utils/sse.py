@@ -0,0 +1,65 @@
+import json
+import time
+
+from flask import Response
+
+
+def format_event(data=None, event=None, event_id=None, retry=None, comment=None):
+    """Serializar um evento no formato text/event-stream"""
+    lines = []
+    if comment is not None:
+        lines.append(f': {comment}')
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event is not None:
+        lines.append(f'event: {event}')
+    if retry is not None:
+        lines.append(f'retry: {int(retry)}')
+    if data is not None:
+        payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        lines.extend(f'data: {line}' for line in payload.split('\n'))
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream_subscription(subscription, handle, heartbeat=15, max_seconds=600, first=()):
+    """
+    Gerador SSE a partir de uma inscrição no event_bus
+
+    Args:
+        subscription: Subscription do event_bus (fechada ao fim do stream)
+        handle: Função handle(tipo, dados) -> iterável de strings SSE para o evento
+        heartbeat: Segundos sem eventos até mandar um comentário de keep-alive
+        max_seconds: Duração máxima; o navegador reconecta sozinho (e reautentica)
+        first: Eventos já formatados enviados logo no início
+    """
+    try:
+        yield format_event(retry=3000, comment='connected')
+        for chunk in first:
+            yield chunk
+
+        deadline = time.monotonic() + max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if subscription.overflowed:
+                # Eventos perdidos: o cliente deve reconectar e recarregar o estado
+                yield format_event({'reason': 'overflow'}, event='resync')
+                return
+
+            item = subscription.get(timeout=min(heartbeat, remaining))
+            if item is None:
+                yield format_event(comment='ping')
+                continue
+            for chunk in handle(*item):
+                yield chunk
+    finally:
+        subscription.close()
+
+
+def sse_response(generator):
+    """Response de streaming com os headers que evitam buffer em proxies"""
+    return Response(generator, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
@@ -30,6 +30,12 @@ def validate_email(email):
     
     return True
 
+def normalize_email(email):
+    """Normalizar email para comparação (sem espaços, minúsculas)"""
+    if not email or not isinstance(email, str):
+        return None
+    return email.strip().lower()
+
 def validate_password_strength(password):
     """Validar força da senha com critérios de segurança"""
     if not password or not isinstance(password, str):
@@ -0,0 +1,289 @@
+"""
+Benchmark dos endpoints principais contra bancos SQLite com dados sintéticos
+
+    python benchmarks/endpoints.py run --sizes small,medium --output benchmarks/baseline.json
+    python benchmarks/endpoints.py run --output /tmp/current.json
+    python benchmarks/endpoints.py compare benchmarks/baseline.json /tmp/current.json --threshold 0.2
+
+Cada tamanho de dataset é gerado uma vez com o SeedService em
+instance/benchmarks/<tamanho>.db e copiado para um arquivo temporário a
+cada execução, então candidaturas criadas pelo benchmark não se acumulam.
+As requisições passam pelo test client do Flask (create_app('testing')),
+sem rede e sem MySQL.
+
+Por endpoint são gravados latência (média, p50, p95), consultas ao banco
+por requisição e pico de memória alocada (tracemalloc, medido em uma
+chamada extra fora das medições de tempo). O `compare` sai com código 1
+quando algum endpoint piorou além do limite.
+"""
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import click
+from sqlalchemy import event, func, select
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+DATASETS_DIR = BASE_DIR / 'instance' / 'benchmarks'
+PASSWORD = 'Senha@123'
+
+# Tamanhos dos datasets: (empresas, estudantes, vagas, candidaturas)
+SIZES = {
+    'small': (20, 500, 100, 2000),
+    'medium': (100, 5000, 1000, 50000),
+    'large': (500, 50000, 5000, 500000),
+}
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def dataset_path(size, reseed=False):
+    """Arquivo SQLite com o dataset do tamanho pedido, gerado na primeira vez"""
+    from app import create_app, db
+    from app.services.seed_services import SeedService
+
+    path = DATASETS_DIR / f'{size}.db'
+    if path.exists() and not reseed:
+        return path
+
+    DATASETS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.db.tmp')
+    tmp_path.unlink(missing_ok=True)
+    os.environ['TEST_DATABASE_URL'] = f'sqlite:///{tmp_path}'
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        companies, students, jobs, applications = SIZES[size]
+        stats = SeedService(seed=list(SIZES).index(size), password=PASSWORD).run(
+            companies, students, jobs, applications
+        )
+        db.engine.dispose()
+    os.replace(tmp_path, path)
+    click.echo(f"🌱 Dataset {size} gerado em {stats['seconds']}s")
+    return path
+
+
+def _csrf_headers(client, cookie):
+    return {'X-CSRF-TOKEN': client.get_cookie(cookie).value}
+
+
+def _measure(call, counter, iterations, warmup):
+    for _ in range(warmup):
+        call()
+
+    timings = []
+    counter.count = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    queries = counter.count / iterations
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        'min_ms': round(timings[0], 2),
+        'max_ms': round(timings[-1], 2),
+        'queries': round(queries, 1),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def _expect(response, status):
+    if response.status_code != status:
+        raise click.ClickException(
+            f'{response.request.method} {response.request.path}: esperado {status}, '
+            f'recebido {response.status_code} - {response.get_data(as_text=True)[:200]}'
+        )
+    return response
+
+
+def run_size(size, iterations, warmup, reseed=False):
+    """Executar todos os cenários contra uma cópia do dataset"""
+    from app import create_app, db
+    from app.models import Application, Company, Job, Student
+    from app.services.seed_services import SEED_EMAIL_DOMAIN, SeedService
+
+    source = dataset_path(size, reseed=reseed)
+    workdir = tempfile.mkdtemp(prefix='youthvagas-bench-')
+    try:
+        database = Path(workdir) / f'{size}.db'
+        shutil.copyfile(source, database)
+        os.environ['TEST_DATABASE_URL'] = f'sqlite:///{database}'
+        app = create_app('testing')
+
+        with app.app_context():
+            # Empresa com mais candidaturas (pior caso do feed) e um estudante novo para as candidaturas
+            company_id = db.session.execute(
+                select(Job.company_id).join(Application, Application.job_id == Job.id)
+                .group_by(Job.company_id).order_by(func.count().desc()).limit(1)
+            ).scalar()
+            student_id = db.session.execute(select(func.max(Application.student_id))).scalar()
+            SeedService(seed=0, password=PASSWORD).run(0, 1, 0, 0)
+            bench_student_id = db.session.execute(select(func.max(Student.id))).scalar()
+            job_ids = db.session.execute(
+                select(Job.id).where(Job.is_active.is_(True)).order_by(Job.id)
+            ).scalars().all()
+            company_email = db.session.get(Company, company_id).email
+
+            counter = QueryCounter(db.engine)
+            client = app.test_client()
+            student_login = {'email': f'aluno{student_id}@{SEED_EMAIL_DOMAIN}', 'password': PASSWORD}
+            _expect(client.post('/api/auth/login/student', json=student_login), 200)
+
+            apply_client = app.test_client()
+            _expect(apply_client.post('/api/auth/login/student', json={
+                'email': f'aluno{bench_student_id}@{SEED_EMAIL_DOMAIN}', 'password': PASSWORD
+            }), 200)
+            apply_jobs = iter(job_ids)
+
+            company_client = app.test_client()
+            _expect(company_client.post('/api/auth/login/company', json={
+                'email': company_email, 'password': PASSWORD
+            }), 200)
+
+            popular_job = db.session.execute(
+                select(Application.job_id).group_by(Application.job_id)
+                .order_by(func.count().desc()).limit(1)
+            ).scalar()
+            db.session.remove()
+
+            scenarios = {
+                'GET /api/jobs': lambda: _expect(client.get('/api/jobs'), 200),
+                'GET /api/jobs/<id>': lambda: _expect(client.get(f'/api/jobs/{popular_job}'), 200),
+                'POST /api/jobs/<id>/apply': lambda: _expect(apply_client.post(
+                    f'/api/jobs/{next(apply_jobs)}/apply', json={'cover_letter': 'Tenho interesse na vaga.'},
+                    headers=_csrf_headers(apply_client, 'csrf_access_token')
+                ), 201),
+                'GET /api/companies/applications': lambda: _expect(company_client.get('/api/companies/applications'), 200),
+                'POST /api/auth/login/student': lambda: _expect(client.post('/api/auth/login/student', json=student_login), 200),
+                'POST /api/auth/refresh': lambda: _expect(client.post(
+                    '/api/auth/refresh', headers=_csrf_headers(client, 'csrf_refresh_token')
+                ), 200),
+            }
+            if len(job_ids) < iterations + warmup + 2:
+                del scenarios['POST /api/jobs/<id>/apply']
+
+            results = {}
+            for name, call in scenarios.items():
+                # Uma chamada de verificação: endpoint quebrado falha o run (não some do resultado)
+                try:
+                    call()
+                except click.ClickException as e:
+                    raise click.ClickException(f'{size} {name}: {e.message}')
+                results[name] = _measure(call, counter, iterations, warmup)
+                click.echo(f"  {size:<7} {name:<36} p50 {results[name]['p50_ms']:>9.2f} ms  "
+                           f"{results[name]['queries']:>8.1f} consultas  {results[name]['peak_kb']:>9.1f} KiB")
+            db.engine.dispose()
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare_results(baseline, current, threshold=0.2, min_delta_ms=2.0):
+    """
+    Comparar dois arquivos de resultado
+
+    Latência (p50) e pico de memória pioram quando passam de `threshold`
+    (proporcional) e, na latência, também de `min_delta_ms`; consultas por
+    requisição pioram com qualquer aumento.
+
+    Returns:
+        lista de (tamanho, endpoint, métrica, antes, depois, piorou)
+    """
+    rows = []
+    for size, endpoints in current.get('results', {}).items():
+        for name, after in endpoints.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            rows.append((size, name, 'p50_ms', before['p50_ms'], after['p50_ms'],
+                         after['p50_ms'] > before['p50_ms'] * (1 + threshold)
+                         and after['p50_ms'] - before['p50_ms'] > min_delta_ms))
+            rows.append((size, name, 'queries', before['queries'], after['queries'],
+                         after['queries'] > before['queries'] + 0.5))
+            rows.append((size, name, 'peak_kb', before['peak_kb'], after['peak_kb'],
+                         after['peak_kb'] > before['peak_kb'] * (1 + threshold)))
+    return rows
+
+
+@click.group()
+def cli():
+    """Benchmark dos endpoints (SQLite + test client)"""
+
+
+@cli.command()
+@click.option('--sizes', default='small,medium', show_default=True, help=f"Datasets: {', '.join(SIZES)}")
+@click.option('--iterations', default=10, show_default=True, help='Requisições medidas por endpoint')
+@click.option('--warmup', default=2, show_default=True, help='Requisições descartadas antes de medir')
+@click.option('--output', default=str(BASE_DIR / 'benchmarks' / 'results.json'), show_default=True)
+@click.option('--reseed', is_flag=True, help='Gerar os datasets de novo')
+def run(sizes, iterations, warmup, output, reseed):
+    """Medir os endpoints e gravar o resultado em JSON"""
+    sizes = [size.strip() for size in sizes.split(',') if size.strip()]
+    for size in sizes:
+        if size not in SIZES:
+            raise click.BadParameter(f"tamanhos disponíveis: {', '.join(SIZES)}", param_hint='--sizes')
+
+    import sqlalchemy
+    report = {
+        'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'python': platform.python_version(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'platform': platform.platform(),
+        'results': {size: run_size(size, iterations, warmup, reseed=reseed) for size in sizes},
+    }
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+    click.echo(f'✅ Resultado gravado em {output}')
+
+
+@cli.command()
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False))
+@click.argument('current', type=click.Path(exists=True, dir_okay=False))
+@click.option('--threshold', default=0.2, show_default=True, help='Piora proporcional tolerada (0.2 = 20%)')
+@click.option('--min-delta-ms', default=2.0, show_default=True, help='Diferença de latência ignorada (ruído)')
+def compare(baseline, current, threshold, min_delta_ms):
+    """Comparar um resultado com o baseline; sai com código 1 se houver regressão"""
+    rows = compare_results(json.loads(Path(baseline).read_text()), json.loads(Path(current).read_text()),
+                           threshold=threshold, min_delta_ms=min_delta_ms)
+    regressions = 0
+    for size, name, metric, before, after, worse in rows:
+        change = f'{(after - before) / before:+.0%}' if before else 'n/a'
+        mark = '❌' if worse else '  '
+        click.echo(f'{mark} {size:<7} {name:<36} {metric:<8} {before:>10} → {after:<10} {change}')
+        regressions += worse
+    if regressions:
+        raise click.ClickException(f'{regressions} regressões acima do limite')
+    click.echo('✅ Sem regressões')
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,315 @@
+"""
+Teste de carga HTTP concorrente (aiohttp) contra um servidor já em execução
+
+    flask seed --companies 50 --students 2000 --jobs 500 --applications 20000
+    RATE_LIMIT_ENABLED=false gunicorn -w 4 -b 127.0.0.1:5000 run:app
+    python benchmarks/load_test.py --base-url http://127.0.0.1:5000 --users 50 --duration 60
+
+Todos os usuários virtuais saem do mesmo IP, e o servidor aceita só 20
+logins por IP por minuto (política 'login' do rate limiter). Com mais de 20
+usuários, suba o servidor com RATE_LIMIT_ENABLED=false ou espalhe os logins
+com --ramp-up >= 3 * --users. Usuário que não consegue logar (429, 401...)
+não gera carga: o relatório mostra quantos ficaram ativos, avisa os logins
+recusados por status e o script sai com código 1.
+
+Cada usuário virtual é um estudante ou uma empresa criados pelo `flask seed`
+(aluno<id>@... / empresa<id>@...), com sessão e cookies próprios: faz login,
+guarda os cookies JWT e envia o X-CSRF-TOKEN lido de csrf_access_token
+(ou csrf_refresh_token no refresh). Depois repete a mistura ponderada de
+ações até o fim do tempo.
+
+Ações de estudante: browse (GET /api/jobs), view (GET /api/jobs/<id>),
+apply (POST /api/jobs/<id>/apply); de empresa: triage (GET
+/api/companies/applications + PUT /api/applications/<id>/status); de ambos:
+refresh (POST /api/auth/refresh). O relatório traz vazão, p50/p95/p99 e
+taxa de erro por requisição; 4xx (ex.: candidatura repetida) aparecem
+separados dos erros (5xx, timeout, conexão).
+"""
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import aiohttp
+import click
+
+SEED_EMAIL_DOMAIN = 'seed.youthvagas.dev'
+DEFAULT_MIX = 'browse=40,view=30,apply=10,triage=15,refresh=5'
+STUDENT_ACTIONS = ('browse', 'view', 'apply', 'refresh')
+COMPANY_ACTIONS = ('triage', 'refresh')
+STATUSES = ('analysis', 'interview', 'accepted', 'rejected')
+# Política 'login' por IP do servidor (app/middleware/rate_limit.py)
+LOGIN_RATE_LIMIT = (20, 60)
+
+
+def percentile(sorted_values, q):
+    """Percentil por posição mais próxima de uma lista já ordenada"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def parse_mix(mix):
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in STUDENT_ACTIONS + COMPANY_ACTIONS:
+            raise click.BadParameter(f'ação desconhecida: {name}', param_hint='--mix')
+        try:
+            weights[name] = float(weight)
+        except ValueError:
+            raise click.BadParameter(f'peso inválido para {name}: {weight!r}', param_hint='--mix')
+    return weights
+
+
+class Stats:
+    """Latências e resultados por requisição (nome lógico, ex.: 'GET /api/jobs')"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.client_errors = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.users = 0
+        self.active_users = 0
+        self.login_failures = defaultdict(int)
+        self.started = None
+        self.finished = None
+
+    def record(self, name, status, seconds):
+        self.latencies[name].append(seconds * 1000)
+        if status is None or status >= 500:
+            self.errors[name] += 1
+        elif status >= 400:
+            self.client_errors[name] += 1
+
+    def record_login(self, status):
+        self.users += 1
+        if status == 200:
+            self.active_users += 1
+        else:
+            self.login_failures[status or 'erro'] += 1
+
+    def report(self):
+        elapsed = (self.finished or time.monotonic()) - self.started
+        rows = {}
+        for name, values in sorted(self.latencies.items()):
+            values.sort()
+            rows[name] = {
+                'requests': len(values),
+                'rps': round(len(values) / elapsed, 2),
+                'p50_ms': round(percentile(values, 0.50), 1),
+                'p95_ms': round(percentile(values, 0.95), 1),
+                'p99_ms': round(percentile(values, 0.99), 1),
+                'client_errors': self.client_errors[name],
+                'errors': self.errors[name],
+                'error_rate': round(self.errors[name] / len(values), 4),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        everything = sorted(value for values in self.latencies.values() for value in values)
+        return {
+            'seconds': round(elapsed, 1),
+            'requests': total,
+            'rps': round(total / elapsed, 2) if elapsed else 0,
+            'p50_ms': round(percentile(everything, 0.50) or 0, 1),
+            'p95_ms': round(percentile(everything, 0.95) or 0, 1),
+            'p99_ms': round(percentile(everything, 0.99) or 0, 1),
+            'error_rate': round(sum(self.errors.values()) / total, 4) if total else 0,
+            'users': {
+                'started': self.users,
+                'active': self.active_users,
+                'login_failed': {str(status): count for status, count in self.login_failures.items()},
+            },
+            'endpoints': rows,
+        }
+
+
+class VirtualUser:
+    def __init__(self, base_url, role, email, password, weights, stats, timeout, rng):
+        self.base_url = base_url.rstrip('/')
+        self.role = role
+        self.email = email
+        self.password = password
+        self.stats = stats
+        self.rng = rng
+        actions = STUDENT_ACTIONS if role == 'student' else COMPANY_ACTIONS
+        self.actions = [action for action in actions if weights.get(action)]
+        self.weights = [weights[action] for action in self.actions]
+        self.job_ids = []
+        self.application_ids = []
+        # unsafe=True: aceitar cookies de hosts por IP (127.0.0.1)
+        self.session = aiohttp.ClientSession(
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        )
+
+    def _csrf(self, cookie='csrf_access_token'):
+        for morsel in self.session.cookie_jar:
+            if morsel.key == cookie:
+                return {'X-CSRF-TOKEN': morsel.value}
+        return {}
+
+    async def request(self, method, path, name=None, **kwargs):
+        """Executar e registrar uma requisição; devolve (status, JSON ou None)"""
+        started = time.monotonic()
+        status, body = None, None
+        try:
+            async with self.session.request(method, self.base_url + path, **kwargs) as response:
+                status = response.status
+                if response.content_type == 'application/json':
+                    body = await response.json()
+                else:
+                    await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        self.stats.record(name or f'{method} {path}', status, time.monotonic() - started)
+        return status, body
+
+    async def login(self):
+        status, _ = await self.request(
+            'POST', f'/api/auth/login/{self.role}', json={'email': self.email, 'password': self.password}
+        )
+        self.stats.record_login(status)
+        return status == 200
+
+    async def browse(self):
+        status, body = await self.request('GET', '/api/jobs')
+        if status == 200 and isinstance(body, list):
+            self.job_ids = [job['id'] for job in body]
+
+    async def view(self):
+        if not self.job_ids:
+            return await self.browse()
+        await self.request('GET', f'/api/jobs/{self.rng.choice(self.job_ids)}', name='GET /api/jobs/<id>')
+
+    async def apply(self):
+        if not self.job_ids:
+            return await self.browse()
+        await self.request(
+            'POST', f'/api/jobs/{self.rng.choice(self.job_ids)}/apply', name='POST /api/jobs/<id>/apply',
+            json={'cover_letter': 'Tenho interesse na vaga.'},
+            headers={**self._csrf(), 'Idempotency-Key': str(uuid.uuid4())}
+        )
+
+    async def triage(self):
+        status, body = await self.request('GET', '/api/companies/applications')
+        if status == 200 and isinstance(body, list):
+            self.application_ids = [application['id'] for application in body]
+        if self.application_ids:
+            await self.request(
+                'PUT', f'/api/applications/{self.rng.choice(self.application_ids)}/status',
+                name='PUT /api/applications/<id>/status',
+                json={'status': self.rng.choice(STATUSES)}, headers=self._csrf()
+            )
+
+    async def refresh(self):
+        await self.request('POST', '/api/auth/refresh', headers=self._csrf('csrf_refresh_token'))
+
+    async def run(self, deadline, think_time):
+        try:
+            if not await self.login() or not self.actions:
+                return
+            while time.monotonic() < deadline:
+                action = self.rng.choices(self.actions, weights=self.weights)[0]
+                await getattr(self, action)()
+                if think_time:
+                    await asyncio.sleep(self.rng.uniform(0, think_time))
+        finally:
+            await self.session.close()
+
+
+async def run_load(base_url, users, duration, ramp_up, company_ratio, first_student_id, students,
+                   first_company_id, companies, password, weights, think_time, timeout, seed):
+    rng = random.Random(seed)
+    stats = Stats()
+    stats.started = time.monotonic()
+    deadline = stats.started + ramp_up + duration
+
+    tasks = []
+    for index in range(users):
+        if companies and rng.random() < company_ratio:
+            role, email = 'company', f'empresa{first_company_id + rng.randrange(companies)}@{SEED_EMAIL_DOMAIN}'
+        else:
+            role, email = 'student', f'aluno{first_student_id + rng.randrange(students)}@{SEED_EMAIL_DOMAIN}'
+        user = VirtualUser(base_url, role, email, password, weights, stats, timeout, random.Random(rng.random()))
+        tasks.append(asyncio.create_task(user.run(deadline, think_time)))
+        if ramp_up:
+            await asyncio.sleep(ramp_up / users)
+
+    await asyncio.gather(*tasks)
+    stats.finished = time.monotonic()
+    return stats.report()
+
+
+def login_limit_warning(users, ramp_up):
+    """Aviso quando os logins do ramp-up vão estourar o limite por IP do servidor"""
+    limit, window = LOGIN_RATE_LIMIT
+    if users <= limit or ramp_up >= users * window / limit:
+        return None
+    return (f'⚠️  {users} logins em {ramp_up}s passam do limite do servidor ({limit} por IP a cada {window}s): '
+            f'rode o servidor com RATE_LIMIT_ENABLED=false ou use --ramp-up {math.ceil(users * window / limit)}')
+
+
+def print_report(report):
+    click.echo(f"\n{'requisição':<42} {'total':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'4xx':>6} {'erros':>6}")
+    for name, row in report['endpoints'].items():
+        click.echo(f"{name:<42} {row['requests']:>7} {row['rps']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+                   f"{row['p99_ms']:>8} {row['client_errors']:>6} {row['errors']:>6}")
+    click.echo(f"\n📊 {report['requests']} requisições em {report['seconds']}s: {report['rps']} req/s, "
+               f"p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, p99 {report['p99_ms']} ms, "
+               f"erros {report['error_rate']:.2%}")
+    users = report['users']
+    click.echo(f"👥 {users['active']}/{users['started']} usuários ativos")
+    if users['login_failed']:
+        failed = ', '.join(f'{status}: {count}' for status, count in sorted(users['login_failed'].items()))
+        click.echo(f"\n⚠️  {users['started'] - users['active']} usuários não conseguiram logar ({failed}) "
+                   f"e não geraram carga - os números acima subestimam a concorrência pedida.", err=True)
+        if '429' in users['login_failed']:
+            click.echo('⚠️  429 = limite de login por IP do servidor: rode o servidor com '
+                       'RATE_LIMIT_ENABLED=false ou aumente --ramp-up.', err=True)
+
+
+@click.command()
+@click.option('--base-url', default='http://127.0.0.1:5000', show_default=True)
+@click.option('--users', default=20, show_default=True, help='Usuários virtuais simultâneos')
+@click.option('--duration', default=60, show_default=True, help='Segundos de carga depois do ramp-up')
+@click.option('--ramp-up', default=10, show_default=True, help='Segundos para iniciar todos os usuários')
+@click.option('--company-ratio', default=0.1, show_default=True, help='Fração de usuários que são empresas')
+@click.option('--first-student-id', default=1, show_default=True)
+@click.option('--students', default=1000, show_default=True, help='Estudantes do seed sorteados para login')
+@click.option('--first-company-id', default=1, show_default=True)
+@click.option('--companies', default=50, show_default=True, help='Empresas do seed sorteadas para login')
+@click.option('--password', default='Senha@123', show_default=True)
+@click.option('--mix', default=DEFAULT_MIX, show_default=True, help='Pesos das ações')
+@click.option('--think-time', default=0.0, show_default=True, help='Pausa aleatória máxima entre ações (s)')
+@click.option('--timeout', default=30.0, show_default=True, help='Timeout por requisição (s)')
+@click.option('--seed', 'random_seed', default=None, type=int, help='Semente do sorteio de usuários e ações')
+@click.option('--output', default=None, help='Gravar o relatório em JSON')
+def main(base_url, users, duration, ramp_up, company_ratio, first_student_id, students, first_company_id,
+         companies, password, mix, think_time, timeout, random_seed, output):
+    """Gerar carga HTTP com estudantes e empresas logados"""
+    weights = parse_mix(mix)
+    warning = login_limit_warning(users, ramp_up)
+    if warning:
+        click.echo(warning, err=True)
+    click.echo(f'🚀 {users} usuários contra {base_url} por {ramp_up}+{duration}s ({mix})')
+    report = asyncio.run(run_load(
+        base_url, users, duration, ramp_up, company_ratio, first_student_id, students,
+        first_company_id, companies, password, weights, think_time, timeout, random_seed
+    ))
+    report['config'] = {'base_url': base_url, 'users': users, 'duration': duration, 'mix': weights}
+    print_report(report)
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+        click.echo(f'✅ Relatório gravado em {output}')
+    if report['users']['login_failed']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Dashboard interno de operação
+
+    streamlit run dashboards/ops.py
+
+Lê só o store de métricas (METRICS_STORAGE, SQLite local gravado pelos
+workers) e as tabelas de rollup (job_daily_stats / job_response_stats).
+Nenhuma consulta toca applications, jobs ou students, então acompanhar o
+sistema não gera carga no banco da aplicação. Para ler os rollups de uma
+réplica, defina OPS_DATABASE_URL.
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from sqlalchemy import create_engine, text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.middleware.metrics import MetricsStore  # noqa: E402
+
+METRICS_STORAGE = os.environ.get('METRICS_STORAGE', str(BASE_DIR / 'instance' / 'metrics.db'))
+REFRESH_SECONDS = 30
+
+
+def database_url():
+    url = os.environ.get('OPS_DATABASE_URL') or os.environ.get('DATABASE_URL')
+    if not url or os.environ.get('USE_MYSQL', 'true').lower() != 'true':
+        return f"sqlite:///{BASE_DIR / 'instance' / 'app.db'}"
+    return url.replace('mysql://', 'mysql+pymysql://', 1)
+
+
+@st.cache_resource
+def metrics_store():
+    return MetricsStore(METRICS_STORAGE)
+
+
+@st.cache_resource
+def rollup_engine():
+    url = database_url()
+    if url.startswith('sqlite'):
+        return create_engine(url)
+    return create_engine(url, pool_size=1, max_overflow=0, pool_pre_ping=True)
+
+
+@st.cache_data(ttl=REFRESH_SECONDS)
+def load_routes(window_minutes):
+    return pd.DataFrame(metrics_store().route_summary(time.time() - window_minutes * 60))
+
+
+@st.cache_data(ttl=REFRESH_SECONDS)
+def load_request_series(window_minutes):
+    rows = metrics_store().request_series(time.time() - window_minutes * 60)
+    frame = pd.DataFrame(rows, columns=['ts', 'requisições', 'erros'])
+    frame['ts'] = pd.to_datetime(frame['ts'], unit='s')
+    return frame
+
+
+@st.cache_data(ttl=REFRESH_SECONDS)
+def load_gauges(window_minutes):
+    rows = metrics_store().gauge_series(time.time() - window_minutes * 60)
+    frame = pd.DataFrame(rows, columns=['ts', 'name', 'pid', 'value'])
+    frame['ts'] = pd.to_datetime(frame['ts'], unit='s')
+    return frame
+
+
+@st.cache_data(ttl=300)
+def load_rollups(days):
+    since = date.today() - timedelta(days=days - 1)
+    with rollup_engine().connect() as conn:
+        daily = pd.read_sql(text(
+            'SELECT day, SUM(applications) AS applications, SUM(analysis) AS analysis, '
+            'SUM(interview) AS interview, SUM(accepted) AS accepted, SUM(rejected) AS rejected '
+            'FROM job_daily_stats WHERE day >= :since GROUP BY day ORDER BY day'
+        ), conn, params={'since': since})
+        response = pd.read_sql(text(
+            'SELECT SUM(responded) AS responded, SUM(total_response_seconds) AS seconds FROM job_response_stats'
+        ), conn)
+    return daily, response
+
+
+def latest_gauges(gauges):
+    """Último valor de cada gauge por processo, somado entre os processos ativos"""
+    if gauges.empty:
+        return {}
+    recent = gauges[gauges['ts'] >= gauges['ts'].max() - pd.Timedelta(minutes=2)]
+    latest = recent.sort_values('ts').groupby(['name', 'pid']).last().reset_index()
+    return latest.groupby('name')['value'].sum().to_dict()
+
+
+st.set_page_config(page_title='YouthVagas - Operação', layout='wide')
+st.title('YouthVagas - Operação')
+
+window = st.sidebar.selectbox('Janela', [15, 60, 360, 1440], index=1, format_func=lambda m: f'{m} min')
+days = st.sidebar.slider('Dias de rollup', 7, 90, 30)
+if st.sidebar.button('Atualizar'):
+    st.cache_data.clear()
+
+gauges = load_gauges(window)
+current = latest_gauges(gauges)
+
+cols = st.columns(5)
+pool_size = current.get('db_pool_size') or 0
+checked_out = current.get('db_pool_checked_out', 0)
+cols[0].metric('Pool em uso', f'{checked_out:.0f} / {pool_size:.0f}',
+               f'{checked_out / pool_size:.0%} saturação' if pool_size else None)
+cols[1].metric('Overflow do pool', f"{current.get('db_pool_overflow', 0):.0f}")
+cols[2].metric('Outbox pendente', f"{current.get('email_outbox_pending', 0):.0f}",
+               f"{current.get('email_outbox_failed', 0):.0f} falhas", delta_color='inverse')
+cols[3].metric('Fila de SMS', f"{current.get('sms_queue_depth', 0):.0f}")
+cols[4].metric('Canais SSE', f"{current.get('sse_channels', 0):.0f}")
+
+st.subheader('Latência e consultas por rota')
+routes = load_routes(window)
+if routes.empty:
+    st.info('Sem requisições registradas na janela (METRICS_ENABLED=true nos workers?)')
+else:
+    st.dataframe(
+        routes[['method', 'route', 'requests', 'errors', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms',
+                'max_ms', 'avg_queries', 'max_queries']],
+        use_container_width=True, hide_index=True
+    )
+    top = routes.head(15)
+    st.plotly_chart(px.bar(top, x='route', y=['p50_ms', 'p95_ms', 'p99_ms'], barmode='group',
+                           title='Percentis de latência (ms) - rotas mais acessadas'), use_container_width=True)
+    st.plotly_chart(px.bar(top.sort_values('avg_queries', ascending=False), x='route', y='avg_queries',
+                           title='Consultas ao banco por requisição'), use_container_width=True)
+
+series = load_request_series(window)
+if not series.empty:
+    st.plotly_chart(px.line(series, x='ts', y=['requisições', 'erros'], title='Requisições por minuto'),
+                    use_container_width=True)
+
+if not gauges.empty:
+    per_name = gauges.groupby(['ts', 'name'])['value'].sum().reset_index()
+    st.plotly_chart(px.line(per_name, x='ts', y='value', color='name', title='Gauges'),
+                    use_container_width=True)
+
+st.subheader('Negócio (rollups)')
+daily, response = load_rollups(days)
+if daily.empty:
+    st.info('Rollups vazios - a tarefa analytics_rollup já rodou?')
+else:
+    funnel = daily[['applications', 'analysis', 'interview', 'accepted', 'rejected']].sum()
+    left, right = st.columns(2)
+    left.plotly_chart(px.line(daily, x='day', y='applications', title='Candidaturas por dia'),
+                      use_container_width=True)
+    right.plotly_chart(px.funnel(x=funnel.values, y=funnel.index, title='Funil de status'),
+                       use_container_width=True)
+responded = response['responded'].iloc[0] if not response.empty else None
+if responded:
+    st.metric('Tempo médio até a primeira resposta', f"{response['seconds'].iloc[0] / responded / 3600:.1f} h")
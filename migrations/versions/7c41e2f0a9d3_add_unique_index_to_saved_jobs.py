@@ -0,0 +1,39 @@
+"""Add unique (student_id, job_id) index to saved_jobs
+
+Revision ID: 7c41e2f0a9d3
+Revises: 3a9d1c7e5b20
+Create Date: 2026-10-19 10:04:17.552910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c41e2f0a9d3'
+down_revision = '3a9d1c7e5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remover registros órfãos e duplicados antes de criar a restrição única
+    op.execute("DELETE FROM saved_jobs WHERE student_id IS NULL OR job_id IS NULL")
+    op.execute(
+        "DELETE FROM saved_jobs WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM saved_jobs GROUP BY student_id, job_id) AS keep_rows)"
+    )
+
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.alter_column('student_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('job_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_unique_constraint('uq_saved_jobs_student_job', ['student_id', 'job_id'])
+        batch_op.create_index(batch_op.f('ix_saved_jobs_job_id'), ['job_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_saved_jobs_job_id'))
+        batch_op.drop_constraint('uq_saved_jobs_student_job', type_='unique')
+        batch_op.alter_column('job_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('student_id', existing_type=sa.Integer(), nullable=True)
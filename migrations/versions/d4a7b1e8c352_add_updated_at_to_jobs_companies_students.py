@@ -0,0 +1,40 @@
+"""Add updated_at to jobs, companies and students (analytics export watermark)
+
+Revision ID: d4a7b1e8c352
+Revises: a6c3e9d2f481
+Create Date: 2026-10-19 19:05:48.671290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7b1e8c352'
+down_revision = 'a6c3e9d2f481'
+branch_labels = None
+depends_on = None
+
+TABLES = ('jobs', 'companies', 'students')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+        # Linhas existentes: última alteração desconhecida, usar a criação
+        op.execute(sa.text(
+            f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL"
+        ))
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+            batch_op.create_index(batch_op.f(f'ix_{table}_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_updated_at'))
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,110 @@
+# tests/conftest.py
+"""
+Fixtures compartilhadas dos testes
+
+- `app`: create_app('testing') uma vez por sessão, com SQLite em memória
+  (TEST_DATABASE_URL para outro banco) e o schema criado a partir dos modelos.
+- `db_session`: cada teste roda dentro de uma transação aberta na conexão
+  do engine; os commits do código viram SAVEPOINTs e tudo é desfeito no fim.
+- `db_scope`: abre escopos iguais ao de `db_session` dentro de um mesmo teste
+  (ex.: conferir num segundo escopo que o primeiro foi desfeito).
+- `client`: test client do Flask usando a mesma transação do teste.
+- `factory`: helpers de tests/factories.py (create_student, create_company, create_job,
+  create_application).
+
+Cada processo do pytest-xdist tem seu próprio banco em memória.
+Os testes de tests/test_mysql*.py acessam o MySQL remoto e só são coletados
+com RUN_MYSQL_TESTS=1.
+"""
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+import factories
+
+os.environ.setdefault('TEST_DATABASE_URL', 'sqlite://')
+
+collect_ignore = ['test.auth.py']
+if os.environ.get('RUN_MYSQL_TESTS') != '1':
+    collect_ignore += ['test_mysql.py', 'test_mysql_connection.py']
+
+
+def _enable_sqlite_savepoints(engine):
+    # pysqlite abre/fecha transações por conta própria e quebra SAVEPOINT;
+    # o BEGIN passa a ser emitido pelo SQLAlchemy
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+    # Em memória (StaticPool) a conexão já foi aberta pelo create_app
+    with engine.connect() as connection:
+        connection.connection.dbapi_connection.isolation_level = None
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app, db
+    from app.services.password_service import password_service
+
+    app = create_app('testing')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Hash barato nos testes: o scrypt de produção levaria ~100ms por senha
+        monkeypatch.setattr(password_service, 'method', 'pbkdf2:sha256:1000')
+        with app.app_context():
+            if db.engine.dialect.name == 'sqlite':
+                _enable_sqlite_savepoints(db.engine)
+            db.create_all()
+        yield app
+
+
+@contextmanager
+def _rolled_back_session(app):
+    from app import db
+
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        original = db.session
+        db.session = scoped_session(sessionmaker(bind=connection, join_transaction_mode='create_savepoint'))
+        try:
+            yield db.session
+        finally:
+            db.session.remove()
+            db.session = original
+            transaction.rollback()
+            connection.close()
+
+
+@pytest.fixture
+def db_session(app):
+    with _rolled_back_session(app) as session:
+        yield session
+
+
+@pytest.fixture
+def db_scope(app):
+    return lambda: _rolled_back_session(app)
+
+
+@pytest.fixture(scope='module')
+def module_db_session(app):
+    """Uma transação para o módulo inteiro (dados caros de montar, compartilhados entre os testes)"""
+    with _rolled_back_session(app) as session:
+        yield session
+
+
+@pytest.fixture
+def client(app, db_session):
+    return app.test_client()
+
+
+@pytest.fixture
+def factory(db_session):
+    return factories
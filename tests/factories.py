@@ -0,0 +1,104 @@
+# tests/factories.py
+"""
+Criação de modelos válidos para os testes (usar com a fixture `db_session`)
+
+Cada helper aceita os campos do modelo como keyword arguments, preenche o
+resto com valores únicos e válidos, faz flush e devolve o objeto com id.
+"""
+import itertools
+
+from app import db
+from app.models import Account, Application, Company, Job, Student
+from app.services.seed_services import make_cnpj, make_cpf
+from app.utils.phone_validator import PhoneValidator
+
+PASSWORD = 'Senha@123'
+
+_sequence = itertools.count(1)
+_password_hashes = {}
+
+
+def _password(password):
+    from app.services.password_service import password_service
+
+    if password not in _password_hashes:
+        _password_hashes[password] = password_service.hash(password)
+    return _password_hashes[password]
+
+
+def _phone(n):
+    return PhoneValidator.format_phone(f'119{n:08d}')
+
+
+def _register(user_type, user):
+    db.session.add(Account(
+        email=user.email.lower(), phone=PhoneValidator.to_e164(user.phone), user_type=user_type, user_id=user.id
+    ))
+
+
+def create_student(password=PASSWORD, **fields):
+    n = next(_sequence)
+    values = {
+        'name': f'Estudante {n}',
+        'email': f'estudante{n}@teste.com',
+        'phone': _phone(n),
+        'cpf': make_cpf(100000000 + n),
+        'city': 'São Paulo, SP',
+        'skills': 'Python, SQL',
+    }
+    values.update(fields)
+    obj = Student(password=_password(password), **values)
+    db.session.add(obj)
+    db.session.flush()
+    _register('student', obj)
+    db.session.flush()
+    return obj
+
+
+def create_company(password=PASSWORD, **fields):
+    n = next(_sequence)
+    values = {
+        'name': f'Empresa {n}',
+        'email': f'empresa{n}@teste.com',
+        'phone': _phone(n),
+        'cnpj': make_cnpj(10000000 + n),
+        'city': 'São Paulo, SP',
+    }
+    values.update(fields)
+    obj = Company(password=_password(password), **values)
+    db.session.add(obj)
+    db.session.flush()
+    _register('company', obj)
+    db.session.flush()
+    return obj
+
+
+def create_job(company=None, **fields):
+    n = next(_sequence)
+    values = {
+        'title': f'Vaga {n}',
+        'description': 'Descrição da vaga',
+        'location': 'São Paulo, SP',
+        'skills': 'Python, SQL',
+        'is_active': True,
+    }
+    values.update(fields)
+    if 'company_id' not in values:
+        values['company_id'] = (company or create_company()).id
+    obj = Job(**values)
+    db.session.add(obj)
+    db.session.flush()
+    return obj
+
+
+def create_application(job=None, student=None, **fields):
+    values = {'status': 'pending'}
+    values.update(fields)
+    if 'job_id' not in values:
+        values['job_id'] = (job or create_job()).id
+    if 'student_id' not in values:
+        values['student_id'] = (student or create_student()).id
+    obj = Application(**values)
+    db.session.add(obj)
+    db.session.flush()
+    return obj
@@ -0,0 +1,98 @@
+# tests/test_accounts.py
+import pytest
+
+from app import db
+from app.models import Account
+from app.services.account_services import AccountService
+from app.services.company_services import CompanyService
+from app.services.student_service import StudentService
+from app.utils.notifications import NotificationService
+from app.utils.phone_validator import PhoneValidator
+
+
+def _account(user_type, user):
+    return Account.query.filter_by(user_type=user_type, user_id=user.id).first()
+
+
+def _legacy_duplicate(factory, email):
+    """Empresa que o backfill deixou fora do índice (email já usado por um estudante)"""
+    company = factory.create_company()
+    Account.query.filter_by(user_type='company', user_id=company.id).delete()
+    company.email = email
+    db.session.commit()
+    return company
+
+
+def test_register_normalizes_and_rejects_duplicates(factory):
+    student = factory.create_student()
+    account = _account('student', student)
+    assert account.email == student.email
+    assert account.phone == PhoneValidator.to_e164(student.phone)
+
+    with pytest.raises(ValueError, match='Email já cadastrado'):
+        AccountService.register('company', 999, student.email.upper(), '(21) 98888-7777')
+    with pytest.raises(ValueError, match='Telefone já cadastrado'):
+        AccountService.register('company', 999, 'outro@teste.com', student.phone)
+
+
+def test_resolve_user(factory):
+    student = factory.create_student()
+    company = factory.create_company()
+
+    assert AccountService.resolve_user(email=student.email.upper()) == ('student', student)
+    assert AccountService.resolve_user(phone=company.phone) == ('company', company)
+    assert AccountService.resolve_user(email=student.email, user_type='company') == (None, None)
+    assert AccountService.resolve_user(email='ninguem@teste.com') == (None, None)
+
+    student.is_active = False
+    assert AccountService.resolve_user(email=student.email) == (None, None)
+    assert AccountService.resolve_user(email=student.email, active_only=False) == ('student', student)
+
+
+def test_sync_updates_account_and_rejects_taken_values(factory):
+    student, other = factory.create_student(), factory.create_company()
+
+    StudentService.update_student(student.id, {'email': 'Novo@Teste.com', 'phone': '(21) 3222-1234'})
+    account = _account('student', student)
+    assert (account.email, account.phone) == ('novo@teste.com', '+552132221234')
+
+    with pytest.raises(ValueError, match='Email já cadastrado'):
+        StudentService.update_student(student.id, {'email': other.email})
+    with pytest.raises(ValueError, match='Telefone já cadastrado'):
+        StudentService.update_student(student.id, {'phone': other.phone})
+
+
+def test_legacy_duplicate_email_can_still_update_profile(factory):
+    student = factory.create_student()
+    company = _legacy_duplicate(factory, student.email.upper())
+
+    CompanyService.update_company(company.id, {'name': 'Nome Novo'})
+    assert db.session.get(type(company), company.id).name == 'Nome Novo'
+    assert _account('company', company) is None
+
+    # Trocando para um email livre, a conta entra no índice
+    CompanyService.update_company(company.id, {'email': 'livre@teste.com'})
+    assert _account('company', company).email == 'livre@teste.com'
+    assert AccountService.resolve_user(email='livre@teste.com') == ('company', company)
+
+
+def test_legacy_duplicate_phone_can_still_update_profile(factory):
+    student, other = factory.create_student(), factory.create_student()
+    _account('student', other).phone = None  # como o backfill grava telefone duplicado
+    other.phone = student.phone
+    db.session.commit()
+
+    StudentService.update_student(other.id, {'city': 'Recife, PE'})
+    assert _account('student', other).phone is None
+
+    StudentService.update_student(other.id, {'phone': '(81) 99876-5432'})
+    assert _account('student', other).phone == '+5581998765432'
+    assert AccountService.resolve_user(phone='(81) 99876-5432') == ('student', other)
+
+
+def test_landline_is_not_prefixed_twice():
+    e164 = PhoneValidator.to_e164('(11) 3222-1234')
+    assert e164 == '+551132221234'
+    assert PhoneValidator.to_e164(e164) == e164
+    assert NotificationService.format_phone_number(e164) == e164
+    assert NotificationService.format_phone_number('(11) 99999-0000') == '+5511999990000'
@@ -0,0 +1,79 @@
+# tests/test_analytics_rollup.py
+import unittest
+from datetime import datetime, timedelta
+from flask import Flask
+from app import db
+from app.models import Company, Job, Student, Application, ApplicationStatusEvent
+from app.services.analytics_rollup_services import AnalyticsRollupService
+
+NOW = datetime(2026, 10, 19, 12)
+
+class TestAnalyticsRollup(unittest.TestCase):
+    """Testes dos rollups do dashboard de analytics"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+        db.init_app(self.app)
+        with self.app.app_context():
+            db.create_all()
+            company = Company(name='Acme', email='c@x.com', phone='1', cnpj='1', password='x')
+            db.session.add(company)
+            db.session.flush()
+            job = Job(title='Dev', description='d', location='SP', company_id=company.id)
+            db.session.add(job)
+            db.session.flush()
+            self.company_id, self.job_id = company.id, job.id
+            for i in range(3):
+                student = Student(name=f'Aluno {i}', email=f's{i}@x.com', phone='1', cpf=str(i), password='x')
+                db.session.add(student)
+                db.session.flush()
+                application = Application(job_id=job.id, student_id=student.id, created_at=NOW - timedelta(days=2))
+                db.session.add(application)
+                db.session.flush()
+                self.add_event(application, 'pending', 'analysis', NOW - timedelta(days=2) + timedelta(hours=2 * (i + 1)))
+            db.session.commit()
+
+    def add_event(self, application, old_status, new_status, created_at):
+        db.session.add(ApplicationStatusEvent(
+            application_id=application.id, student_id=application.student_id, job_id=application.job_id,
+            old_status=old_status, new_status=new_status, created_at=created_at
+        ))
+
+    def test_refresh_is_incremental(self):
+        with self.app.app_context():
+            self.assertEqual(AnalyticsRollupService.refresh(batch_size=2, now=NOW),
+                             {'applications': 3, 'status_events': 3})
+
+            application = Application.query.first()
+            self.add_event(application, 'analysis', 'interview', NOW - timedelta(hours=1))
+            db.session.commit()
+            self.assertEqual(AnalyticsRollupService.refresh(now=NOW), {'applications': 0, 'status_events': 1})
+
+            data = AnalyticsRollupService.get_company_analytics(self.company_id, days=3, today=NOW.date())
+
+        self.assertEqual(data['funnel'], {'applications': 3, 'analysis': 3, 'interview': 1, 'accepted': 0, 'rejected': 0})
+        self.assertEqual([day['applications'] for day in data['daily']], [3, 0, 0])
+        job = data['jobs'][0]
+        # Só o primeiro evento de cada candidatura conta: 2h, 4h e 6h
+        self.assertEqual((job['responded'], job['avg_first_response_hours']), (3, 4.0))
+
+    def test_overlapping_run_does_not_count_twice(self):
+        from unittest import mock
+        from app.models import Checkpoint
+
+        with self.app.app_context():
+            # Segundo worker leu o checkpoint (posição 0) antes do primeiro terminar o mesmo lote
+            stale = Checkpoint(name='stale', position=0)
+            AnalyticsRollupService.refresh(now=NOW)
+            with mock.patch.object(Checkpoint, 'ensure', return_value=stale):
+                self.assertEqual(AnalyticsRollupService.refresh(now=NOW), {'applications': 0, 'status_events': 0})
+
+            data = AnalyticsRollupService.get_company_analytics(self.company_id, days=3, today=NOW.date())
+
+        self.assertEqual(data['funnel']['applications'], 3)
+        self.assertEqual(data['funnel']['analysis'], 3)
+        self.assertEqual(data['jobs'][0]['responded'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+# tests/test_application_export.py
+import csv
+import io
+from contextlib import nullcontext
+
+from app import db
+
+
+def _login_company(client, company, factory):
+    client.post('/api/auth/login/company', json={'email': company.email, 'password': factory.PASSWORD})
+
+
+def test_export_status_by_error_type(client, factory, monkeypatch):
+    # O stream lê por uma conexão própria; no teste, a da transação do teste
+    monkeypatch.setattr(db.engine, 'connect', lambda: nullcontext(db.session.connection()))
+    company, other = factory.create_company(), factory.create_company()
+    job = factory.create_job(company=company)
+    factory.create_application(job=job)
+    foreign = factory.create_job(company=other)
+    _login_company(client, company, factory)
+
+    response = client.get(f'/api/jobs/{job.id}/applications/export')
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('﻿'))))
+    assert len(rows) == 2
+
+    assert client.get('/api/jobs/999999/applications/export').status_code == 404
+    assert client.get(f'/api/jobs/{foreign.id}/applications/export').status_code == 403
@@ -0,0 +1,27 @@
+# tests/test_auth_refresh.py
+import pytest
+
+
+def _refresh(client):
+    return client.post('/api/auth/refresh', headers={'X-CSRF-TOKEN': client.get_cookie('csrf_refresh_token').value})
+
+
+@pytest.mark.parametrize('user_type', ['student', 'company'])
+def test_refresh_issues_new_access_token(client, factory, user_type):
+    user = getattr(factory, f'create_{user_type}')()
+    client.post(f'/api/auth/login/{user_type}', json={'email': user.email, 'password': factory.PASSWORD})
+    client.delete_cookie('access_token')
+    assert client.get('/api/auth/me').status_code == 401
+
+    response = _refresh(client)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json()['user'] == {'id': user.id, 'name': user.name, 'email': user.email, 'type': user_type}
+    assert client.get('/api/auth/me').status_code == 200
+
+
+def test_refresh_rejects_inactive_user(client, factory):
+    student = factory.create_student()
+    client.post('/api/auth/login/student', json={'email': student.email, 'password': factory.PASSWORD})
+    student.is_active = False
+
+    assert _refresh(client).status_code == 403
@@ -1,29 +1,34 @@
-
-import unittest
-from app import create_app, db
+# tests/test_company.py
+from app import db
 from app.models.company import Company
 
-class TestCompany(unittest.TestCase):
-    """EI VONLINDE AQUI É PRA IMPLEMENTAR OS TESTES DA COMPANY"""
-    
-    def setUp(self):
-        self.app = create_app('testing')
-        self.app_context = self.app.app_context()
-        self.app_context.push()
-        db.create_all()
-    
-    def tearDown(self):
-        db.session.remove()
-        db.drop_all()
-        self.app_context.pop()
-    
-    def test_company_creation(self):
-        # Testar criação de empresa
-        company = Company(name="Test Company", email="company@test.com", address="Test Address")
-        db.session.add(company)
-        db.session.commit()
-        self.assertIsNotNone(company.id)
-        self.assertEqual(company.name, "Test Company")
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+
+def _create_company():
+    company = Company(name="Test Company", email="company@test.com", phone="(11) 99999-0000",
+                      cnpj="11.222.333/0001-81", password="x", city="Test City")
+    db.session.add(company)
+    db.session.commit()
+    return company
+
+
+def test_company_creation(db_session):
+    company = _create_company()
+    assert company.id is not None
+    assert company.name == "Test Company"
+
+
+def test_company_creation_is_rolled_back(db_scope):
+    with db_scope():
+        _create_company()
+        assert Company.query.filter_by(email="company@test.com").count() == 1
+
+    # O commit do primeiro escopo foi desfeito no fim dele
+    with db_scope():
+        assert Company.query.filter_by(email="company@test.com").count() == 0
+
+
+def test_company_login(client, factory):
+    company = factory.create_company(email='login@empresa.com')
+    response = client.post('/api/auth/login/company', json={'email': 'login@empresa.com', 'password': factory.PASSWORD})
+    assert response.status_code == 200
+    assert response.get_json()['user']['id'] == company.id
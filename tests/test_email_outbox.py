@@ -0,0 +1,78 @@
+# tests/test_email_outbox.py
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import EmailOutbox
+from app.services.email_outbox_services import EmailOutboxService
+
+
+class FakeSender:
+    """Substitui o BulkEmailSender: registra os envios e pode falhar para alguns destinos"""
+
+    def __init__(self, fail=(), during_batch=None):
+        self.sent = []
+        self.fail = set(fail)
+        self.during_batch = during_batch
+
+    def send_batch(self, messages, on_result=None):
+        if self.during_batch:
+            during, self.during_batch = self.during_batch, None
+            during()
+        for message in messages:
+            ok = message[0] not in self.fail
+            if ok:
+                self.sent.append(message[0])
+            on_result(message, ok, None if ok else 'recusado')
+
+
+def _enqueue(total):
+    for i in range(total):
+        EmailOutboxService.enqueue(f'aluno{i}@teste.com', 'Assunto', '<p>Oi</p>')
+    db.session.commit()
+
+
+def test_concurrent_drainers_never_send_the_same_email(db_session):
+    _enqueue(7)
+    other = FakeSender()
+    # O segundo worker drena enquanto o primeiro ainda está enviando o lote dele
+    first = FakeSender(during_batch=lambda: EmailOutboxService.drain(other, batch_size=2))
+
+    EmailOutboxService.drain(first, batch_size=3)
+
+    assert len(first.sent) >= 3 and other.sent
+    assert sorted(first.sent + other.sent) == sorted(f'aluno{i}@teste.com' for i in range(7))
+    assert EmailOutbox.query.filter(EmailOutbox.status != 'sent').count() == 0
+
+
+def test_drain_stops_after_max_seconds(db_session):
+    _enqueue(5)
+    sender = FakeSender()
+
+    assert EmailOutboxService.drain(sender, batch_size=2, max_seconds=0) == {'sent': 2, 'failed': 0}
+    assert EmailOutbox.query.filter_by(status='pending').count() == 3
+
+
+def test_failures_go_back_to_pending_until_max_attempts(db_session):
+    _enqueue(2)
+    sender = FakeSender(fail={'aluno0@teste.com'})
+
+    assert EmailOutboxService.drain(sender, max_attempts=2) == {'sent': 1, 'failed': 1}
+    failed = EmailOutbox.query.filter_by(to_email='aluno0@teste.com').one()
+    assert (failed.status, failed.attempts) == ('pending', 1)
+
+    EmailOutboxService.drain(sender, max_attempts=2)
+    db.session.refresh(failed)
+    assert (failed.status, failed.attempts) == ('failed', 2)
+
+
+def test_stale_claim_is_taken_over(db_session):
+    _enqueue(2)
+    EmailOutbox.query.update({
+        'status': 'sending', 'claimed_by': 'worker-morto', 'claimed_at': datetime.utcnow() - timedelta(hours=1)
+    })
+    EmailOutbox.query.filter_by(to_email='aluno1@teste.com').update({'claimed_at': datetime.utcnow()})
+    db.session.commit()
+    sender = FakeSender()
+
+    EmailOutboxService.drain(sender, claim_timeout=600)
+    assert sender.sent == ['aluno0@teste.com']
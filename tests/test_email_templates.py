@@ -0,0 +1,45 @@
+# tests/test_email_templates.py
+import os
+import tempfile
+import unittest
+from markupsafe import Markup
+from app.services.email_templates import EmailTemplates, minify_html
+
+class TestEmailTemplates(unittest.TestCase):
+    """Testes dos templates de email pré-renderizados"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, 'hello.html'), 'w') as f:
+            f.write("""<html><head><style> .a { color : red; } </style></head>
+<body>
+    <!-- comentário -->
+    <div class="a">Olá {{ user_name }},</div>
+    <div>{% if user_type == 'student' %}Estudante{% else %}Empresa{% endif %}</div>
+    <ul><li>{{ extra }}</li></ul>
+</body></html>""")
+        self.templates = EmailTemplates(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_minify(self):
+        self.assertEqual(minify_html('<p>\n  <b> x </b>\n</p><!-- c --><style> a { color : red; } </style>'),
+                         '<p><b> x </b></p><style>a{color:red}</style>')
+
+    def test_render_escapes_html_and_derives_text(self):
+        html, text = self.templates.render('hello', static={'user_type': 'student'},
+                                           user_name='Ana <b>', extra=Markup('<i>ok</i>'))
+        self.assertIn('<div class="a">Olá Ana &lt;b&gt;,</div><div>Estudante</div>', html)
+        self.assertIn('<i>ok</i>', html)
+        self.assertIn('.a{color:red}', html)
+        self.assertNotIn('comentário', html)
+        self.assertEqual(text, 'Olá Ana <b>,\n\nEstudante\n\n- <i>ok</i>\n')
+
+    def test_compiled_once_per_variant(self):
+        first = self.templates.get('hello', ('user_name', 'extra'), user_type='student')
+        self.assertIs(first, self.templates.get('hello', ('user_name', 'extra'), user_type='student'))
+        self.assertIsNot(first, self.templates.get('hello', ('user_name', 'extra'), user_type='company'))
+
+if __name__ == '__main__':
+    unittest.main()
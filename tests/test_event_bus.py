@@ -0,0 +1,52 @@
+# tests/test_event_bus.py
+import unittest
+from app.services.event_bus import EventBus
+from app.utils.sse import format_event, stream_subscription
+
+class TestEventBus(unittest.TestCase):
+    """Testes do pub/sub em memória usado pelos streams SSE"""
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.bus.queue_size = 2
+
+    def test_publish_reaches_only_channel_subscribers(self):
+        mine = self.bus.subscribe('company:1')
+        other = self.bus.subscribe('company:2')
+        self.bus.publish('company:1', 'application_created', {'id': 7})
+        self.assertEqual(mine.get(timeout=0), ('application_created', {'id': 7}))
+        self.assertIsNone(other.get(timeout=0))
+
+    def test_close_unsubscribes(self):
+        subscription = self.bus.subscribe('company:1')
+        subscription.close()
+        self.assertFalse(self.bus.has_subscribers('company:1'))
+
+    def test_slow_subscriber_overflows_instead_of_growing(self):
+        subscription = self.bus.subscribe('company:1')
+        for i in range(5):
+            self.bus.publish('company:1', 'application_created', {'id': i})
+        self.assertTrue(subscription.overflowed)
+        chunks = list(stream_subscription(subscription, lambda *a: [], heartbeat=1, max_seconds=1))
+        self.assertIn('event: resync', chunks[-1])
+        self.assertFalse(self.bus.has_subscribers('company:1'))
+
+    def test_db_backend_ignores_direct_publish(self):
+        self.bus.backend = 'db'
+        self.bus._ensure_poller = lambda: None
+        subscription = self.bus.subscribe('company:1')
+        self.bus.publish('company:1', 'application_created', {'id': 1})
+        self.assertIsNone(subscription.get(timeout=0))
+
+class TestSseFormat(unittest.TestCase):
+
+    def test_format_event(self):
+        self.assertEqual(
+            format_event({'total': 3}, event='count_changed', event_id=5),
+            'id: 5\nevent: count_changed\ndata: {"total":3}\n\n'
+        )
+        self.assertEqual(format_event('a\nb'), 'data: a\ndata: b\n\n')
+        self.assertEqual(format_event(comment='ping'), ': ping\n\n')
+
+if __name__ == '__main__':
+    unittest.main()
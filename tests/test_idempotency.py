@@ -0,0 +1,88 @@
+# tests/test_idempotency.py
+import unittest
+from datetime import datetime, timedelta
+from flask import Flask, jsonify
+from app import db
+from app.middleware.idempotency import idempotent
+from app.models.idempotency_key import IdempotencyKey
+
+class TestIdempotency(unittest.TestCase):
+    """Testes do header Idempotency-Key"""
+
+    def setUp(self):
+        self.calls = 0
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', IDEMPOTENCY_TTL_SECONDS=60,
+                               IDEMPOTENCY_PROCESSING_SECONDS=30)
+        db.init_app(self.app)
+
+        def fake_auth(f):
+            def wrapper(*args, **kwargs):
+                return f(*args, current_user={'id': 1, 'type': 'company'}, **kwargs)
+            wrapper.__name__ = f.__name__
+            return wrapper
+
+        @self.app.route('/jobs', methods=['POST'])
+        @fake_auth
+        @idempotent
+        def create_job(**kwargs):
+            self.calls += 1
+            return jsonify({'id': self.calls}), 201
+
+        with self.app.app_context():
+            db.create_all()
+        self.client = self.app.test_client()
+
+    def post(self, body, key='abc'):
+        return self.client.post('/jobs', json=body, headers={'Idempotency-Key': key} if key else {})
+
+    def test_retry_returns_stored_response(self):
+        first = self.post({'title': 'Dev'})
+        retry = self.post({'title': 'Dev'})
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((retry.status_code, retry.get_json()), (201, {'id': 1}))
+        self.assertEqual(retry.headers['Idempotent-Replayed'], 'true')
+        self.assertNotIn('Idempotent-Replayed', first.headers)
+
+    def test_same_key_with_other_body_is_rejected(self):
+        self.post({'title': 'Dev'})
+        self.assertEqual(self.post({'title': 'Outra'}).status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_without_header_always_executes(self):
+        self.post({'title': 'Dev'}, key=None)
+        self.post({'title': 'Dev'}, key=None)
+        self.assertEqual(self.calls, 2)
+
+    def test_expired_key_executes_again(self):
+        self.post({'title': 'Dev'})
+        with self.app.app_context():
+            IdempotencyKey.query.update({'expires_at': db.func.datetime('now', '-1 second')})
+            db.session.commit()
+        self.assertEqual(self.post({'title': 'Dev'}).get_json(), {'id': 2})
+
+    def abandon(self, seconds_ago):
+        """Deixar a chave como um worker que morreu no meio da requisição (sem _release)"""
+        self.post({'title': 'Dev'})
+        with self.app.app_context():
+            IdempotencyKey.query.update({
+                'status': 'processing', 'response_status': None, 'response_body': None,
+                'created_at': datetime.utcnow() - timedelta(seconds=seconds_ago)
+            })
+            db.session.commit()
+
+    def test_processing_key_blocks_retry(self):
+        self.abandon(seconds_ago=5)
+        self.assertEqual(self.post({'title': 'Dev'}).status_code, 409)
+        self.assertEqual(self.calls, 1)
+
+    def test_abandoned_processing_key_is_taken_over(self):
+        self.abandon(seconds_ago=60)
+        response = self.post({'title': 'Dev'})
+        self.assertEqual((response.status_code, response.get_json()), (201, {'id': 2}))
+        self.assertEqual(self.post({'title': 'Dev'}).headers['Idempotent-Replayed'], 'true')
+        with self.app.app_context():
+            self.assertEqual(IdempotencyKey.query.one().status, 'completed')
+
+if __name__ == '__main__':
+    unittest.main()
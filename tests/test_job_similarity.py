@@ -0,0 +1,21 @@
+# tests/test_job_similarity.py
+import unittest
+from app.services.similarity_services import tokenize, job_terms, build_tfidf_vectors, cosine_similarity
+
+class TestJobSimilarity(unittest.TestCase):
+    """Testes do cálculo TF-IDF usado em vagas semelhantes"""
+
+    def test_tokenize_normalizes_accents_and_stopwords(self):
+        self.assertEqual(tokenize('Programação de APIs em C#'), ['programacao', 'apis', 'c#'])
+
+    def test_related_jobs_score_higher(self):
+        vectors = build_tfidf_vectors({
+            1: job_terms('Desenvolvedor Python', 'Backend com Flask', 'Python, Flask'),
+            2: job_terms('Dev Python Júnior', 'APIs com Django', 'Python, Django'),
+            3: job_terms('Designer UX', 'Pesquisa com usuários', 'Figma'),
+        })
+        self.assertGreater(cosine_similarity(vectors[1], vectors[2]), cosine_similarity(vectors[1], vectors[3]))
+        self.assertAlmostEqual(cosine_similarity(vectors[1], vectors[1]), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
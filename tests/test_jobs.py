@@ -1,35 +1,77 @@
 # tests/test_jobs.py
-import unittest
-from app import create_app, db
+from app import db
 from app.models.job import Job
-from app.models.company import Company
-
-class TestJobs(unittest.TestCase):
-    """EI VONLINDE AQUI É PRA IMPLEMENTAR OS TESTES DE JOBS"""
-    
-    def setUp(self):
-        self.app = create_app('testing')
-        self.app_context = self.app.app_context()
-        self.app_context.push()
-        db.create_all()
-        
-        # Criar uma company para o teste de job
-        self.company = Company(name="Test Company", email="company@test.com")
-        db.session.add(self.company)
-        db.session.commit()
-    
-    def tearDown(self):
-        db.session.remove()
-        db.drop_all()
-        self.app_context.pop()
-    
-    def test_job_creation(self):
-        # Testar criação de job
-        job = Job(title="Developer", description="Backend Developer", company_id=self.company.id)
-        db.session.add(job)
-        db.session.commit()
-        self.assertIsNotNone(job.id)
-        self.assertEqual(job.title, "Developer")
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+
+
+def test_job_creation(db_session, factory):
+    company = factory.create_company()
+    job = Job(title="Developer", description="Backend Developer", location="Remoto", company_id=company.id)
+    db.session.add(job)
+    db.session.commit()
+    assert job.id is not None
+    assert job.title == "Developer"
+
+
+def test_apply_to_job(client, factory):
+    student = factory.create_student()
+    job = factory.create_job()
+    client.post('/api/auth/login/student', json={'email': student.email, 'password': factory.PASSWORD})
+
+    headers = {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+    response = client.post(f'/api/jobs/{job.id}/apply', json={'cover_letter': 'Olá'}, headers=headers)
+    assert response.status_code == 201
+    response = client.post(f'/api/jobs/{job.id}/apply', json={}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_list_jobs(client, factory):
+    factory.create_job(title='Estágio em Dados')
+    factory.create_job(title='Vaga inativa', is_active=False)
+    response = client.get('/api/jobs')
+    assert response.status_code == 200
+    assert [job['title'] for job in response.get_json()] == ['Estágio em Dados']
+
+
+JOB_PAYLOAD = {
+    'title': 'Desenvolvedor Python', 'description': 'Backend com Flask e APIs REST', 'skills': 'Python',
+    'salary_range': 'A combinar', 'contract_type': 'CLT', 'location': 'São Paulo, SP', 'work_mode': 'Remoto',
+    'education': 'Superior', 'experience': 'Júnior',
+}
+
+
+def test_create_job_unexpected_error_is_not_cached(client, factory, monkeypatch):
+    from app.services.job_services import JobService
+
+    company = factory.create_company()
+    client.post('/api/auth/login/company', json={'email': company.email, 'password': factory.PASSWORD})
+    headers = {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value, 'Idempotency-Key': 'vaga-1'}
+    create_job = JobService.create_job
+    calls = []
+
+    def flaky(data, extra_payload=None):
+        calls.append(data)
+        if len(calls) == 1:
+            raise RuntimeError('conexão com o banco perdida')
+        return create_job(data, extra_payload=extra_payload)
+
+    monkeypatch.setattr(JobService, 'create_job', staticmethod(flaky))
+
+    first = client.post('/api/jobs', json=JOB_PAYLOAD, headers=headers)
+    assert first.status_code == 500
+    retry = client.post('/api/jobs', json=JOB_PAYLOAD, headers=headers)
+    assert retry.status_code == 201 and len(calls) == 2
+
+
+def test_create_job_validation_error_is_400(client, factory, monkeypatch):
+    from app.services.job_services import JobService
+
+    company = factory.create_company()
+    client.post('/api/auth/login/company', json={'email': company.email, 'password': factory.PASSWORD})
+    headers = {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+
+    def invalid(data, extra_payload=None):
+        raise ValueError('Empresa não encontrada')
+
+    monkeypatch.setattr(JobService, 'create_job', staticmethod(invalid))
+    response = client.post('/api/jobs', json=JOB_PAYLOAD, headers=headers)
+    assert (response.status_code, response.get_json()) == (400, {'error': 'Empresa não encontrada'})
@@ -0,0 +1,40 @@
+# tests/test_metrics.py
+import os
+import tempfile
+import time
+import unittest
+from app.middleware.metrics import Metrics, MetricsStore, percentile_from_buckets, LATENCY_BUCKETS_MS
+
+class TestMetrics(unittest.TestCase):
+    """Testes da coleta e agregação de métricas de requisição"""
+
+    def test_percentile_from_buckets(self):
+        buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        buckets[0] = 90   # até 5ms
+        buckets[5] = 9    # até 250ms
+        buckets[-1] = 1   # acima de 10s
+        self.assertEqual(percentile_from_buckets(buckets, 0.5), 5)
+        self.assertEqual(percentile_from_buckets(buckets, 0.95), 250)
+        self.assertEqual(percentile_from_buckets(buckets, 1.0), float('inf'))
+        self.assertIsNone(percentile_from_buckets([0] * len(buckets), 0.5))
+
+    def test_flush_aggregates_per_route(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics = Metrics()
+            metrics.enabled = True
+            metrics.flush_interval = 3600
+            metrics.store = MetricsStore(os.path.join(tmp, 'metrics.db'))
+
+            metrics.record('/api/jobs', 'GET', 200, 3.0, queries=2)
+            metrics.record('/api/jobs', 'GET', 500, 300.0, queries=12)
+            metrics.gauge('email_outbox_pending', 4)
+            metrics.flush()
+
+            [summary] = metrics.store.route_summary(time.time() - 60)
+            self.assertEqual((summary['requests'], summary['errors']), (2, 1))
+            self.assertEqual((summary['avg_queries'], summary['max_queries']), (7, 12))
+            self.assertEqual(summary['p99_ms'], 500)
+            self.assertEqual(metrics.store.gauge_series(0)[0][1:], ('email_outbox_pending', os.getpid(), 4.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+# tests/test_newsletter.py
+import smtplib
+import unittest
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app import db
+from app.models import Checkpoint, EmailOutbox
+from app.services.bulk_email import BulkEmailSender
+from app.services.newsletter_services import CHECKPOINT_NAME, JobMatcher, NewsletterService, week_window
+from app.services.scheduler import TaskScheduler
+
+class FakeSMTP:
+    """Conexão SMTP falsa - a primeira conexão cai no primeiro envio"""
+    connections = 0
+
+    def __init__(self, sent):
+        FakeSMTP.connections += 1
+        self.sent = sent
+        self.broken = FakeSMTP.connections == 1
+
+    def send_message(self, msg):
+        if self.broken:
+            raise smtplib.SMTPServerDisconnected('caiu')
+        self.sent.append(msg['To'])
+
+    def quit(self):
+        pass
+
+class TestNewsletter(unittest.TestCase):
+    """Testes da newsletter semanal de vagas"""
+
+    def test_week_window(self):
+        run_key, since, until = week_window(datetime(2026, 10, 21, 15))
+        self.assertEqual(run_key, '2026-W43')
+        self.assertEqual((since, until), (datetime(2026, 10, 12), datetime(2026, 10, 19)))
+
+    def test_job_matcher_ranks_by_skills_and_city(self):
+        def job(id, terms, location, remote=False):
+            return {'id': id, 'terms': set(terms), 'location_terms': {location}, 'remote': remote}
+        matcher = JobMatcher([
+            job(1, ['python', 'flask'], 'recife'),
+            job(2, ['python', 'sql'], 'salvador'),
+            job(3, ['figma'], 'salvador'),
+        ])
+        student = SimpleNamespace(skills='Python, SQL', city='Salvador')
+        [(_, jobs)] = matcher.match_batch([student], limit=5)
+        self.assertEqual([j['id'] for j in jobs], [2, 1])
+        self.assertEqual(matcher.match('java', 'Salvador', 5), [])
+
+    def test_bulk_sender_reconnects_and_counts(self):
+        FakeSMTP.connections = 0
+        sent = []
+        email_service = SimpleNamespace(from_name='YouthSpace', email_user='no-reply@x.com')
+        with BulkEmailSender(email_service, pool_size=1, rate_per_second=0,
+                             connection_factory=lambda: FakeSMTP(sent)) as sender:
+            result = sender.send_batch([(f'{i}@x.com', 'Assunto', '<p>oi</p>', 'oi') for i in range(3)])
+        self.assertEqual(result, (3, 0))
+        self.assertEqual(sorted(sent), ['0@x.com', '1@x.com', '2@x.com'])
+        self.assertEqual(FakeSMTP.connections, 2)
+
+# Uma semana depois de agora: as vagas criadas agora caem na janela da "semana anterior"
+NEXT_WEEK = datetime.utcnow() + timedelta(days=7)
+RUN_KEY = week_window(NEXT_WEEK)[0]
+
+
+class FakeSender:
+    """Substitui o BulkEmailSender: registra os envios e pode falhar para alguns destinos"""
+
+    def __init__(self, fail=()):
+        self.sent = []
+        self.fail = set(fail)
+
+    def send_batch(self, messages, on_result=None):
+        sent = failed = 0
+        for message in messages:
+            ok = message[0] not in self.fail
+            if ok:
+                self.sent.append(message[0])
+                sent += 1
+            else:
+                failed += 1
+            if on_result:
+                on_result(message, ok, None if ok else 'recusado')
+        return sent, failed
+
+
+@pytest.fixture
+def students(factory, monkeypatch):
+    # Os estudantes são lidos por uma conexão própria; no teste, a da transação do teste
+    monkeypatch.setattr(db.engine, 'connect', lambda: nullcontext(db.session.connection()))
+    factory.create_job(skills='Python, Flask')
+    students = [factory.create_student(skills='Python') for _ in range(3)]
+    db.session.commit()
+    return students
+
+
+def _checkpoint(**fields):
+    checkpoint = Checkpoint.load(CHECKPOINT_NAME)
+    for name, value in fields.items():
+        setattr(checkpoint, name, value)
+    db.session.commit()
+    return checkpoint
+
+
+def _send(sender, **kwargs):
+    return NewsletterService.send_weekly_jobs(sender=sender, now=NEXT_WEEK, **kwargs)
+
+
+def test_resumes_from_checkpoint_position(students):
+    _checkpoint(run_key=RUN_KEY, position=students[0].id)
+    sender = FakeSender()
+
+    stats = _send(sender)
+    assert sender.sent == [student.email for student in students[1:]]
+    assert (stats['sent'], stats['completed']) == (2, True)
+    assert Checkpoint.load(CHECKPOINT_NAME).position == students[-1].id
+
+
+def test_interrupted_run_continues_where_it_stopped(students):
+    first, second = FakeSender(), FakeSender()
+
+    assert not _send(first, batch_size=1, max_seconds=0)['completed']
+    assert _send(second, batch_size=1)['completed']
+    assert first.sent + second.sent == [student.email for student in students]
+
+
+def test_completed_week_is_skipped(students):
+    _checkpoint(run_key=RUN_KEY, position=0, completed_at=datetime.utcnow())
+    sender = FakeSender()
+
+    assert _send(sender)['completed']
+    assert sender.sent == []
+
+
+def test_new_week_starts_over(students):
+    _checkpoint(run_key='2000-W01', position=students[-1].id, completed_at=datetime.utcnow())
+    sender = FakeSender()
+
+    _send(sender)
+    assert sender.sent == [student.email for student in students]
+    assert Checkpoint.load(CHECKPOINT_NAME).run_key == RUN_KEY
+
+
+def test_failed_emails_go_to_outbox_once(students):
+    failing = students[1].email
+    assert _send(FakeSender(fail={failing}))['failed'] == 1
+
+    retry = EmailOutbox.query.one()
+    assert (retry.to_email, retry.status) == (failing, 'pending')
+    assert retry.dedupe_key == f'{CHECKPOINT_NAME}:{RUN_KEY}:{failing}'
+
+    # Lote reenviado na retomada falhando de novo: continua um só email na outbox
+    _checkpoint(position=0, completed_at=None)
+    _send(FakeSender(fail={failing}))
+    assert EmailOutbox.query.count() == 1
+
+
+def test_cli_waits_for_the_scheduler_lease(app, students):
+    other = TaskScheduler()
+    other.app = app
+    assert other._acquire_lease('weekly_jobs_newsletter', 60)
+
+    result = app.test_cli_runner().invoke(args=['send-weekly-jobs'])
+    assert 'não executada' in result.output
+    assert db.session.get(Checkpoint, CHECKPOINT_NAME) is None
+
+
+if __name__ == '__main__':
+    unittest.main()
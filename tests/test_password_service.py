@@ -0,0 +1,72 @@
+# tests/test_password_service.py
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash
+from app.services.password_service import PasswordService, PasswordServiceBusy
+
+class TestPasswordService(unittest.TestCase):
+    """Testes do serviço de hash de senhas"""
+
+    def setUp(self):
+        self.service = PasswordService(method='pbkdf2:sha256:1000', max_workers=0)
+
+    def test_hash_and_verify(self):
+        password_hash = self.service.hash('senha123')
+        self.assertTrue(password_hash.startswith('pbkdf2:sha256:1000$'))
+        self.assertTrue(self.service.verify(password_hash, 'senha123'))
+        self.assertFalse(self.service.verify(password_hash, 'outra'))
+        self.assertFalse(self.service.verify(None, 'senha123'))
+
+    def test_needs_rehash_when_parameters_change(self):
+        self.assertFalse(self.service.needs_rehash(self.service.hash('senha123')))
+        self.assertTrue(self.service.needs_rehash(generate_password_hash('senha123', method='pbkdf2:sha256:500')))
+
+    def test_busy_when_queue_is_full(self):
+        service = PasswordService(method='pbkdf2:sha256:1000', max_workers=1, max_pending=1)
+        service._slots.acquire()  # simula uma operação em andamento
+        try:
+            with self.assertRaises(PasswordServiceBusy):
+                service.hash('senha123')
+        finally:
+            service._slots.release()
+        service.shutdown()
+    def _blocking_service(self, max_pending):
+        """Serviço com pool de threads (no lugar do de processos) e uma tarefa que espera o gate"""
+        service = PasswordService(max_workers=1, max_pending=max_pending, timeout=0.05)
+        service._executor = ThreadPoolExecutor(max_workers=1)
+        gate = threading.Event()
+        self.addCleanup(service._executor.shutdown, wait=True)
+        self.addCleanup(gate.set)
+        return service, gate
+
+    def _free_slots(self, service):
+        taken = 0
+        while service._slots.acquire(blocking=False):
+            taken += 1
+        for _ in range(taken):
+            service._slots.release()
+        return taken
+
+    def test_timeout_is_busy_and_keeps_slot_until_done(self):
+        service, gate = self._blocking_service(max_pending=2)
+
+        with self.assertRaises(PasswordServiceBusy):
+            service._run(gate.wait)
+        self.assertEqual(self._free_slots(service), 1)  # ainda rodando no pool
+
+        gate.set()
+        service._executor.shutdown(wait=True)
+        self.assertEqual(self._free_slots(service), 2)
+
+    def test_timed_out_call_still_queued_is_cancelled(self):
+        service, gate = self._blocking_service(max_pending=3)
+
+        with self.assertRaises(PasswordServiceBusy):
+            service._run(gate.wait)
+        with self.assertRaises(PasswordServiceBusy):
+            service._run(gate.wait)  # fica na fila atrás da primeira e é cancelada
+        self.assertEqual(self._free_slots(service), 2)
+
+if __name__ == '__main__':
+    unittest.main()
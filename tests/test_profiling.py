@@ -0,0 +1,185 @@
+# tests/test_profiling.py
+import threading
+import time
+
+import pytest
+
+from app.middleware.profiling import StackSampler, profiler
+
+TOKEN = 'segredo-de-teste'
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_writes_collapsed_stacks(tmp_path):
+    sampler = StackSampler()
+    sampler.output_dir = tmp_path
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,))
+    worker.start()
+    try:
+        sampler.start(interval=0.005)
+        time.sleep(0.2)
+        result = sampler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert not sampler.running
+    assert result['samples'] > 0
+    lines = (tmp_path / result['file']).read_text().splitlines()
+    stacks = dict(line.rsplit(' ', 1) for line in lines)
+    busy = [stack for stack in stacks if '_busy (test_profiling.py' in stack]
+    assert busy and all(int(stacks[stack]) > 0 for stack in busy)
+    # Raiz primeiro, folha por último; a própria thread de amostragem fica de fora
+    assert busy[0].split(';')[0].startswith('_bootstrap')
+    assert not any('_run (profiling.py' in stack for stack in stacks)
+
+
+def test_sampler_stops_itself_after_seconds(tmp_path):
+    sampler = StackSampler()
+    sampler.output_dir = tmp_path
+    sampler.start(interval=0.005, seconds=0.05)
+    time.sleep(0.3)
+    assert not sampler.running
+    assert sampler.stop()['samples'] > 0
+    with pytest.raises(ValueError):
+        sampler.start(interval=5)
+
+
+def test_admin_routes_are_hidden_without_token(client):
+    assert client.get('/api/admin/profiler').status_code == 404
+
+
+def test_admin_routes_start_and_stop_sampler(app, client, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', TOKEN)
+    monkeypatch.setattr(profiler.sampler, 'output_dir', tmp_path)
+    monkeypatch.setattr(profiler, 'output_dir', tmp_path)
+
+    assert client.post('/api/admin/profiler/start', headers={'X-Admin-Token': 'errado'}).status_code == 401
+
+    headers = {'X-Admin-Token': TOKEN}
+    response = client.post('/api/admin/profiler/start', json={'interval': 0.005}, headers=headers)
+    assert response.status_code == 201 and response.json['running']
+    assert client.post('/api/admin/profiler/start', headers=headers).status_code == 400
+    client.get('/api/jobs')
+    time.sleep(0.1)
+
+    result = client.post('/api/admin/profiler/stop', headers=headers).json
+    assert result['samples'] > 0
+    download = client.get(f"/api/admin/profiler/files/{result['file']}", headers=headers)
+    assert download.status_code == 200 and b' ' in download.data
+    assert client.get('/api/admin/profiler/files/..%2Fmetrics.db', headers=headers).status_code == 404
+
+
+def test_request_profile_requires_admin_token(monkeypatch, tmp_path):
+    from app import create_app
+
+    monkeypatch.setenv('ADMIN_TOKEN', TOKEN)
+    monkeypatch.setenv('PROFILER_OUTPUT_DIR', str(tmp_path))
+    client = create_app('testing').test_client()
+
+    plain = client.get('/api/auth/?__profile=1')
+    assert plain.mimetype == 'application/json'
+
+    profiled = client.get('/api/auth/?__profile=1&__sort=tottime', headers={'X-Admin-Token': TOKEN})
+    assert profiled.mimetype == 'text/plain'
+    assert 'function calls' in profiled.get_data(as_text=True)
+    assert (tmp_path / profiled.headers['X-Profile-File']).is_file()
+
+
+@pytest.fixture
+def tracer(monkeypatch, tmp_path):
+    import tracemalloc
+
+    monkeypatch.setattr(profiler.memory, 'output_dir', tmp_path)
+    monkeypatch.setattr(profiler, 'output_dir', tmp_path)
+    yield profiler.memory
+    profiler.memory.stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_diff_points_to_growing_line(tracer):
+    tracer.start(frames=5)
+    _, before = tracer.take_snapshot()
+    leak = [bytearray(1024) for _ in range(2000)]  # ~2 MiB vivos nesta linha
+    after_name, after = tracer.take_snapshot()
+
+    from app.middleware.profiling import compare_snapshots
+    [top] = compare_snapshots(before, after, limit=1)
+    assert top['location'].endswith('test_profiling.py:' + str(test_memory_diff_points_to_growing_line.__code__.co_firstlineno + 3))
+    assert top['size_diff_kb'] >= 2000 and top['count_diff'] >= 2000
+    assert [f['location'] for f in compare_snapshots(before, after, 'filename', 1)] == [__file__]
+    # Outro worker acha o snapshot pelo arquivo gravado
+    tracer._snapshots.clear()
+    assert len(tracer.get_snapshot(after_name).traces) >= 2000
+    with pytest.raises(ValueError):
+        tracer.get_snapshot('../' + after_name)
+    del leak
+
+
+def test_peak_memory_gauge_for_heavy_routes(client, factory, tracer, monkeypatch):
+    from app.middleware.metrics import metrics
+
+    recorded = {}
+    monkeypatch.setattr(metrics, 'gauge', lambda name, value: recorded.update({name: value}))
+    factory.create_job()
+
+    client.get('/api/jobs')
+    assert recorded == {}  # tracemalloc desligado: nada medido
+
+    tracer.start()
+    client.get('/api/jobs')
+    assert recorded['peak_alloc_kb:job.get_jobs'] > 0
+
+
+def test_peak_memory_skips_while_another_request_is_measured(client, factory, tracer, monkeypatch):
+    from app.middleware import profiling
+    from app.middleware.metrics import metrics
+
+    recorded = {}
+    monkeypatch.setattr(metrics, 'gauge', lambda name, value: recorded.update({name: value}))
+    factory.create_job()
+    tracer.start()
+
+    with profiling._peak_lock:  # outra thread medindo
+        assert client.get('/api/jobs').status_code == 200
+    assert recorded == {}
+
+    client.get('/api/jobs')
+    assert 'peak_alloc_kb:job.get_jobs' in recorded
+
+
+def test_admin_memory_routes(app, client, tracer, monkeypatch):
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', TOKEN)
+    headers = {'X-Admin-Token': TOKEN}
+
+    assert client.post('/api/admin/memory/snapshots', headers=headers).status_code == 400  # não ligado
+    assert client.post('/api/admin/memory/start', json={'frames': 3}, headers=headers).json['tracing']
+    snapshot = client.post('/api/admin/memory/snapshots?limit=5', headers=headers)
+    assert snapshot.status_code == 201 and len(snapshot.json['top']) <= 5
+
+    diff = client.get(f"/api/admin/memory/diff?before={snapshot.json['name']}&group_by=filename", headers=headers)
+    assert diff.status_code == 200 and diff.json['after'].endswith('.snapshot')
+    assert client.get('/api/admin/memory/diff', headers=headers).status_code == 400
+    assert client.get(f"/api/admin/memory/diff?before={snapshot.json['name']}&group_by=x", headers=headers).status_code == 400
+    assert client.get(f"/api/admin/profiler/files/{snapshot.json['name']}", headers=headers).status_code == 200
+
+    assert not client.post('/api/admin/memory/stop', headers=headers).json['tracing']
+
+
+def test_memory_compare_command(app, tracer, tmp_path):
+    tracer.start()
+    before_name, _ = tracer.take_snapshot()
+    leak = [bytearray(1024) for _ in range(500)]
+    after_name, _ = tracer.take_snapshot()
+
+    result = app.test_cli_runner().invoke(args=[
+        'memory', 'compare', str(tmp_path / before_name), str(tmp_path / after_name), '--limit', '3'
+    ])
+    assert result.exit_code == 0, result.output
+    assert 'test_profiling.py' in result.output.splitlines()[0]
+    del leak
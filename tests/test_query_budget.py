@@ -0,0 +1,256 @@
+# tests/test_query_budget.py
+"""
+Orçamento de consultas por endpoint
+
+Cada rota é chamada com 10 e com 1000 linhas relacionadas (vagas, candidaturas,
+estudantes, empresas, vagas salvas) e o número de comandos SQL tem que ser o
+mesmo nos dois tamanhos. Um N+1 novo (ex.: acessar um relacionamento lazy
+dentro de to_dict) faz o teste do endpoint falhar.
+"""
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import factories
+from app import db
+from app.models import Application, Company, Job, JobSimilarity, JobSimilarityRefresh, ResetCode, SavedJob, Student
+from app.services.company_services import CompanyService
+from app.services.email_send import email_service
+from app.services.job_services import JobService
+from app.services.seed_services import make_cnpj, make_cpf
+from app.services.student_service import StudentService
+
+SMALL, LARGE = 10, 1000
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, 'before_cursor_execute', on_execute)
+
+
+class World:
+    """Empresa e estudante logados e os dados que crescem em volta deles (só ids: a sessão muda a cada requisição)"""
+
+    def __init__(self, factory):
+        company = factory.create_company()
+        student = factory.create_student()
+        job = factory.create_job(company=company)
+        self.company_id, self.company_email = company.id, company.email
+        self.student_id, self.student_email = student.id, student.email
+        self.job_id = job.id
+        self.application_id = factory.create_application(job=job, student=student).id
+        # Uma por medição: apply, e vaga/candidatura da empresa que a medição edita e apaga
+        self.open_job_ids = [factory.create_job().id for _ in range(2)]
+        self.own_job_ids = [factory.create_job(company=company).id for _ in range(2)]
+        self.own_application_ids = [factory.create_application(job=job).id for _ in range(2)]
+        db.session.commit()
+        self.rows = 0
+
+    def grow(self, total):
+        """Levar cada relação a `total` linhas (em lote, sem factories uma a uma)"""
+        start, count = self.rows + 1, total - self.rows
+        now = datetime.utcnow()
+
+        companies = [Company(name=f'Outra {i}', email=f'outra{i}@budget.com', phone='(11) 98888-0000',
+                             cnpj=make_cnpj(20000000 + i), password='x') for i in range(start, start + count)]
+        students = [Student(name=f'Aluno {i}', email=f'aluno{i}@budget.com', phone='(11) 97777-0000',
+                            cpf=make_cpf(200000000 + i), password='x', skills='Python') for i in range(start, start + count)]
+        db.session.add_all(companies + students)
+        db.session.flush()
+
+        own_jobs = [Job(title=f'Própria {i}', description='d', location='SP', company_id=self.company_id)
+                    for i in range(count)]
+        other_jobs = [Job(title=f'Externa {company.id}', description='d', location='RJ', company_id=company.id)
+                      for company in companies]
+        db.session.add_all(own_jobs + other_jobs)
+        db.session.flush()
+
+        db.session.add_all(
+            [Application(job_id=self.job_id, student_id=student.id, created_at=now) for student in students]
+            + [Application(job_id=job.id, student_id=student.id, created_at=now) for job, student in zip(own_jobs, students)]
+            + [Application(job_id=job.id, student_id=self.student_id, created_at=now) for job in other_jobs]
+            + [SavedJob(student_id=self.student_id, job_id=job.id) for job in other_jobs]
+            + [JobSimilarity(job_id=self.job_id, similar_job_id=job.id, score=0.5) for job in other_jobs[:20]]
+        )
+        db.session.commit()
+        db.session.remove()
+        self.rows = total
+
+
+def _csrf(client, cookie='csrf_access_token'):
+    return {'X-CSRF-TOKEN': client.get_cookie(cookie).value}
+
+
+JOB_PAYLOAD = {
+    'title': 'Vaga do orçamento', 'description': 'Backend com Flask e APIs REST', 'skills': 'Python', 'salary_range': 'A combinar',
+    'contract_type': 'CLT', 'location': 'São Paulo, SP', 'work_mode': 'Remoto', 'education': 'Superior',
+    'experience': 'Júnior',
+}
+
+# (nome, cliente, método, caminho, status esperado, corpo)
+# O corpo pode ser o nome de um dos corpos montados em _bodies (na hora da requisição).
+# Fora do orçamento:
+# - /students/profile/<id> e /students/job/<id>: respondem 500.
+# - /companies/applications/stream e /students/applications/stream: SSE, a resposta não termina.
+ENDPOINTS = [
+    ('auth info', 'anon', 'GET', '/api/auth/', 200, None),
+    ('auth debug', 'anon', 'GET', '/api/auth/debug', 200, None),
+    ('auth me (estudante)', 'student', 'GET', '/api/auth/me', 200, None),
+    ('auth me (empresa)', 'company', 'GET', '/api/auth/me', 200, None),
+    ('listar vagas', 'anon', 'GET', '/api/jobs', 200, None),
+    ('listar vagas logado', 'student', 'GET', '/api/jobs', 200, None),
+    ('vagas da empresa (público)', 'anon', 'GET', '/api/jobs?company_id={company_id}', 200, None),
+    ('detalhe da vaga', 'anon', 'GET', '/api/jobs/{job_id}', 200, None),
+    ('vagas semelhantes', 'anon', 'GET', '/api/jobs/{job_id}/similar?limit=20', 200, None),
+    ('minhas vagas (empresa)', 'company', 'GET', '/api/companies/jobs', 200, None),
+    ('candidaturas da vaga', 'company', 'GET', '/api/jobs/{job_id}/applications', 200, None),
+    ('exportar candidaturas', 'company', 'GET', '/api/jobs/{job_id}/applications/export', 200, None),
+    ('listar empresas', 'anon', 'GET', '/api/companies', 200, None),
+    ('detalhe da empresa', 'anon', 'GET', '/api/companies/{company_id}', 200, None),
+    ('perfil da empresa', 'company', 'GET', '/api/companies/profile', 200, None),
+    ('perfil da empresa por id', 'company', 'GET', '/api/companies/profile/{company_id}', 200, None),
+    ('editar perfil da empresa', 'company', 'PUT', '/api/companies/profile', 200, {'city': 'Recife, PE'}),
+    ('feed de candidaturas', 'company', 'GET', '/api/companies/applications', 200, None),
+    ('total de candidaturas', 'company', 'GET', '/api/companies/applications/count', 200, None),
+    ('analytics da empresa', 'company', 'GET', '/api/companies/analytics', 200, None),
+    ('listar estudantes', 'anon', 'GET', '/api/students', 200, None),
+    ('detalhe do estudante', 'anon', 'GET', '/api/students/{student_id}', 200, None),
+    ('perfil do estudante', 'student', 'GET', '/api/students/profile', 200, None),
+    ('editar perfil do estudante', 'student', 'PUT', '/api/students/profile', 200, {'city': 'Recife, PE'}),
+    ('minhas candidaturas', 'student', 'GET', '/api/students/applications', 200, None),
+    ('vagas salvas', 'student', 'GET', '/api/students/saved-jobs', 200, None),
+    ('salvar vaga', 'student', 'POST', '/api/jobs/{job_id}/save', 201, None),
+    ('candidatar-se', 'student', 'POST', '/api/jobs/{open_job_id}/apply', 201, {'cover_letter': 'Olá'}),
+    ('mudar status', 'company', 'PUT', '/api/applications/{application_id}/status', 200, {'status': 'analysis'}),
+    ('apagar candidatura', 'company', 'DELETE', '/api/applications/{own_application_id}', 200, None),
+    ('publicar vaga', 'company', 'POST', '/api/jobs', 201, JOB_PAYLOAD),
+    ('editar vaga', 'company', 'PUT', '/api/companies/jobs/{own_job_id}', 200, {'title': 'Vaga editada'}),
+    ('desativar vaga', 'company', 'PUT', '/api/companies/jobs/{own_job_id}/deactivate', 200, None),
+    ('apagar vaga', 'company', 'DELETE', '/api/companies/jobs/{own_job_id}', 200, None),
+    ('cadastro estudante', 'anon', 'POST', '/api/auth/register/student', 201, 'student_register'),
+    ('cadastro empresa', 'anon', 'POST', '/api/auth/register/company', 201, 'company_register'),
+    ('login estudante', 'anon', 'POST', '/api/auth/login/student', 200, 'student_login'),
+    ('login empresa', 'anon', 'POST', '/api/auth/login/company', 200, 'company_login'),
+    ('renovar token', 'student', 'POST', '/api/auth/refresh', 200, None),
+    ('logout', 'anon', 'POST', '/api/auth/logout', 200, None),
+    ('pedir código de reset', 'anon', 'POST', '/api/auth/reset-password', 200, 'reset_request'),
+    ('verificar código de reset', 'anon', 'POST', '/api/auth/verify-reset-code', 200, 'reset_verify'),
+    ('nova senha', 'anon', 'POST', '/api/auth/confirm-new-password', 200, 'reset_confirm'),
+]
+
+
+def _bodies(world, factory, measurement):
+    """Corpos montados na hora da requisição (dependem do que as anteriores gravaram)"""
+    n = 900 + measurement
+
+    def reset_code():
+        return ResetCode.query.filter_by(email=world.student_email).order_by(ResetCode.id.desc()).first()
+
+    return {
+        'student_login': lambda: {'email': world.student_email, 'password': factory.PASSWORD},
+        'company_login': lambda: {'email': world.company_email, 'password': factory.PASSWORD},
+        'student_register': lambda: {
+            'name': 'Novo Aluno', 'email': f'novo{n}@budget.com', 'password': factory.PASSWORD,
+            'phone': f'(31) 99999-0{n}', 'cpf': make_cpf(300000000 + n),
+        },
+        'company_register': lambda: {
+            'name': 'Nova Empresa', 'email': f'nova{n}@budget.com', 'password': factory.PASSWORD,
+            'phone': f'(31) 98888-0{n}', 'cnpj': make_cnpj(30000000 + n),
+        },
+        'reset_request': lambda: {'email': world.student_email},
+        'reset_verify': lambda: {'email': world.student_email, 'code': reset_code().code},
+        'reset_confirm': lambda: {
+            'token': reset_code().verification_token, 'new_password': factory.PASSWORD, 'confirm_password': factory.PASSWORD,
+        },
+    }
+
+
+def _measure(app, world, factory, measurement):
+    clients = {role: app.test_client() for role in ('anon', 'student', 'company')}
+    bodies = _bodies(world, factory, measurement)
+    clients['student'].post('/api/auth/login/student', json=bodies['student_login']())
+    clients['company'].post('/api/auth/login/company', json=bodies['company_login']())
+    params = {
+        'company_id': world.company_id,
+        'job_id': world.job_id,
+        'student_id': world.student_id,
+        'application_id': world.application_id,
+        'open_job_id': world.open_job_ids[measurement],
+        'own_job_id': world.own_job_ids[measurement],
+        'own_application_id': world.own_application_ids[measurement],
+    }
+
+    results = {}
+    for name, role, method, path, status, body in ENDPOINTS:
+        client = clients[role]
+        kwargs = {'json': bodies[body]() if isinstance(body, str) else body}
+        if method != 'GET' and role != 'anon':
+            kwargs['headers'] = _csrf(client, 'csrf_refresh_token' if path == '/api/auth/refresh' else 'csrf_access_token')
+        # Sessão nova por requisição, como em produção: nada aproveitado do identity map da anterior
+        db.session.remove()
+        with count_queries() as statements:
+            response = client.open(path.format(**params), method=method, **kwargs)
+            data = response.get_data(as_text=True)  # respostas em streaming consultam enquanto são lidas
+        assert response.status_code == status, f'{name}: {response.status_code} {data[:200]}'
+        results[name] = statements
+        _undo(name, params, response.get_json(silent=True))
+    db.session.remove()
+    return results
+
+
+def _undo(name, params, body):
+    """Desfazer o efeito das escritas para a medição seguinte partir do mesmo estado"""
+    if name == 'salvar vaga':
+        SavedJob.query.filter_by(student_id=params['student_id'], job_id=params['job_id']).delete()
+    elif name == 'mudar status':
+        db.session.get(Application, params['application_id']).status = 'pending'
+    elif name == 'editar perfil da empresa':
+        db.session.get(Company, params['company_id']).city = None
+    elif name == 'editar perfil do estudante':
+        db.session.get(Student, params['student_id']).city = 'São Paulo, SP'
+    elif name == 'publicar vaga':
+        JobService.delete_job(body['job']['id'])
+    elif name == 'cadastro estudante':
+        StudentService.delete_student(body['student']['id'])
+    elif name == 'cadastro empresa':
+        CompanyService.delete_company(body['company']['id'])
+    elif name == 'apagar vaga':
+        JobSimilarityRefresh.query.delete()  # o que as escritas em vagas enfileiraram
+    else:
+        return
+    db.session.commit()
+
+
+@pytest.fixture(scope='module')
+def budgets(app, module_db_session):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Exportação lê por uma conexão própria; aqui, a da transação do módulo
+        monkeypatch.setattr(db.engine, 'connect', lambda: nullcontext(db.session.connection()))
+        # Código de reset vai para o console em vez do SMTP
+        monkeypatch.setattr(email_service, 'send_reset_password_email', lambda *args: True)
+        world = World(factories)
+        world.grow(SMALL)
+        small = _measure(app, world, factories, 0)
+        world.grow(LARGE)
+        large = _measure(app, world, factories, 1)
+    return small, large
+
+
+@pytest.mark.parametrize('name', [endpoint[0] for endpoint in ENDPOINTS])
+def test_query_count_does_not_grow(budgets, name):
+    small, large = budgets
+    assert len(large[name]) == len(small[name]), (
+        f'{name}: {len(small[name])} consultas com {SMALL} linhas, {len(large[name])} com {LARGE}'
+    )
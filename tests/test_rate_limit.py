@@ -0,0 +1,61 @@
+# tests/test_rate_limit.py
+import os
+import tempfile
+import unittest
+from flask import Flask
+from app.middleware.rate_limit import RateLimiter, MemoryBucketStore, SQLiteBucketStore
+
+class TestBucketStores(unittest.TestCase):
+    """Testes dos baldes de tokens"""
+
+    def assert_bucket(self, store):
+        self.assertTrue(store.take('k', 2, 1.0, now=100)[0])
+        self.assertTrue(store.take('k', 2, 1.0, now=100)[0])
+        allowed, retry_after = store.take('k', 2, 1.0, now=100)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 1.0)
+        self.assertTrue(store.take('k', 2, 1.0, now=101)[0])
+
+    def test_memory_store(self):
+        self.assert_bucket(MemoryBucketStore())
+
+    def test_sqlite_store_is_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rate_limit.db')
+            self.assert_bucket(SQLiteBucketStore(path))
+            self.assertFalse(SQLiteBucketStore(path).take('k', 2, 1.0, now=101)[0])
+
+class TestRateLimiter(unittest.TestCase):
+    """Testes do decorator de rota"""
+
+    def setUp(self):
+        self.calls = 0
+        self.app = Flask(__name__)
+        self.app.config.update(
+            RATE_LIMIT_ENABLED=True,
+            RATE_LIMIT_STORAGE='memory',
+            RATE_LIMIT_TRUST_PROXY=False,
+            RATE_LIMIT_POLICIES={'login': {'ip': (10, 60), 'account': (2, 60)}},
+        )
+        limiter = RateLimiter()
+        limiter.init_app(self.app)
+
+        @self.app.route('/login', methods=['POST'])
+        @limiter.limit('login', account_fields=('email',))
+        def login():
+            self.calls += 1
+            return 'ok'
+
+        self.client = self.app.test_client()
+
+    def test_rejects_by_account_before_handler(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post('/login', json={'email': 'A@x.com'}).status_code, 200)
+        response = self.client.post('/login', json={'email': ' a@X.com '})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.client.post('/login', json={'email': 'b@x.com'}).status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
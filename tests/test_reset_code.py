@@ -0,0 +1,34 @@
+# tests/test_reset_code.py
+from app import db
+from app.models import ResetCode
+
+
+def _code(**fields):
+    reset_code = ResetCode(**fields)
+    db.session.add(reset_code)
+    db.session.commit()
+    return reset_code
+
+
+def test_redeem_only_once(db_session):
+    reset_code = _code(email='aluno@teste.com', user_type='company')
+
+    assert ResetCode.redeem(reset_code.code, 'token-1', email='aluno@teste.com') == 'company'
+    assert ResetCode.redeem(reset_code.code, 'token-2', email='aluno@teste.com') is None
+    assert ResetCode.find_by_token('token-1').id == reset_code.id
+    assert ResetCode.find_by_token('token-2') is None
+
+
+def test_redeem_expired_code(db_session):
+    reset_code = _code(email='aluno@teste.com', expires_in_minutes=-1)
+    assert ResetCode.redeem(reset_code.code, 'token', email='aluno@teste.com') is None
+    db.session.refresh(reset_code)
+    assert not reset_code.is_used
+
+
+def test_redeem_checks_destination_and_method(db_session):
+    by_sms = _code(phone='+5511999990000', method='sms')
+
+    assert ResetCode.redeem(by_sms.code, 'token', email='aluno@teste.com') is None
+    assert ResetCode.redeem(by_sms.code, 'token', phone='+5511888880000', method='sms') is None
+    assert ResetCode.redeem(by_sms.code, 'token', phone='+5511999990000', method='sms') == 'student'
@@ -0,0 +1,92 @@
+# tests/test_saved_jobs.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Job, SavedJob
+from app.services.job_services import JobService
+from app.services.student_service import StudentService
+
+
+@pytest.fixture
+def student(client, factory):
+    student = factory.create_student()
+    db.session.commit()
+    client.post('/api/auth/login/student', json={'email': student.email, 'password': factory.PASSWORD})
+    return student
+
+
+def _headers(client):
+    return {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+
+
+def test_save_is_idempotent(client, factory, student):
+    job = factory.create_job()
+
+    first = client.post(f'/api/jobs/{job.id}/save', headers=_headers(client))
+    again = client.post(f'/api/jobs/{job.id}/save', headers=_headers(client))
+
+    assert first.status_code == again.status_code == 201
+    assert first.get_json()['saved_job']['id'] == again.get_json()['saved_job']['id']
+    assert SavedJob.query.filter_by(student_id=student.id, job_id=job.id).count() == 1
+
+
+def test_cannot_save_inactive_job(client, factory, student):
+    job = factory.create_job(is_active=False)
+    assert client.post(f'/api/jobs/{job.id}/save', headers=_headers(client)).status_code == 404
+    assert client.post('/api/jobs/999999/save', headers=_headers(client)).status_code == 404
+
+
+def test_unsave(client, factory, student):
+    job = factory.create_job()
+    client.post(f'/api/jobs/{job.id}/save', headers=_headers(client))
+
+    assert client.delete(f'/api/jobs/{job.id}/save', headers=_headers(client)).status_code == 200
+    assert SavedJob.query.filter_by(student_id=student.id).count() == 0
+    assert client.delete(f'/api/jobs/{job.id}/save', headers=_headers(client)).status_code == 404
+
+
+def test_list_saved_jobs_newest_first(client, factory, student):
+    older, newer = factory.create_job(title='Primeira'), factory.create_job(title='Segunda')
+    factory.create_application(job=newer)
+    client.post(f'/api/jobs/{older.id}/save', headers=_headers(client))
+    client.post(f'/api/jobs/{newer.id}/save', headers=_headers(client))
+    SavedJob.query.filter_by(job_id=older.id).update({'created_at': datetime.utcnow() - timedelta(hours=1)})
+    db.session.commit()
+
+    response = client.get('/api/students/saved-jobs')
+    assert response.status_code == 200
+    saved = response.get_json()
+    assert [item['job']['title'] for item in saved] == ['Segunda', 'Primeira']
+    assert saved[0]['job']['applications_count'] == 1
+
+
+def test_is_saved_flag_on_job_list(client, factory, student):
+    saved, other = factory.create_job(), factory.create_job()
+    client.post(f'/api/jobs/{saved.id}/save', headers=_headers(client))
+
+    flags = {job['id']: job['is_saved'] for job in client.get('/api/jobs').get_json()}
+    assert flags == {saved.id: True, other.id: False}
+
+    anonymous = client.application.test_client()
+    assert not any(job['is_saved'] for job in anonymous.get('/api/jobs').get_json())
+
+
+def test_deleting_job_removes_saved_entries(factory):
+    job = factory.create_job()
+    db.session.add(SavedJob(student_id=factory.create_student().id, job_id=job.id))
+    db.session.commit()
+
+    JobService.delete_job(job.id)
+    assert db.session.get(Job, job.id) is None
+    assert SavedJob.query.filter_by(job_id=job.id).count() == 0
+
+
+def test_deleting_student_removes_saved_entries(factory):
+    student = factory.create_student()
+    db.session.add(SavedJob(student_id=student.id, job_id=factory.create_job().id))
+    db.session.commit()
+
+    StudentService.delete_student(student.id)
+    assert SavedJob.query.filter_by(student_id=student.id).count() == 0
@@ -0,0 +1,127 @@
+# tests/test_scheduler.py
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from app import db
+from app.models import ResetCode, TaskLease
+from app.services.scheduler import TaskScheduler
+from test_query_budget import count_queries
+
+
+@pytest.fixture
+def workers(app, db_session):
+    """Dois workers disputando as mesmas tarefas"""
+    first, second = TaskScheduler(), TaskScheduler()
+    first.app = second.app = app
+    return first, second
+
+
+def _lease(name):
+    db.session.expire_all()
+    return db.session.get(TaskLease, name)
+
+
+def test_only_one_worker_gets_the_lease(workers):
+    first, second = workers
+    assert first._acquire_lease('tarefa', 60)
+    assert not second._acquire_lease('tarefa', 60)
+    assert not first._acquire_lease('tarefa', 60)
+    assert _lease('tarefa').owner == first.owner
+
+
+def test_expired_lease_is_taken_over(workers):
+    first, second = workers
+    first._acquire_lease('tarefa', 60)
+    TaskLease.query.filter_by(name='tarefa').update({'expires_at': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+    assert second._acquire_lease('tarefa', 60)
+    # O dono antigo não renova nem libera o lease de quem assumiu
+    assert not first._renew_lease('tarefa', 60)
+    first._release_lease('tarefa', datetime.utcnow())
+    assert _lease('tarefa').owner == second.owner
+    assert _lease('tarefa').expires_at > datetime.utcnow() + timedelta(seconds=30)
+
+
+def test_renew_extends_own_lease(workers):
+    first, _ = workers
+    first._acquire_lease('tarefa', 1)
+    assert first._renew_lease('tarefa', 600)
+    assert _lease('tarefa').expires_at > datetime.utcnow() + timedelta(minutes=9)
+
+
+def test_lease_is_held_while_running_and_until_the_interval(workers):
+    first, second = workers
+    seen = []
+
+    def task():
+        seen.append(second._acquire_lease('tarefa', 60))
+        return 'ok'
+
+    first.register('tarefa', 3600, task, lease_seconds=60)
+    started = datetime.utcnow()
+    assert first.run_task('tarefa') == 'ok'
+    assert seen == [False]
+
+    # Terminou antes do intervalo: fica preso até início + intervalo (não até início + lease)
+    lease = _lease('tarefa')
+    assert lease.owner == first.owner
+    assert lease.expires_at >= started + timedelta(seconds=3600)
+    second.register('tarefa', 3600, task)
+    assert second.run_task('tarefa') is None
+
+
+def test_run_longer_than_interval_frees_lease_on_finish(workers):
+    first, second = workers
+    first.register('tarefa', 0, lambda: 'ok', lease_seconds=60)
+    second.register('tarefa', 0, lambda: 'outro')
+
+    assert first.run_task('tarefa') == 'ok'
+    assert _lease('tarefa').expires_at <= datetime.utcnow()
+    assert second.run_task('tarefa') == 'outro'
+
+
+def test_failed_task_still_releases_lease(workers):
+    first, second = workers
+
+    def broken():
+        raise RuntimeError('falhou')
+
+    first.register('tarefa', 0, broken, lease_seconds=600)
+    second.register('tarefa', 0, lambda: 'ok')
+    assert first.run_task('tarefa') is None
+    assert second.run_task('tarefa') == 'ok'
+
+
+def test_cleanup_expired_reset_codes_in_batches(db_session):
+    expired = [ResetCode(email=f'antigo{i}@teste.com', expires_in_minutes=-1) for i in range(5)]
+    valid = ResetCode(email='novo@teste.com')
+    db.session.add_all(expired + [valid])
+    db.session.commit()
+
+    with count_queries() as statements:
+        assert ResetCode.cleanup_expired(batch_size=2) == 5
+    deletes = [statement for statement in statements if statement.lstrip().upper().startswith('DELETE')]
+    assert len(deletes) == 3  # 2 + 2 + 1
+
+    assert [code.email for code in ResetCode.query] == ['novo@teste.com']
+    assert ResetCode.cleanup_expired(batch_size=2) == 0
+
+
+def test_scheduler_does_not_start_under_flask_cli(monkeypatch):
+    app = Flask(__name__)
+    app.config['SCHEDULER_ENABLED'] = True
+    scheduler = TaskScheduler(tick_seconds=0.01)
+
+    monkeypatch.setenv('FLASK_RUN_FROM_CLI', 'true')
+    scheduler.init_app(app)
+    assert scheduler._thread is None
+
+    monkeypatch.delenv('FLASK_RUN_FROM_CLI')
+    scheduler.init_app(app)
+    try:
+        assert scheduler._thread.is_alive()
+    finally:
+        scheduler.stop()
@@ -0,0 +1,58 @@
+# tests/test_seed.py
+import unittest
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import func
+from app import db
+from app.models import Account, Application, ApplicationStatusEvent, Company, Job, Student
+from app.services.password_service import password_service
+from app.services.seed_services import SeedService, make_cnpj, make_cpf
+from app.utils.phone_validator import PhoneValidator
+from app.utils.validators import validate_cpf
+
+class TestSeed(unittest.TestCase):
+    """Testes do gerador de dados sintéticos (flask seed)"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+        db.init_app(self.app)
+        self.workers, password_service.max_workers = password_service.max_workers, 0
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        password_service.max_workers = self.workers
+
+    def test_documents_have_valid_check_digits(self):
+        self.assertEqual(make_cpf(529982247), '529.982.247-25')
+        self.assertEqual(make_cnpj(11222333), '11.222.333/0001-81')
+
+    def test_seed_generates_consistent_rows(self):
+        with self.app.app_context():
+            stats = SeedService(seed=1, batch_size=50, now=datetime(2026, 10, 19)).run(5, 40, 20, 300)
+            self.assertEqual((stats['companies'], stats['students'], stats['jobs'], stats['applications']),
+                             (5, 40, 20, 300))
+            self.assertEqual(Account.query.count(), 45)
+
+            for student in Student.query:
+                self.assertTrue(validate_cpf(student.cpf))
+                self.assertTrue(PhoneValidator.validate_phone(student.phone))
+            pairs = db.session.query(Application.job_id, Application.student_id).distinct().count()
+            self.assertEqual(pairs, 300)
+            pending = Application.query.filter_by(status='pending').count()
+            self.assertEqual(ApplicationStatusEvent.query.count(), 300 - pending)
+
+            # Rodar de novo no mesmo banco continua os ids sem conflito de unicidade
+            SeedService(seed=1, batch_size=50).run(2, 10, 3, 20)
+            self.assertEqual(Company.query.count(), 7)
+            self.assertEqual(db.session.query(func.count(func.distinct(Student.cpf))).scalar(), 50)
+            self.assertEqual(Job.query.count(), 23)
+
+    def test_applications_require_jobs_and_students(self):
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                SeedService().run(0, 10, 0, 100)
+
+if __name__ == '__main__':
+    unittest.main()
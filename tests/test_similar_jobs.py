@@ -0,0 +1,98 @@
+# tests/test_similar_jobs.py
+from app import db
+from app.models import JobSimilarity, JobSimilarityRefresh
+from app.services.similarity_services import SimilarityService
+
+PYTHON = {'title': 'Desenvolvedor Python', 'description': 'Backend com Flask e APIs REST', 'skills': 'Python, Flask'}
+
+
+def _login_company(client, company, factory):
+    client.post('/api/auth/login/company', json={'email': company.email, 'password': factory.PASSWORD})
+    return {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+
+
+def _neighbours(job_id):
+    return [row.similar_job_id for row in JobSimilarity.query.filter_by(job_id=job_id).order_by(JobSimilarity.score.desc())]
+
+
+def _board(factory):
+    """Duas vagas Python quase iguais, uma parecida e uma sem relação"""
+    company = factory.create_company()
+    jobs = [
+        factory.create_job(company=company, **PYTHON),
+        factory.create_job(company=company, **PYTHON),
+        factory.create_job(company=company, title='Estágio Python', description='Automação de planilhas', skills='Python'),
+        factory.create_job(company=company, title='Designer UX', description='Pesquisa com usuários', skills='Figma'),
+    ]
+    db.session.commit()
+    SimilarityService.rebuild_all(limit=1)
+    return company, jobs
+
+
+def test_created_job_is_queued_and_enters_neighbour_lists(client, factory):
+    company = factory.create_company()
+    existing = factory.create_job(company=company, **PYTHON)
+    db.session.commit()
+    SimilarityService.rebuild_all()
+    headers = _login_company(client, company, factory)
+
+    response = client.post('/api/jobs', headers=headers, json={
+        **PYTHON, 'salary_range': 'A combinar', 'contract_type': 'CLT', 'location': 'São Paulo, SP',
+        'work_mode': 'Remoto', 'education': 'Superior', 'experience': 'Júnior', 'company_id': company.id,
+    })
+    assert response.status_code == 201
+    new_id = response.get_json()['job']['id']
+
+    # A requisição só enfileira; o recálculo é da tarefa similar_jobs_refresh
+    assert [entry.job_id for entry in JobSimilarityRefresh.query] == [new_id]
+    assert client.get(f'/api/jobs/{existing.id}/similar').get_json() == []
+
+    assert SimilarityService.process_refresh_queue() == 1
+    assert JobSimilarityRefresh.query.count() == 0
+    assert [job['id'] for job in client.get(f'/api/jobs/{existing.id}/similar').get_json()] == [new_id]
+    assert _neighbours(new_id) == [existing.id]
+
+
+def test_deactivated_job_leaves_lists_and_they_are_backfilled(client, factory):
+    company, (job, twin, related, _) = _board(factory)
+    assert _neighbours(job.id) == [twin.id]
+    headers = _login_company(client, company, factory)
+
+    assert client.put(f'/api/companies/jobs/{twin.id}/deactivate', headers=headers).status_code == 200
+    SimilarityService.process_refresh_queue(limit=1)
+
+    assert _neighbours(twin.id) == []
+    assert _neighbours(job.id) == [related.id]
+    assert JobSimilarity.query.filter_by(similar_job_id=twin.id).count() == 0
+
+
+def test_deleted_job_queues_jobs_that_listed_it(client, factory):
+    company, (job, twin, related, _) = _board(factory)
+    headers = _login_company(client, company, factory)
+
+    assert client.delete(f'/api/companies/jobs/{twin.id}', headers=headers).status_code == 200
+    assert _neighbours(job.id) == []
+    assert job.id in {entry.job_id for entry in JobSimilarityRefresh.query}
+
+    SimilarityService.process_refresh_queue(limit=1)
+    assert _neighbours(job.id) == [related.id]
+
+
+def test_limit_is_capped_at_stored_neighbours(app, client, factory, monkeypatch):
+    _, (job, *_) = _board(factory)
+    SimilarityService.rebuild_all(limit=3)
+    assert len(_neighbours(job.id)) >= 2
+    monkeypatch.setitem(app.config, 'SIMILAR_JOBS_PER_JOB', 1)
+
+    assert len(client.get(f'/api/jobs/{job.id}/similar?limit=20').get_json()) == 1
+
+
+def test_refresh_job_updates_existing_lists(factory):
+    _, (job, twin, related, designer) = _board(factory)
+    twin.title, twin.description, twin.skills = 'Designer de Produto', 'Pesquisa com usuários', 'Figma'
+    db.session.commit()
+
+    SimilarityService.refresh_job(twin.id, limit=1)
+    assert _neighbours(job.id) == [related.id]
+    assert _neighbours(twin.id) == [designer.id]
+    assert _neighbours(designer.id) == [twin.id]
@@ -0,0 +1,36 @@
+# tests/test_sms_dispatcher.py
+import unittest
+from app.services.sms_dispatcher import SmsDispatcher, FakeTwilioTransport
+
+class TestSmsDispatcher(unittest.TestCase):
+    """Testes da fila de SMS com o transporte falso"""
+
+    def make_dispatcher(self, fail_times=0, max_retries=3):
+        dispatcher = SmsDispatcher()
+        dispatcher.transport = FakeTwilioTransport(fail_times=fail_times)
+        dispatcher.max_retries = max_retries
+        dispatcher.backoff = 0.01
+        return dispatcher
+
+    def test_enqueue_sends_in_background(self):
+        dispatcher = self.make_dispatcher()
+        self.assertTrue(dispatcher.enqueue('+5511999999999', 'Código 123456'))
+        self.assertTrue(dispatcher.wait_idle(timeout=2))
+        self.assertEqual(dispatcher.transport.sent, [{'to': '+5511999999999', 'body': 'Código 123456'}])
+
+    def test_retries_with_backoff(self):
+        dispatcher = self.make_dispatcher(fail_times=2)
+        dispatcher.enqueue('+5511999999999', 'Código 123456')
+        self.assertTrue(dispatcher.wait_idle(timeout=2))
+        self.assertEqual(dispatcher.transport.attempts, 3)
+        self.assertEqual(len(dispatcher.transport.sent), 1)
+
+    def test_gives_up_after_max_retries(self):
+        dispatcher = self.make_dispatcher(fail_times=5, max_retries=1)
+        dispatcher.enqueue('+5511999999999', 'Código 123456')
+        self.assertTrue(dispatcher.wait_idle(timeout=2))
+        self.assertEqual(dispatcher.transport.attempts, 2)
+        self.assertEqual(dispatcher.transport.sent, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+# tests/test_status_digest.py
+import unittest
+from types import SimpleNamespace
+from app.services.status_digest_services import StatusDigestService
+
+def event(application_id, student_id, old_status, new_status, job_id=1):
+    return SimpleNamespace(application_id=application_id, student_id=student_id, job_id=job_id,
+                           old_status=old_status, new_status=new_status)
+
+class TestStatusDigest(unittest.TestCase):
+    """Testes do agrupamento de eventos de status por estudante"""
+
+    def test_keeps_final_status_per_application(self):
+        digests = StatusDigestService.coalesce([
+            event(1, 10, 'pending', 'analysis'),
+            event(2, 10, 'pending', 'rejected', job_id=2),
+            event(1, 10, 'analysis', 'interview'),
+        ])
+        self.assertEqual(list(digests), [10])
+        self.assertEqual(dict(digests[10]), {1: (1, 'pending', 'interview'), 2: (2, 'pending', 'rejected')})
+
+    def test_drops_changes_reverted_within_window(self):
+        digests = StatusDigestService.coalesce([
+            event(1, 10, 'pending', 'analysis'),
+            event(1, 10, 'analysis', 'pending'),
+        ])
+        self.assertEqual(digests, {})
+
+if __name__ == '__main__':
+    unittest.main()
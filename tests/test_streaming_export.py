@@ -0,0 +1,37 @@
+# tests/test_streaming_export.py
+import csv
+import io
+import unittest
+import zipfile
+import xml.etree.ElementTree as ET
+from app.utils.streaming_export import iter_csv, iter_xlsx
+
+class TestStreamingExport(unittest.TestCase):
+    """Testes da exportação de candidatos em CSV/XLSX"""
+
+    rows = [(1, 'Ana', '=1+1'), (2, 'Bia <&>', None)]
+
+    def test_csv_is_chunked_and_neutralizes_formulas(self):
+        chunks = list(iter_csv(['id', 'nome', 'carta'], iter(self.rows), chunk_rows=1))
+        self.assertEqual(len(chunks), 3)
+        text = ''.join(chunks)
+        self.assertTrue(text.startswith('\ufeff'))
+        parsed = list(csv.reader(io.StringIO(text[1:])))
+        self.assertEqual(parsed, [['id', 'nome', 'carta'], ['1', 'Ana', "'=1+1"], ['2', 'Bia <&>', '']])
+
+    def test_xlsx_is_a_valid_package(self):
+        data = b''.join(iter_xlsx(['id', 'nome', 'carta'], iter(self.rows), chunk_rows=1))
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        self.assertIsNone(archive.testzip())
+        for name in archive.namelist():
+            ET.fromstring(archive.read(name))
+
+        ns = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        sheet = ET.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall('.//s:row', ns)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[2].find('s:c/s:v', ns).text, '2')
+        self.assertEqual(rows[2].findall('.//s:t', ns)[0].text, 'Bia <&>')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,29 +1,31 @@
 # tests/test_student.py
-import unittest
-from app import create_app, db
+from app import db
 from app.models.student import Student
 
-class TestStudent(unittest.TestCase):
-    """EI VONLINDE AQUI É PRA IMPLEMENTAR OS TESTES DE STUDENT"""
-    
-    def setUp(self):
-        self.app = create_app('testing')
-        self.app_context = self.app.app_context()
-        self.app_context.push()
-        db.create_all()
-    
-    def tearDown(self):
-        db.session.remove()
-        db.drop_all()
-        self.app_context.pop()
-    
-    def test_student_creation(self):
-        # Testar criação de student
-        student = Student(name="Test Student", email="student@test.com", course="Computer Science")
-        db.session.add(student)
-        db.session.commit()
-        self.assertIsNotNone(student.id)
-        self.assertEqual(student.name, "Test Student")
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+
+def test_student_creation(db_session):
+    student = Student(name="Test Student", email="student@test.com", phone="(11) 99999-0000",
+                      cpf="529.982.247-25", password="x", skills="Computer Science")
+    db.session.add(student)
+    db.session.commit()
+    assert student.id is not None
+    assert student.name == "Test Student"
+
+
+def test_student_applications(factory):
+    from app.services.application_services import ApplicationService
+
+    student = factory.create_student()
+    job = factory.create_job()
+    factory.create_application(job=job, student=student)
+    factory.create_application(job=job)
+
+    applications = ApplicationService.get_student_applications(student.id)
+    assert [application.job_id for application in applications] == [job.id]
+
+
+def test_student_login(client, factory):
+    student = factory.create_student()
+    response = client.post('/api/auth/login/student', json={'email': student.email, 'password': factory.PASSWORD})
+    assert response.status_code == 200
+    assert client.get_cookie('access_token') is not None